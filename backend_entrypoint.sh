@@ -33,6 +33,9 @@ cmd_run() {
         ~/manage.py collectstatic --no-input
     fi
 
+    # parsed once here instead of by every worker
+    ~/manage.py compile_model_config
+
     wait_for_db
 
     echo "waiting for migrations to complete..."
@@ -5,8 +5,12 @@
 from collections.abc import Sequence
 from typing import Optional
 
+from django.conf import settings
+
 from genflow.apps.ai.base.ai_provider import AIProvider
 from genflow.apps.ai.base.entities.provider import AIProviderEntity
+from genflow.apps.ai.config_snapshot import load_config_snapshot
+from genflow.apps.ai.config_store import ConfigStore
 from genflow.apps.ai.providers.registry import AI_PROVIDERS, AIProviderExtension
 from genflow.apps.common.log import ServerLogManager
 
@@ -25,8 +29,51 @@ class AIProviderFactory:
         Initializes the factory and retrieves AI providers
         """
 
+        self.config_store = ConfigStore(
+            self._get_ai_provider_map(),
+            config_root=settings.MODEL_CONFIG_ROOT,
+            snapshot_path=settings.MODEL_CONFIG_SNAPSHOT,
+            on_reload=self._on_config_reload,
+        )
+        self.use_config_snapshot()
         self.schemas = self.get_ai_provider_schemas()
 
+    def use_config_snapshot(self) -> bool:
+        """
+        Sets the provider and model schemas from the compiled model config snapshot, so
+            that the YAML files are not parsed, unless the snapshot is missing or stale.
+        """
+
+        snapshot = load_config_snapshot(settings.MODEL_CONFIG_SNAPSHOT, settings.MODEL_CONFIG_ROOT)
+        if snapshot is None:
+            return False
+
+        return self.config_store.set_snapshot(snapshot)
+
+    def reload_config(self, force: bool = False) -> bool:
+        """
+        Swaps in the provider and model schemas of the YAML files if they changed,
+            returns whether they were reloaded.
+        """
+
+        return self.config_store.reload(force=force)
+
+    def watch_config(self, interval: float) -> None:
+        """
+        Reloads the provider and model schemas whenever the YAML files change, checked
+            every given number of seconds.
+        """
+
+        if interval > 0:
+            self.config_store.watch(interval)
+
+    def _on_config_reload(self) -> None:
+        """
+        Rebuilds the AI provider schemas from the swapped in provider and model schemas.
+        """
+
+        self.schemas = self._get_ai_provider_schemas()
+
     def get_ai_provider_schemas(self) -> Sequence[AIProviderEntity]:
         """
         Retrieves and returns a list of AI provider schemas with their supported models.
@@ -37,8 +84,18 @@ class AIProviderFactory:
         if self.schemas is not None and len(self.schemas) == len(ai_provider_extensions.items()):
             return self.schemas
 
+        # cache the ai_providers
+        self.schemas = self._get_ai_provider_schemas()
+
+        return self.schemas
+
+    def _get_ai_provider_schemas(self) -> list[AIProviderEntity]:
+        """
+        Builds the list of AI provider schemas with their supported models.
+        """
+
         ai_provider_schemas = []
-        for ai_provider_extension in ai_provider_extensions.values():
+        for ai_provider_extension in self._get_ai_provider_map().values():
             # retrieve the provider schema
             ai_provider_instance = ai_provider_extension.ai_provider_instance
             ai_provider_schema = ai_provider_instance.get_schema()
@@ -55,9 +112,6 @@ class AIProviderFactory:
 
             ai_provider_schemas.append(ai_provider_schema)
 
-        # cache the ai_providers
-        self.schemas = ai_provider_schemas
-
         return ai_provider_schemas
 
     def get_ai_provider_instance(self, provider_name: str) -> AIProvider:
@@ -99,6 +153,21 @@ class AIProviderFactory:
 
         return filtered_credentials
 
+    def warm_up(self) -> None:
+        """
+        Warms up the model collections of all registered AI providers.
+        """
+
+        for ai_provider_extension in self._get_ai_provider_map().values():
+            ai_provider_instance = ai_provider_extension.ai_provider_instance
+            for model_collection_instance in ai_provider_instance.model_collections_map.values():
+                try:
+                    model_collection_instance.warm_up()
+                except Exception as e:
+                    slogger.glob.warning(
+                        f"Failed to warm up {ai_provider_extension.name} models: {str(e)}"
+                    )
+
     def _get_ai_provider_map(self) -> dict[str, AIProviderExtension]:
         """
         Retrieves and returns the map of AI provider extensions.
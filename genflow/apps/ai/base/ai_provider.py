@@ -4,7 +4,7 @@
 
 from abc import ABC, abstractmethod
 from os import path as osp
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from genflow.apps.ai.base.entities.model import ModelEntity
 from genflow.apps.ai.base.entities.provider import AIProviderEntity
@@ -13,6 +13,9 @@ from genflow.apps.ai.base.model_collection import ModelCollection
 from genflow.apps.common.log import ServerLogManager
 from genflow.apps.common.utils.yaml_utils import load_yaml_file
 
+if TYPE_CHECKING:
+    from genflow.apps.ai.config_store import ConfigStore
+
 slogger = ServerLogManager(__name__)
 
 
@@ -23,6 +26,9 @@ class AIProvider(ABC):
         self.config_path: str = ""
         self.schema: Optional[AIProviderEntity] = None
         self.model_collections_map: dict[str, ModelCollection] = {}
+        # config store of the versions of the schemas, and name of the provider in them
+        self.config_store: Optional["ConfigStore"] = None
+        self.config_name: str = ""
 
     @abstractmethod
     def validate_credentials(self, credentials: dict) -> None:
@@ -44,6 +50,10 @@ class AIProvider(ABC):
                 data is invalid.
         """
 
+        config_version = self.config_store.current if self.config_store else None
+        if config_version is not None:
+            return config_version.providers[self.config_name]
+
         if self.schema:
             return self.schema
 
@@ -71,6 +81,18 @@ class AIProvider(ABC):
 
         return schema
 
+    def set_config_store(self, config_store: "ConfigStore", name: str) -> None:
+        """
+        Reads the schemas of the provider and its model collections from the current
+            version of the given config store, where the provider has the given name.
+        """
+
+        self.config_store = config_store
+        self.config_name = name
+        for key, model_collection_instance in self.model_collections_map.items():
+            model_collection_instance.config_store = config_store
+            model_collection_instance.config_key = key
+
     def get_models(self, model_type: str) -> list[ModelEntity]:
         """
         Retrieve a list of models based on the specified model type.
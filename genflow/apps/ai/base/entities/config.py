@@ -0,0 +1,54 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from genflow.apps.ai.base.entities.model import ModelEntity, ModelIndex
+from genflow.apps.ai.base.entities.provider import AIProviderEntity
+
+
+class ModelCollectionVersion(BaseModel):
+    """
+    Represents the model schemas of a model collection in a version of the model config,
+    along with their indexes.
+    """
+
+    schemas: list[ModelEntity]
+    indexes: dict[str, ModelIndex]
+    default_parameter_configs: Optional[dict] = None
+
+    # pydantic configs
+    model_config = ConfigDict(frozen=True)
+
+    @classmethod
+    def build(
+        cls, schemas: list[ModelEntity], default_parameter_configs: Optional[dict] = None
+    ) -> "ModelCollectionVersion":
+        """
+        Builds the version of the given model schemas, indexing them.
+        """
+
+        return cls(
+            schemas=schemas,
+            indexes={model_schema.id: ModelIndex.build(model_schema) for model_schema in schemas},
+            default_parameter_configs=default_parameter_configs,
+        )
+
+
+class ConfigVersion(BaseModel):
+    """
+    Represents a version of the model config, i.e. the provider schemas by provider name
+    and the model collections by key. A version is never modified, a reload swaps in
+    a new one at once.
+    """
+
+    number: int
+    digest: str
+    providers: dict[str, AIProviderEntity] = {}
+    model_collections: dict[str, ModelCollectionVersion] = {}
+
+    # pydantic configs
+    model_config = ConfigDict(frozen=True, protected_namespaces=())
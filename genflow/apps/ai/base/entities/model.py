@@ -6,7 +6,7 @@ from decimal import Decimal
 from enum import Enum
 from typing import Any, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from genflow.apps.ai.base.entities.shared import ModelType
 from genflow.apps.common.entities import BaseYamlEntity, ConfigurationEntity
@@ -31,6 +31,7 @@ class PropertyKey(Enum):
 
     MODE = "mode"
     CONTEXT_SIZE = "context_size"
+    MAX_CHUNKS = "max_chunks"
 
 
 class CommonModelEntity(BaseYamlEntity):
@@ -87,6 +88,47 @@ class ModelEntity(CommonModelEntity):
     pricing: Optional[PricingConfig] = None
 
 
+class ModelIndex(BaseModel):
+    """
+    Holds the lookups of a model schema that are needed per request, built once when
+    the schemas of a collection are loaded.
+    """
+
+    model_schema: ModelEntity
+    parameter_configs: dict[str, ConfigurationEntity] = {}
+    max_tokens_parameters: tuple[ConfigurationEntity, ...] = ()
+    pricing: Optional[PricingConfig] = None
+    context_size: Optional[int] = None
+    mode: Optional[str] = None
+
+    # pydantic configs
+    model_config = ConfigDict(frozen=True, protected_namespaces=())
+
+    @classmethod
+    def build(cls, model_schema: ModelEntity) -> "ModelIndex":
+        """
+        Builds the index of the given model schema.
+        """
+
+        return cls(
+            model_schema=model_schema,
+            parameter_configs={
+                parameter_config.name: parameter_config
+                for parameter_config in model_schema.parameter_configs
+            },
+            # parameters named after or using the template of max tokens
+            max_tokens_parameters=tuple(
+                parameter_config
+                for parameter_config in model_schema.parameter_configs
+                if parameter_config.name == DefaultParameterName.MAX_TOKENS.value
+                or parameter_config.use_template == DefaultParameterName.MAX_TOKENS.value
+            ),
+            pricing=model_schema.pricing,
+            context_size=model_schema.properties.get(PropertyKey.CONTEXT_SIZE),
+            mode=model_schema.properties.get(PropertyKey.MODE),
+        )
+
+
 class PricingType(Enum):
     """
     Represents different types of pricing.
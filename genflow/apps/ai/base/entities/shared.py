@@ -11,9 +11,11 @@ class ModelType(Enum):
 
     Attributes:
         LLM (str): Represents a large language model.
+        TEXT_EMBEDDING (str): Represents a text embedding model.
     """
 
     LLM = "llm"
+    TEXT_EMBEDDING = "text-embedding"
 
     @classmethod
     def values(cls):
@@ -6,12 +6,14 @@ import decimal
 import os
 from abc import ABC, abstractmethod
 from os import path as osp
-from typing import Mapping, Optional
+from typing import TYPE_CHECKING, Mapping, Optional
 
+from genflow.apps.ai.base.entities.config import ConfigVersion, ModelCollectionVersion
 from genflow.apps.ai.base.entities.model import (
     ConfigurationEntity,
     DefaultParameterName,
     ModelEntity,
+    ModelIndex,
     PricingConfig,
     PricingDetails,
     PricingType,
@@ -19,6 +21,9 @@ from genflow.apps.ai.base.entities.model import (
 from genflow.apps.common.log import ServerLogManager
 from genflow.apps.common.utils.yaml_utils import load_yaml_file
 
+if TYPE_CHECKING:
+    from genflow.apps.ai.config_store import ConfigStore
+
 slogger = ServerLogManager(__name__)
 
 
@@ -34,7 +39,11 @@ class ModelCollection(ABC):
         # .../provider/type/**schemas.yaml
         self.config_path: str = ""
         self.schemas: Optional[list[ModelEntity]] = None
+        self.indexes: Optional[dict[str, ModelIndex]] = None
         self.default_parameter_configs: Optional[dict] = None
+        # config store of the versions of the schemas, and key of the collection in them
+        self.config_store: Optional["ConfigStore"] = None
+        self.config_key: str = ""
 
     @abstractmethod
     def validate_credentials(self, model: str, credentials: Mapping) -> None:
@@ -43,6 +52,11 @@ class ModelCollection(ABC):
         """
         raise NotImplementedError
 
+    def warm_up(self) -> None:
+        """
+        Prepares per-process resources of the collection ahead of the first request.
+        """
+
     def get_models(self) -> list[ModelEntity]:
         """
         Retrieves and returns a list of model schemas as ModelEntity objects.
@@ -54,6 +68,10 @@ class ModelCollection(ABC):
             Exception: If there is an error loading or processing a model schema YAML file.
         """
 
+        model_collection_version = self.get_model_collection_version()
+        if model_collection_version is not None:
+            return model_collection_version.schemas
+
         if self.schemas:
             return self.schemas
 
@@ -130,32 +148,84 @@ class ModelCollection(ABC):
         schemas = sorted(schemas, key=lambda x: model_listing_order.get(x.id, float("inf")))
 
         # cache model schemas
-        self.schemas = schemas
+        self.set_models(schemas)
 
         return schemas
 
+    def set_models(self, schemas: list[ModelEntity]) -> None:
+        """
+        Caches the given model schemas, e.g. loaded from a config snapshot, and their indexes.
+        """
+
+        # index model schemas, before caching them so that the indexes are
+        # available whenever the schemas are
+        self.indexes = {model_schema.id: ModelIndex.build(model_schema) for model_schema in schemas}
+        self.schemas = schemas
+
+    def get_config_version(self) -> Optional[ConfigVersion]:
+        """
+        Returns the current version of the model config of the collection, None if the
+            schemas are loaded from the YAML files by the collection itself.
+        """
+
+        return self.config_store.current if self.config_store else None
+
+    def get_model_collection_version(
+        self, config_version: Optional[ConfigVersion] = None
+    ) -> Optional[ModelCollectionVersion]:
+        """
+        Returns the schemas of the collection in the given version of the model config,
+            the current version by default.
+        """
+
+        if config_version is None:
+            config_version = self.get_config_version()
+
+        if config_version is None:
+            return None
+
+        return config_version.model_collections.get(self.config_key)
+
+    def get_model_index(
+        self, model_name: str, config_version: Optional[ConfigVersion] = None
+    ) -> Optional[ModelIndex]:
+        """
+        Get the index of a model schema by model name, in the given version of the model
+            config or the current one
+        """
+
+        model_collection_version = self.get_model_collection_version(config_version)
+        if model_collection_version is not None:
+            return model_collection_version.indexes.get(model_name)
+
+        indexes = self.indexes
+        if indexes is None:
+            self.get_models()
+            indexes = self.indexes or {}
+
+        return indexes.get(model_name)
+
     def get_model_schema(self, model_name: str) -> Optional[ModelEntity]:
         """
         Get model schema by model name
         """
 
-        # get predefined models (predefined_models)
-        models = self.get_models()
-
-        model_map = {model.id: model for model in models}
-        if model_name in model_map:
-            return model_map[model_name]
+        model_index = self.get_model_index(model_name)
+        if model_index:
+            return model_index.model_schema
 
         return None
 
-    def get_price(self, model: str, price_type: PricingType, tokens: int) -> PricingDetails:
-        # get model schema
-        model_schema = self.get_model_schema(model)
-
-        # get price info from model schema
-        price_config: Optional[PricingConfig] = None
-        if model_schema and model_schema.pricing:
-            price_config = model_schema.pricing
+    def get_price(
+        self,
+        model: str,
+        price_type: PricingType,
+        tokens: int,
+        config_version: Optional[ConfigVersion] = None,
+    ) -> PricingDetails:
+        # get price info from model index, in the version pinned by the caller if any
+        model_index = self.get_model_index(model, config_version)
+        price_config: Optional[PricingConfig] = model_index.pricing if model_index else None
 
         # get unit price
         unit_price = None
@@ -0,0 +1,166 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import hashlib
+import os
+from os import path as osp
+from typing import Mapping, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from genflow.apps.ai.base.entities.config import ConfigVersion, ModelCollectionVersion
+from genflow.apps.ai.base.entities.model import ModelEntity
+from genflow.apps.ai.base.entities.provider import AIProviderEntity
+from genflow.apps.ai.providers.registry import AIProviderExtension
+from genflow.apps.common.log import ServerLogManager
+
+slogger = ServerLogManager(__name__)
+
+# bumped when the layout of the snapshot changes
+SNAPSHOT_VERSION = 1
+
+
+class ModelCollectionSnapshot(BaseModel):
+    """
+    Represents the validated model schemas of a model collection.
+    """
+
+    schemas: list[ModelEntity]
+    default_parameter_configs: Optional[dict] = None
+
+
+class ConfigSnapshot(BaseModel):
+    """
+    Represents the validated provider and model schemas compiled from the YAML files
+    of the model config, along with the digest of those files.
+    """
+
+    version: int = SNAPSHOT_VERSION
+    digest: str
+    providers: dict[str, AIProviderEntity] = {}
+    model_collections: dict[str, ModelCollectionSnapshot] = {}
+
+    # pydantic configs
+    model_config = ConfigDict(protected_namespaces=())
+
+
+def get_config_digest(config_root: str) -> str:
+    """
+    Returns the SHA-256 digest of the paths and contents of the YAML files under the
+        given model config root.
+    """
+
+    digest = hashlib.sha256()
+    yaml_paths = []
+    for dirpath, dirnames, filenames in os.walk(config_root):
+        dirnames.sort()
+        yaml_paths.extend(
+            osp.join(dirpath, filename)
+            for filename in sorted(filenames)
+            if filename.endswith(".yaml")
+        )
+
+    for yaml_path in yaml_paths:
+        digest.update(osp.relpath(yaml_path, config_root).encode())
+        digest.update(b"\0")
+        with open(yaml_path, "rb") as f:
+            digest.update(f.read())
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+
+def compile_config_snapshot(
+    ai_providers: Mapping[str, AIProviderExtension], config_root: str
+) -> ConfigSnapshot:
+    """
+    Compiles the schemas of the given AI providers and their model collections from
+        the YAML files. Fresh instances are used, so that the schemas do not contain
+        what was added to them at runtime.
+    """
+
+    snapshot = ConfigSnapshot(digest=get_config_digest(config_root))
+    for name, ai_provider_extension in ai_providers.items():
+        ai_provider_instance = ai_provider_extension.ai_provider_instance
+        provider = type(ai_provider_instance)()
+        provider.config_path = ai_provider_instance.config_path
+        snapshot.providers[name] = provider.get_schema()
+
+        for key, model_collection_instance in ai_provider_instance.model_collections_map.items():
+            model_collection = type(model_collection_instance)()
+            model_collection.config_path = model_collection_instance.config_path
+            snapshot.model_collections[key] = ModelCollectionSnapshot(
+                schemas=model_collection.get_models(),
+                default_parameter_configs=model_collection.default_parameter_configs,
+            )
+
+    return snapshot
+
+
+def write_config_snapshot(snapshot: ConfigSnapshot, snapshot_path: str) -> None:
+    """
+    Writes the snapshot to the given path, replacing any previous snapshot at once.
+    """
+
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(snapshot.model_dump_json())
+    os.replace(tmp_path, snapshot_path)
+
+
+def load_config_snapshot(snapshot_path: str, config_root: str) -> Optional[ConfigSnapshot]:
+    """
+    Loads the snapshot from the given path. Returns None if there is no snapshot, or
+        if it is invalid or stale, in which case the YAML files are parsed instead.
+    """
+
+    if not osp.exists(snapshot_path):
+        return None
+
+    try:
+        with open(snapshot_path, "rb") as f:
+            snapshot = ConfigSnapshot.model_validate_json(f.read())
+    except Exception as e:
+        slogger.glob.warning(f"Ignoring invalid model config snapshot {snapshot_path}: {str(e)}")
+        return None
+
+    if snapshot.version != SNAPSHOT_VERSION or snapshot.digest != get_config_digest(config_root):
+        slogger.glob.warning(f"Ignoring stale model config snapshot {snapshot_path}")
+        return None
+
+    return snapshot
+
+
+def build_config_version(
+    snapshot: ConfigSnapshot, ai_providers: Mapping[str, AIProviderExtension], number: int
+) -> Optional[ConfigVersion]:
+    """
+    Builds a version of the model config with the given number from the snapshot,
+        indexing the model schemas. Returns None if the snapshot does not cover all
+        the given AI providers and their model collections.
+    """
+
+    model_collection_keys = {
+        key
+        for ai_provider_extension in ai_providers.values()
+        for key in ai_provider_extension.ai_provider_instance.model_collections_map
+    }
+    if set(snapshot.providers) != set(ai_providers) or (
+        set(snapshot.model_collections) != model_collection_keys
+    ):
+        slogger.glob.warning("Ignoring model config snapshot of other AI providers")
+        return None
+
+    return ConfigVersion(
+        number=number,
+        digest=snapshot.digest,
+        providers=snapshot.providers,
+        model_collections={
+            key: ModelCollectionVersion.build(
+                model_collection_snapshot.schemas,
+                model_collection_snapshot.default_parameter_configs,
+            )
+            for key, model_collection_snapshot in snapshot.model_collections.items()
+        },
+    )
@@ -0,0 +1,149 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import threading
+from typing import Callable, Mapping, Optional
+
+from genflow.apps.ai.base.entities.config import ConfigVersion
+from genflow.apps.ai.config_snapshot import (
+    ConfigSnapshot,
+    build_config_version,
+    compile_config_snapshot,
+    get_config_digest,
+    write_config_snapshot,
+)
+from genflow.apps.ai.providers.registry import AIProviderExtension
+from genflow.apps.common.log import ServerLogManager
+
+slogger = ServerLogManager(__name__)
+
+
+class ConfigStore:
+    """
+    Keeps track of the version of the model config used by the registered AI providers.
+    A new version is compiled from the YAML files into fresh schemas and only swapped in
+    once all of them are valid, so that a broken file leaves the current version in place.
+    The AI providers and their model collections read the current version, which is swapped
+    with a single assignment, and model bundles keep the version they were created with,
+    so that in-flight requests are not affected by a swap.
+    """
+
+    def __init__(
+        self,
+        ai_providers: Mapping[str, AIProviderExtension],
+        config_root: str,
+        snapshot_path: Optional[str] = None,
+        on_reload: Optional[Callable[[], None]] = None,
+    ):
+        self.ai_providers = ai_providers
+        self.config_root = config_root
+        self.snapshot_path = snapshot_path
+        self.on_reload = on_reload
+        self.current: Optional[ConfigVersion] = None
+        # digest of the files that failed to compile, not compiled again until they change
+        self._failed_digest: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> int:
+        """
+        Returns the number of the current version, 0 if none was swapped in.
+        """
+
+        current = self.current
+        return current.number if current else 0
+
+    @property
+    def digest(self) -> Optional[str]:
+        """
+        Returns the digest of the YAML files of the current version, if any.
+        """
+
+        current = self.current
+        return current.digest if current else None
+
+    def set_snapshot(self, snapshot: ConfigSnapshot) -> bool:
+        """
+        Swaps in the given snapshot as a new version, returns whether it was applied.
+        """
+
+        with self._lock:
+            return self._set_snapshot(snapshot)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Compiles and swaps in a new version if the YAML files changed since the current
+            version, returns whether a new version was swapped in.
+        """
+
+        with self._lock:
+            digest = get_config_digest(self.config_root)
+            if not force and digest in (self.digest, self._failed_digest):
+                return False
+
+            try:
+                snapshot = compile_config_snapshot(self.ai_providers, self.config_root)
+            except Exception as e:
+                self._failed_digest = digest
+                slogger.glob.error(f"Keeping model config version {self.version}: {str(e)}")
+                return False
+
+            if not self._set_snapshot(snapshot):
+                return False
+
+            if self.on_reload:
+                self.on_reload()
+
+            if self.snapshot_path:
+                # workers started later load the new version
+                try:
+                    write_config_snapshot(snapshot, self.snapshot_path)
+                except OSError as e:
+                    slogger.glob.warning(f"Failed to write model config snapshot: {str(e)}")
+
+            slogger.glob.info(f"Reloaded model config version {self.version}")
+            return True
+
+    def watch(self, interval: float) -> None:
+        """
+        Starts a daemon thread reloading the config when the YAML files change, checked
+            every given number of seconds.
+        """
+
+        if self._watcher is not None:
+            return
+
+        def run():
+            while not self._stopped.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    slogger.glob.error(f"Failed to reload model config: {str(e)}")
+
+        self._stopped.clear()
+        self._watcher = threading.Thread(target=run, name="model-config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        """
+        Stops watching the YAML files.
+        """
+
+        self._stopped.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _set_snapshot(self, snapshot: ConfigSnapshot) -> bool:
+        config_version = build_config_version(snapshot, self.ai_providers, self.version + 1)
+        if config_version is None:
+            return False
+
+        for name, ai_provider_extension in self.ai_providers.items():
+            ai_provider_extension.ai_provider_instance.set_config_store(self, name)
+
+        self.current = config_version
+        return True
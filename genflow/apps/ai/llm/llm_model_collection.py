@@ -5,10 +5,14 @@
 import re
 import time
 from abc import abstractmethod
+from contextvars import ContextVar
 from enum import Enum
-from typing import Generator, Optional, Union
+from typing import AsyncGenerator, Generator, Optional, Union
 
-from genflow.apps.ai.base.entities.model import PricingType, PropertyKey
+from asgiref.sync import sync_to_async
+
+from genflow.apps.ai.base.entities.config import ConfigVersion
+from genflow.apps.ai.base.entities.model import PricingType
 from genflow.apps.ai.base.entities.shared import ModelType
 from genflow.apps.ai.base.model_collection import ModelCollection
 from genflow.apps.ai.llm.entities import Result, Usage
@@ -18,6 +22,15 @@ from genflow.apps.common.log import ServerLogManager
 
 slogger = ServerLogManager(__name__)
 
+# start time of the current call, kept per thread and per asyncio task
+# since model collections are shared between concurrent calls
+_call_started_at: ContextVar[float] = ContextVar("call_started_at", default=0.0)
+# version of the model config pinned by the current call, so that a stream is priced
+# with the version it was started with
+_call_config_version: ContextVar[Optional[ConfigVersion]] = ContextVar(
+    "call_config_version", default=None
+)
+
 
 class LLMMode(Enum):
     """
@@ -47,6 +60,22 @@ class LLMModelCollection(ModelCollection):
 
         raise NotImplementedError
 
+    def get_message_tokens_count(self, model: str, message: Message) -> int:
+        """
+        Gets the number of tokens a single message adds to a prompt, excluding the
+            tokens counted once per prompt.
+        """
+
+        return self.get_tokens_count(model, [message]) - self.get_tokens_count(model, [])
+
+    def get_tokenizer_name(self, model: str) -> str:
+        """
+        Returns the name of the tokenizer used to count the tokens of the given model.
+        Token counts are only comparable between models sharing the same tokenizer.
+        """
+
+        return model
+
     # pylint: disable=too-many-positional-arguments
     @abstractmethod
     def _call(
@@ -61,19 +90,62 @@ class LLMModelCollection(ModelCollection):
     ) -> Union[Result, Generator]:
         """
         Calls the model with the given parameters and messages.
+        Stream responses yield the text of each delta, as a str or a ResultChunk,
+            and end with a ResultChunk carrying the usage.
         """
 
         raise NotImplementedError
 
-    def get_model_mode(self, model: str) -> LLMMode:
+    # pylint: disable=too-many-positional-arguments
+    async def _acall(
+        self,
+        model: str,
+        credentials: dict,
+        messages: list[Message],
+        parameters: dict,
+        stop: Optional[list[str]] = None,
+        stream: bool = True,
+        user: Optional[str] = None,
+    ) -> Union[Result, AsyncGenerator]:
+        """
+        Calls the model asynchronously with the given parameters and messages.
+        Collections without a native async client run `_call` in a worker thread,
+            reading the stream response one chunk at a time.
+        """
+
+        response = await sync_to_async(self._call, thread_sensitive=False)(
+            model, credentials, messages, parameters, stop, stream, user
+        )
+
+        if isinstance(response, Generator):
+            return self._iterate_in_thread(response)
+
+        return response
+
+    async def _iterate_in_thread(self, response: Generator) -> AsyncGenerator:
+        """
+        Yields the items of a blocking generator, advancing it in a worker thread.
+        """
+
+        sentinel = object()
+        try:
+            while True:
+                chunk = await sync_to_async(next, thread_sensitive=False)(response, sentinel)
+                if chunk is sentinel:
+                    break
+                yield chunk
+        finally:
+            await sync_to_async(response.close, thread_sensitive=False)()
+
+    def get_model_mode(self, model: str, config_version: Optional[ConfigVersion] = None) -> LLMMode:
         """
-        Returns model mode
+        Returns model mode, in the given version of the model config or the current one
         """
-        model_schema = self.get_model_schema(model)
+        model_index = self.get_model_index(model, config_version)
 
         mode = LLMMode.CHAT
-        if model_schema and model_schema.properties.get(PropertyKey.MODE):
-            mode = LLMMode(model_schema.properties[PropertyKey.MODE])
+        if model_index and model_index.mode:
+            mode = LLMMode(model_index.mode)
 
         return mode
 
@@ -82,10 +154,10 @@ class LLMModelCollection(ModelCollection):
         Retrieves the parameter configurations for a given model.
         """
 
-        schema = self.get_model_schema(model_name)
+        model_index = self.get_model_index(model_name)
 
-        if schema:
-            return schema.parameter_configs
+        if model_index:
+            return model_index.model_schema.parameter_configs
 
         return []
 
@@ -127,21 +199,34 @@ class LLMModelCollection(ModelCollection):
 
         return processed_parameters
 
+    def _get_call_config_version(self) -> Optional[ConfigVersion]:
+        """
+        Returns the version of the model config pinned by the current call.
+        """
+
+        return _call_config_version.get()
+
     def _calculate_usage(self, model: str, input_tokens: int, output_tokens: int) -> Usage:
         """
         Calculates the usage and cost based on the input and output tokens.
         """
 
+        config_version = self._get_call_config_version()
+
         # get input price info
         input_price_info = self.get_price(
             model=model,
             price_type=PricingType.INPUT,
             tokens=input_tokens,
+            config_version=config_version,
         )
 
         # get output price info
         output_price_info = self.get_price(
-            model=model, price_type=PricingType.OUTPUT, tokens=output_tokens
+            model=model,
+            price_type=PricingType.OUTPUT,
+            tokens=output_tokens,
+            config_version=config_version,
         )
 
         # calculate usage
@@ -157,7 +242,7 @@ class LLMModelCollection(ModelCollection):
             total_tokens=input_tokens + output_tokens,
             total_price=input_price_info.total_amount + output_price_info.total_amount,
             currency=input_price_info.currency,
-            latency=time.perf_counter() - self.started_at,
+            latency=time.perf_counter() - _call_started_at.get(),
         )
         return usage
 
@@ -171,9 +256,12 @@ class LLMModelCollection(ModelCollection):
         stop: Optional[list[str]] = None,
         stream: bool = True,
         user: Optional[str] = None,
+        config_version: Optional[ConfigVersion] = None,
     ) -> Union[Result, Generator]:
         """
         Calls the model with the given parameters and messages, and returns the result.
+        The model is priced with the given version of the model config, the current one
+            by default.
         """
 
         # process parameters
@@ -182,7 +270,10 @@ class LLMModelCollection(ModelCollection):
 
         parameters = self._process_model_parameters(model, parameters)
 
-        self.started_at = time.perf_counter()
+        _call_started_at.set(time.perf_counter())
+        _call_config_version.set(
+            config_version if config_version is not None else self.get_config_version()
+        )
 
         try:
             # ToDo: support response format
@@ -193,6 +284,42 @@ class LLMModelCollection(ModelCollection):
 
         return result
 
+    # pylint: disable=too-many-positional-arguments
+    async def acall(
+        self,
+        model: str,
+        credentials: dict,
+        messages: list[Message],
+        parameters: Optional[dict] = None,
+        stop: Optional[list[str]] = None,
+        stream: bool = True,
+        user: Optional[str] = None,
+        config_version: Optional[ConfigVersion] = None,
+    ) -> Union[Result, AsyncGenerator]:
+        """
+        Calls the model with the given parameters and messages without blocking the event loop,
+            and returns the result or an async generator of result chunks, priced like `call`.
+        """
+
+        # process parameters
+        if parameters is None:
+            parameters = {}
+
+        parameters = self._process_model_parameters(model, parameters)
+
+        _call_started_at.set(time.perf_counter())
+        _call_config_version.set(
+            config_version if config_version is not None else self.get_config_version()
+        )
+
+        try:
+            result = await self._acall(model, credentials, messages, parameters, stop, stream, user)
+        except Exception as e:
+            slogger.glob.error(f"Error calling model {model}: {str(e)}")
+            raise e
+
+        return result
+
     def truncate_at_stop_tokens(self, text: str, stop: list[str]) -> str:
         """
         Truncates the given text at the first occurrence of any stop tokens.
@@ -0,0 +1,62 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from typing import Optional, Union
+
+from genflow.apps.ai.llm.entities import Result, ResultChunk, Usage
+from genflow.apps.ai.llm.messages import AssistantMessage, Message
+
+# item of a stream response: the text of a delta, or a result chunk carrying the
+# model, messages and usage, usually once at the end of the stream
+StreamItem = Union[str, ResultChunk]
+
+
+class StreamAccumulator:
+    """
+    Collects the items of a stream response. Texts are buffered and joined once,
+    the result is built when the stream ends.
+    """
+
+    __slots__ = ("parts", "model", "messages", "usage")
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+        self.model: Optional[str] = None
+        self.messages: list[Message] = []
+        self.usage: Optional[Usage] = None
+
+    def add(self, item: StreamItem) -> str:
+        """
+        Adds an item of the stream response, returns its text.
+        """
+
+        if isinstance(item, str):
+            self.parts.append(item)
+            return item
+
+        text = item.delta.message.content
+        self.parts.append(text)
+
+        if not self.model:
+            self.model = item.model
+
+        if not self.messages:
+            self.messages = item.messages
+
+        if item.delta.usage:
+            self.usage = item.delta.usage
+
+        return text
+
+    def to_result(self) -> Result:
+        """
+        Returns the result containing the model, messages, full text and usage details.
+        """
+
+        return Result(
+            model=self.model,
+            messages=self.messages,
+            message=AssistantMessage(content="".join(self.parts)),
+            usage=self.usage or Usage.empty_usage(),
+        )
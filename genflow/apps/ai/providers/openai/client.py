@@ -5,27 +5,14 @@
 from typing import Mapping
 
 from httpx import Timeout
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 
-class OpenAIClient(OpenAI):
+class OpenAICredentialsMixin:
     """
-    Provides a client for interacting
-    with the OpenAI API. It initializes the client using the provided credentials and
-    transforms them into the required keyword arguments.
+    Transforms the provider credentials into the keyword arguments of the OpenAI clients.
     """
 
-    def __init__(self, credentials: dict):
-        """
-        Initializes the OpenAIClient instance with the given credentials.
-        """
-
-        # transform credentials to kwargs for model instance
-        credentials_kwargs = self._to_credential_kwargs(credentials)
-
-        # init model client
-        super().__init__(**credentials_kwargs)
-
     def _to_credential_kwargs(self, credentials: Mapping) -> dict:
         """
         Converts the provided credentials into a dictionary of keyword arguments
@@ -47,3 +34,40 @@ class OpenAIClient(OpenAI):
             credentials_kwargs["organization"] = credentials["openai_organization"]
 
         return credentials_kwargs
+
+
+class OpenAIClient(OpenAICredentialsMixin, OpenAI):
+    """
+    Provides a client for interacting
+    with the OpenAI API. It initializes the client using the provided credentials and
+    transforms them into the required keyword arguments.
+    """
+
+    def __init__(self, credentials: dict):
+        """
+        Initializes the OpenAIClient instance with the given credentials.
+        """
+
+        # transform credentials to kwargs for model instance
+        credentials_kwargs = self._to_credential_kwargs(credentials)
+
+        # init model client
+        super().__init__(**credentials_kwargs)
+
+
+class AsyncOpenAIClient(OpenAICredentialsMixin, AsyncOpenAI):
+    """
+    Provides an asyncio client for interacting with the OpenAI API, initialized
+    the same way as `OpenAIClient`.
+    """
+
+    def __init__(self, credentials: dict):
+        """
+        Initializes the AsyncOpenAIClient instance with the given credentials.
+        """
+
+        # transform credentials to kwargs for model instance
+        credentials_kwargs = self._to_credential_kwargs(credentials)
+
+        # init model client
+        super().__init__(**credentials_kwargs)
@@ -0,0 +1,233 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import asyncio
+import hashlib
+import inspect
+import itertools
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from pydantic import BaseModel
+
+from genflow.apps.ai.providers.openai.client import AsyncOpenAIClient, OpenAIClient
+from genflow.apps.common.log import ServerLogManager
+
+slogger = ServerLogManager(__name__)
+
+
+class ClientPoolStats(BaseModel):
+    """
+    Represents the usage counters of the client pool.
+    """
+
+    size: int
+    max_size: int
+    in_use: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class OpenAIClientPool:
+    """
+    Keeps OpenAI clients, and therefore their keep-alive connections, alive across requests.
+    Clients are keyed by a hash of the credentials and base URL, the least recently used
+    client is evicted and closed once the pool is full. An evicted client that is still
+    leased is closed when its last lease is released.
+    """
+
+    DEFAULT_MAX_SIZE = 32
+    client_class: type = OpenAIClient
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._clients: OrderedDict[str, OpenAIClient] = OrderedDict()
+        # number of leases per client id, for pooled and evicted clients
+        self._leases: dict[int, int] = {}
+        self._evicted: dict[int, OpenAIClient] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_key(credentials: Mapping) -> str:
+        """
+        Returns the pool key of the given credentials.
+        """
+
+        data = {
+            "api_key": credentials.get("openai_api_key"),
+            "api_base": credentials.get("openai_api_base"),
+            "organization": credentials.get("openai_organization"),
+        }
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    def _get_pool_key(self, credentials: Mapping) -> str:
+        """
+        Returns the key the client of the given credentials is pooled under.
+        """
+
+        return self.get_key(credentials)
+
+    def acquire(self, credentials: Mapping) -> OpenAIClient:
+        """
+        Returns a client for the given credentials, creating it if it is not pooled yet.
+        Every acquired client must be released with `release`.
+        """
+
+        key = self._get_pool_key(credentials)
+        evicted = []
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                self._clients.move_to_end(key)
+            else:
+                self.misses += 1
+                client = self.client_class(credentials=dict(credentials))
+                self._clients[key] = client
+                while len(self._clients) > self.max_size:
+                    _, evicted_client = self._clients.popitem(last=False)
+                    self.evictions += 1
+                    if self._leases.get(id(evicted_client)):
+                        self._evicted[id(evicted_client)] = evicted_client
+                    else:
+                        evicted.append(evicted_client)
+
+            self._leases[id(client)] = self._leases.get(id(client), 0) + 1
+
+        for evicted_client in evicted:
+            self._close(evicted_client)
+
+        return client
+
+    def release(self, client: OpenAIClient) -> None:
+        """
+        Releases a client acquired with `acquire`, closing it if it was evicted meanwhile.
+        """
+
+        with self._lock:
+            leases = self._leases.get(id(client), 0) - 1
+            if leases > 0:
+                self._leases[id(client)] = leases
+                return
+
+            self._leases.pop(id(client), None)
+            evicted_client = self._evicted.pop(id(client), None)
+
+        if evicted_client is not None:
+            self._close(evicted_client)
+
+    def get_stats(self) -> ClientPoolStats:
+        """
+        Returns the pool size and usage counters.
+        """
+
+        with self._lock:
+            return ClientPoolStats(
+                size=len(self._clients),
+                max_size=self.max_size,
+                in_use=len(self._leases),
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+    def clear(self) -> None:
+        """
+        Removes all clients from the pool, closing the ones that are not leased.
+        """
+
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            idle = []
+            for client in clients:
+                if self._leases.get(id(client)):
+                    self._evicted[id(client)] = client
+                else:
+                    idle.append(client)
+
+        for client in idle:
+            self._close(client)
+
+    def _close(self, client: OpenAIClient) -> None:
+        """
+        Closes the client and its connections.
+        """
+
+        try:
+            client.close()
+        except Exception as e:
+            slogger.glob.warning(f"Failed to close OpenAI client: {str(e)}")
+
+
+class AsyncOpenAIClientPool(OpenAIClientPool):
+    """
+    Pools asyncio OpenAI clients. Their connections are bound to the event loop they were
+    opened in, so clients are pooled per event loop and must be acquired from a coroutine.
+    """
+
+    client_class = AsyncOpenAIClient
+
+    def __init__(self, max_size: int = OpenAIClientPool.DEFAULT_MAX_SIZE) -> None:
+        super().__init__(max_size=max_size)
+        # ids of the event loops, unlike id() they are not reused once a loop is collected
+        self._loop_ids: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._loop_counter = itertools.count()
+        # keeps references to the pending close tasks
+        self._closing: set[asyncio.Task] = set()
+
+    def _get_pool_key(self, credentials: Mapping) -> str:
+        """
+        Returns the key the client of the given credentials is pooled under
+            for the running event loop.
+        """
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_id = self._loop_ids.get(loop)
+            if loop_id is None:
+                loop_id = self._loop_ids[loop] = next(self._loop_counter)
+
+        return f"{self.get_key(credentials)}:{loop_id}"
+
+    def _close(self, client: AsyncOpenAIClient) -> None:
+        """
+        Schedules closing the client on the running event loop. Without a running loop
+            the client is left to the garbage collector.
+        """
+
+        closing = client.close()
+        if not inspect.isawaitable(closing):
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            closing.close()
+            return
+
+        task = loop.create_task(self._aclose(closing))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _aclose(self, closing) -> None:
+        """
+        Awaits closing a client, logging failures.
+        """
+
+        try:
+            await closing
+        except Exception as e:
+            slogger.glob.warning(f"Failed to close OpenAI client: {str(e)}")
+
+
+openai_client_pool = OpenAIClientPool()
+async_openai_client_pool = AsyncOpenAIClientPool()
@@ -2,15 +2,14 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
-from typing import Generator, Optional, Union, cast
+from typing import AsyncGenerator, Generator, Optional, Union, cast
 
-import tiktoken
-from openai import Stream
+from openai import AsyncStream, Stream
 from openai.types import Completion
 from openai.types.chat import ChatCompletion, ChatCompletionChunk
 
 from genflow.apps.ai.base.entities.shared import ModelType
-from genflow.apps.ai.llm.entities import Result, ResultChunk, ResultChunkDelta
+from genflow.apps.ai.llm.entities import Result, ResultChunk, ResultChunkDelta, Usage
 from genflow.apps.ai.llm.llm_model_collection import LLMMode, LLMModelCollection
 from genflow.apps.ai.llm.messages import (
     AssistantMessage,
@@ -19,13 +18,129 @@ from genflow.apps.ai.llm.messages import (
     SystemMessage,
     UserMessage,
 )
-from genflow.apps.ai.providers.openai.client import OpenAIClient
+from genflow.apps.ai.providers.openai.client import AsyncOpenAIClient, OpenAIClient
+from genflow.apps.ai.providers.openai.client_pool import (
+    async_openai_client_pool,
+    openai_client_pool,
+)
 from genflow.apps.ai.providers.registry import register_model_collection
+from genflow.apps.ai.tokenizer import tokenizer_registry
 from genflow.apps.common.log import ServerLogManager
 
 slogger = ServerLogManager(__name__)
 
 
+class _PooledClientStream(AsyncGenerator):
+    """
+    Wraps the async stream response of a pooled client, releasing the client once the
+    stream is exhausted, fails or is closed. A stream dropped by its consumer without
+    being closed releases the client when it is collected.
+    """
+
+    def __init__(self, client: AsyncOpenAIClient, response: AsyncGenerator) -> None:
+        self._client = client
+        self._response = response
+        self._released = False
+
+    async def asend(self, value):
+        try:
+            return await self._response.asend(value)
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def athrow(self, *args):
+        try:
+            return await self._response.athrow(*args)
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self) -> None:
+        if self._released:
+            return
+
+        self._released = True
+        try:
+            await self._response.aclose()
+        finally:
+            async_openai_client_pool.release(self._client)
+
+    def __del__(self) -> None:
+        if not self._released:
+            self._released = True
+            async_openai_client_pool.release(self._client)
+
+
+class _StreamState:
+    """
+    Collects the texts and usage of a stream response. The texts are joined and
+    the final chunk is built once, when the stream ends.
+    """
+
+    __slots__ = (
+        "parts",
+        "input_tokens",
+        "output_tokens",
+        "model",
+        "system_fingerprint",
+        "index",
+        "finish_reason",
+        "finish_text",
+    )
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.model: Optional[str] = None
+        self.system_fingerprint: Optional[str] = None
+        self.index = 0
+        self.finish_reason: Optional[str] = None
+        self.finish_text = ""
+
+    def finish(
+        self,
+        chunk: Union[ChatCompletionChunk, Completion],
+        index: int,
+        finish_reason: str,
+        text: str,
+    ) -> None:
+        """
+        Keeps the chunk with the finish reason, which is returned with the final chunk.
+        """
+
+        self.model = chunk.model
+        self.system_fingerprint = chunk.system_fingerprint
+        self.index = index
+        self.finish_reason = finish_reason
+        self.finish_text = text
+
+    def get_text(self) -> str:
+        """
+        Returns the full text of the stream response.
+        """
+
+        return "".join(self.parts) + self.finish_text
+
+    def to_result_chunk(self, model: str, messages: list[Message], usage: Usage) -> ResultChunk:
+        """
+        Returns the final chunk of the stream response.
+        """
+
+        return ResultChunk(
+            model=self.model or model,
+            messages=messages,
+            system_fingerprint=self.system_fingerprint,
+            delta=ResultChunkDelta(
+                index=self.index,
+                message=AssistantMessage(content=self.finish_text),
+                usage=usage,
+                finish_reason=self.finish_reason,
+            ),
+        )
+
+
 @register_model_collection(ai_provider="openai", model_type=ModelType.LLM.value)
 class OpenAILargeLanguageModel(LLMModelCollection):
     """
@@ -64,6 +179,15 @@ class OpenAILargeLanguageModel(LLMModelCollection):
             slogger.glob.error("Error validating credentials for model {model}: {ex}")
             raise ex
 
+    def warm_up(self) -> None:
+        """
+        Preloads the tokenizers of all models in the collection.
+        """
+
+        tokenizer_registry.preload(
+            {self._get_tokenizer_model(model.id) for model in self.get_models()}
+        )
+
     def get_tokens_count(
         self,
         model: str,
@@ -85,6 +209,13 @@ class OpenAILargeLanguageModel(LLMModelCollection):
                 return 0
             return self._get_tokens_count_from_string(model, messages[0].content)
 
+    def get_tokenizer_name(self, model: str) -> str:
+        """
+        Returns the name of the tiktoken encoding used by the given model.
+        """
+
+        return tokenizer_registry.get_encoding(self._get_tokenizer_model(model)).name
+
     def _get_tokens_count_from_messages(self, model: str, messages: list[Message]) -> int:
         """
         Return the number of tokens used by a list of messages.
@@ -92,16 +223,8 @@ class OpenAILargeLanguageModel(LLMModelCollection):
         Information on how messages are converted to tokens: https://platform.openai.com/docs/advanced-usage/managing-tokens
         """
 
-        # Use gpt4o to calculate chatgpt-4o-latest's token.
-        if model == "chatgpt-4o-latest" or model.startswith("o1"):
-            model = "gpt-4o"
-
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            slogger.glob.warning("Warning: model not found. Using cl100k_base encoding.")
-            model = "cl100k_base"
-            encoding = tiktoken.get_encoding(model)
+        model = self._get_tokenizer_model(model)
+        encoding = tokenizer_registry.get_encoding(model)
 
         if model.startswith("gpt-3.5-turbo-0301"):
             tokens_per_message = (
@@ -149,15 +272,22 @@ class OpenAILargeLanguageModel(LLMModelCollection):
         Return the number of tokens used by a text.
         """
 
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            slogger.glob.warning("Warning: model not found. Using cl100k_base encoding.")
-            encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = tokenizer_registry.get_encoding(self._get_tokenizer_model(model))
 
         num_tokens = len(encoding.encode(text))
         return num_tokens
 
+    def _get_tokenizer_model(self, model: str) -> str:
+        """
+        Returns the model name whose tokenizer is used to count the tokens of the given model.
+        """
+
+        # Use gpt4o to calculate chatgpt-4o-latest's token.
+        if model == "chatgpt-4o-latest" or model.startswith("o1"):
+            return "gpt-4o"
+
+        return model
+
     # pylint: disable=too-many-positional-arguments
     def _call(
         self,
@@ -173,20 +303,50 @@ class OpenAILargeLanguageModel(LLMModelCollection):
         Calls the model with the given parameters and messages.
         """
 
-        # init model client
-        client = OpenAIClient(credentials=credentials)
+        # get pooled model client
+        client = openai_client_pool.acquire(credentials)
+        try:
+            response = self._call_with_client(
+                model=model,
+                client=client,
+                messages=messages,
+                parameters=parameters,
+                stop=stop,
+                stream=stream,
+                user=user,
+            )
+        except Exception:
+            openai_client_pool.release(client)
+            raise
 
-        extra_model_kwargs = {}
-        if stop:
-            extra_model_kwargs["stop"] = stop
+        if isinstance(response, Generator):
+            # keep the client leased until the stream is consumed
+            return self._release_client_after_stream(client, response)
 
-        if user:
-            extra_model_kwargs["user"] = user
+        openai_client_pool.release(client)
+        return response
 
-        if stream:
-            extra_model_kwargs["stream_options"] = {"include_usage": True}
-        # get model mode
-        model_mode = self.get_model_mode(model=model)
+    # pylint: disable=too-many-positional-arguments
+    def _call_with_client(
+        self,
+        model: str,
+        client: OpenAIClient,
+        messages: list[Message],
+        parameters: dict,
+        stop: Optional[list[str]] = None,
+        stream: bool = True,
+        user: Optional[str] = None,
+    ) -> Union[Result, Generator]:
+        """
+        Calls the model with the given client, parameters and messages.
+        """
+
+        extra_model_kwargs = self._get_extra_model_kwargs(stop, stream, user)
+
+        # get model mode, in the version pinned by the call
+        model_mode = self.get_model_mode(
+            model=model, config_version=self._get_call_config_version()
+        )
 
         if model_mode == LLMMode.CHAT:
             # chat model
@@ -210,6 +370,100 @@ class OpenAILargeLanguageModel(LLMModelCollection):
                 stream=stream,
             )
 
+    def _get_extra_model_kwargs(
+        self, stop: Optional[list[str]], stream: bool, user: Optional[str]
+    ) -> dict:
+        """
+        Returns the optional request arguments of the model call.
+        """
+
+        extra_model_kwargs = {}
+        if stop:
+            extra_model_kwargs["stop"] = stop
+
+        if user:
+            extra_model_kwargs["user"] = user
+
+        if stream:
+            extra_model_kwargs["stream_options"] = {"include_usage": True}
+
+        return extra_model_kwargs
+
+    def _release_client_after_stream(self, client: OpenAIClient, response: Generator) -> Generator:
+        """
+        Yields the stream response and releases the client once the stream is closed.
+        """
+
+        try:
+            yield from response
+        finally:
+            openai_client_pool.release(client)
+
+    # pylint: disable=too-many-positional-arguments
+    async def _acall(
+        self,
+        model: str,
+        credentials: dict,
+        messages: list[Message],
+        parameters: dict,
+        stop: Optional[list[str]] = None,
+        stream: bool = True,
+        user: Optional[str] = None,
+    ) -> Union[Result, AsyncGenerator]:
+        """
+        Calls the model asynchronously with the given parameters and messages.
+        """
+
+        # get pooled model client of the running event loop
+        client = async_openai_client_pool.acquire(credentials)
+        # set once the stream response holds the client, e.g. not on cancellation
+        handed_off = False
+        try:
+            extra_model_kwargs = self._get_extra_model_kwargs(stop, stream, user)
+
+            model_mode = self.get_model_mode(
+                model=model, config_version=self._get_call_config_version()
+            )
+            if model_mode == LLMMode.CHAT:
+                # chat model
+                response = await self._achat_completions(
+                    model=model,
+                    client=client,
+                    messages=messages,
+                    parameters=parameters,
+                    extra_model_kwargs=extra_model_kwargs,
+                    stop=stop,
+                    stream=stream,
+                )
+            else:
+                # text completion model
+                response = await self._acompletions(
+                    model=model,
+                    client=client,
+                    messages=messages,
+                    parameters=parameters,
+                    extra_model_kwargs=extra_model_kwargs,
+                    stream=stream,
+                )
+
+            if isinstance(response, AsyncGenerator):
+                # keep the client leased until the stream is consumed
+                response = _PooledClientStream(client, response)
+                handed_off = True
+
+            return response
+        finally:
+            if not handed_off:
+                async_openai_client_pool.release(client)
+
+    async def _aiterate(self, response: Generator) -> AsyncGenerator:
+        """
+        Yields the items of a generator that does not block.
+        """
+
+        for chunk in response:
+            yield chunk
+
     # pylint: disable=too-many-positional-arguments
     def _chat_completions(
         self,
@@ -225,20 +479,9 @@ class OpenAILargeLanguageModel(LLMModelCollection):
         Calls llm chat model
         """
 
-        # clear illegal prompt messages
-        messages = self._fix_messages(model, messages)
-
-        block_as_stream = False
-        if model.startswith("o1"):
-            if stream:
-                block_as_stream = True
-                stream = False
-
-                if "stream_options" in extra_model_kwargs:
-                    del extra_model_kwargs["stream_options"]
-
-            if "stop" in extra_model_kwargs:
-                del extra_model_kwargs["stop"]
+        messages, stream, block_as_stream = self._prepare_chat_completions(
+            model, messages, extra_model_kwargs, stream
+        )
 
         # chat model
         response = client.chat.completions.create(
@@ -261,6 +504,77 @@ class OpenAILargeLanguageModel(LLMModelCollection):
 
         return block_result
 
+    # pylint: disable=too-many-positional-arguments
+    async def _achat_completions(
+        self,
+        model: str,
+        client: AsyncOpenAIClient,
+        messages: list[Message],
+        parameters: dict,
+        extra_model_kwargs: dict,
+        stop: Optional[list[str]] = None,
+        stream: bool = True,
+    ) -> Union[Result, AsyncGenerator]:
+        """
+        Calls llm chat model asynchronously
+        """
+
+        messages, stream, block_as_stream = self._prepare_chat_completions(
+            model, messages, extra_model_kwargs, stream
+        )
+
+        # chat model
+        response = await client.chat.completions.create(
+            messages=[message.to_dict() for message in messages],
+            model=model,
+            stream=stream,
+            **parameters,
+            **extra_model_kwargs,
+        )
+
+        if stream:
+            return self._aprocess_chat_completions_stream_response(model, response, messages)
+
+        block_result = self._process_chat_completions_response(model, response, messages)
+
+        if block_as_stream:
+            return self._aiterate(
+                self._process_chat_completions_block_as_stream_response(
+                    block_result, messages, stop
+                )
+            )
+
+        return block_result
+
+    def _prepare_chat_completions(
+        self,
+        model: str,
+        messages: list[Message],
+        extra_model_kwargs: dict,
+        stream: bool,
+    ) -> tuple[list[Message], bool, bool]:
+        """
+        Adapts the messages and request options to the model, returns the messages, whether
+            to stream the response and whether to return a block response as a stream
+        """
+
+        # clear illegal prompt messages
+        messages = self._fix_messages(model, messages)
+
+        block_as_stream = False
+        if model.startswith("o1"):
+            if stream:
+                block_as_stream = True
+                stream = False
+
+                if "stream_options" in extra_model_kwargs:
+                    del extra_model_kwargs["stream_options"]
+
+            if "stop" in extra_model_kwargs:
+                del extra_model_kwargs["stop"]
+
+        return messages, stream, block_as_stream
+
     def _fix_messages(self, model: str, messages: list[Message]) -> list[Message]:
         """
         Fix messages for OpenAI API based on the model
@@ -310,58 +624,72 @@ class OpenAILargeLanguageModel(LLMModelCollection):
         Processes llm chat stream response
         """
 
-        final_chunk = ResultChunk(
-            model=model,
-            messages=messages,
-            delta=ResultChunkDelta(
-                index=0,
-                message=AssistantMessage(content=""),
-            ),
-        )
-
-        full_assistant_content = ""
-        input_tokens = 0
-        output_tokens = 0
+        state = _StreamState()
         for chunk in response:
-            if len(chunk.choices) == 0:
-                if chunk.usage:
-                    # get input and output tokens from usage
-                    input_tokens = chunk.usage.prompt_tokens
-                    output_tokens = chunk.usage.completion_tokens
-                continue
+            text = self._process_chat_completions_stream_chunk(chunk, state)
+            if text is not None:
+                yield text
 
-            delta = chunk.choices[0]
-            has_finish_reason = delta.finish_reason is not None
+        yield self._finish_chat_completions_stream(model, messages, state)
 
-            if not has_finish_reason and (delta.delta.content is None or delta.delta.content == ""):
-                continue
+    async def _aprocess_chat_completions_stream_response(
+        self,
+        model: str,
+        response: AsyncStream[ChatCompletionChunk],
+        messages: list[Message],
+    ) -> AsyncGenerator:
+        """
+        Processes llm chat async stream response
+        """
 
-            # transform assistant message to message
-            assistant_message = AssistantMessage(content=delta.delta.content or "")
+        state = _StreamState()
+        try:
+            async for chunk in response:
+                text = self._process_chat_completions_stream_chunk(chunk, state)
+                if text is not None:
+                    yield text
+        finally:
+            # the connection is released early if the stream is closed before its end
+            await response.close()
+
+        yield self._finish_chat_completions_stream(model, messages, state)
+
+    def _process_chat_completions_stream_chunk(
+        self, chunk: ChatCompletionChunk, state: "_StreamState"
+    ) -> Optional[str]:
+        """
+        Processes a chunk of llm chat stream response, returns the text to yield
+        """
 
-            full_assistant_content += delta.delta.content or ""
+        if not chunk.choices:
+            if chunk.usage:
+                # get input and output tokens from usage
+                state.input_tokens = chunk.usage.prompt_tokens
+                state.output_tokens = chunk.usage.completion_tokens
+            return None
 
-            if has_finish_reason:
-                final_chunk = ResultChunk(
-                    model=chunk.model,
-                    messages=messages,
-                    system_fingerprint=chunk.system_fingerprint,
-                    delta=ResultChunkDelta(
-                        index=delta.index,
-                        message=assistant_message,
-                        finish_reason=delta.finish_reason,
-                    ),
-                )
-            else:
-                yield ResultChunk(
-                    model=chunk.model,
-                    messages=messages,
-                    system_fingerprint=chunk.system_fingerprint,
-                    delta=ResultChunkDelta(
-                        index=delta.index,
-                        message=assistant_message,
-                    ),
-                )
+        delta = chunk.choices[0]
+        text = delta.delta.content
+
+        if delta.finish_reason is not None:
+            state.finish(chunk, delta.index, delta.finish_reason, text or "")
+            return None
+
+        if not text:
+            return None
+
+        state.parts.append(text)
+        return text
+
+    def _finish_chat_completions_stream(
+        self, model: str, messages: list[Message], state: "_StreamState"
+    ) -> ResultChunk:
+        """
+        Returns the final chunk of llm chat stream response, including the usage
+        """
+
+        input_tokens = state.input_tokens
+        output_tokens = state.output_tokens
 
         # calculate input tokens
         if not input_tokens:
@@ -369,16 +697,15 @@ class OpenAILargeLanguageModel(LLMModelCollection):
 
         # calculate output tokens
         if not output_tokens:
-            full_assistant_message = AssistantMessage(content=full_assistant_content)
+            full_assistant_message = AssistantMessage(content=state.get_text())
             output_tokens = self._get_tokens_count_from_messages(model, [full_assistant_message])
 
         # build usage entity
         usage = self._calculate_usage(
             model=model, input_tokens=input_tokens, output_tokens=output_tokens
         )
-        final_chunk.delta.usage = usage
 
-        yield final_chunk
+        return state.to_result_chunk(model, messages, usage)
 
     def _process_chat_completions_response(
         self,
@@ -475,6 +802,34 @@ class OpenAILargeLanguageModel(LLMModelCollection):
 
         return self._process_completions_response(model, response, messages)
 
+    # pylint: disable=too-many-positional-arguments
+    async def _acompletions(
+        self,
+        model: str,
+        client: AsyncOpenAIClient,
+        messages: list[Message],
+        parameters: dict,
+        extra_model_kwargs: dict,
+        stream: bool = True,
+    ) -> Union[Result, AsyncGenerator]:
+        """
+        Calls llm completion model asynchronously
+        """
+
+        # text completion model
+        response = await client.completions.create(
+            prompt=messages[0].content,
+            model=model,
+            stream=stream,
+            **parameters,
+            **extra_model_kwargs,
+        )
+
+        if stream:
+            return self._aprocess_completions_stream_response(model, response, messages)
+
+        return self._process_completions_response(model, response, messages)
+
     def _process_completions_stream_response(
         self, model: str, response: Stream[Completion], messages: list[Message]
     ) -> Generator:
@@ -482,58 +837,69 @@ class OpenAILargeLanguageModel(LLMModelCollection):
         Processes llm completion stream response
         """
 
-        final_chunk = ResultChunk(
-            model=model,
-            messages=messages,
-            delta=ResultChunkDelta(
-                index=0,
-                message=AssistantMessage(content=""),
-            ),
-        )
-
-        full_text = ""
-        input_tokens = 0
-        output_tokens = 0
+        state = _StreamState()
         for chunk in response:
-            if len(chunk.choices) == 0:
-                if chunk.usage:
-                    # get input and output tokens from usage
-                    input_tokens = chunk.usage.prompt_tokens
-                    output_tokens = chunk.usage.completion_tokens
-                continue
+            text = self._process_completions_stream_chunk(chunk, state)
+            if text is not None:
+                yield text
 
-            delta = chunk.choices[0]
+        yield self._finish_completions_stream(model, messages, state)
 
-            if delta.finish_reason is None and (delta.text is None or delta.text == ""):
-                continue
+    async def _aprocess_completions_stream_response(
+        self, model: str, response: AsyncStream[Completion], messages: list[Message]
+    ) -> AsyncGenerator:
+        """
+        Processes llm completion async stream response
+        """
 
-            # transform assistant message to message
-            text = delta.text or ""
-            assistant_message = AssistantMessage(content=text)
+        state = _StreamState()
+        try:
+            async for chunk in response:
+                text = self._process_completions_stream_chunk(chunk, state)
+                if text is not None:
+                    yield text
+        finally:
+            # the connection is released early if the stream is closed before its end
+            await response.close()
+
+        yield self._finish_completions_stream(model, messages, state)
+
+    def _process_completions_stream_chunk(
+        self, chunk: Completion, state: "_StreamState"
+    ) -> Optional[str]:
+        """
+        Processes a chunk of llm completion stream response, returns the text to yield
+        """
 
-            full_text += text
+        if not chunk.choices:
+            if chunk.usage:
+                # get input and output tokens from usage
+                state.input_tokens = chunk.usage.prompt_tokens
+                state.output_tokens = chunk.usage.completion_tokens
+            return None
 
-            if delta.finish_reason is not None:
-                final_chunk = ResultChunk(
-                    model=chunk.model,
-                    messages=messages,
-                    system_fingerprint=chunk.system_fingerprint,
-                    delta=ResultChunkDelta(
-                        index=delta.index,
-                        message=assistant_message,
-                        finish_reason=delta.finish_reason,
-                    ),
-                )
-            else:
-                yield ResultChunk(
-                    model=chunk.model,
-                    messages=messages,
-                    system_fingerprint=chunk.system_fingerprint,
-                    delta=ResultChunkDelta(
-                        index=delta.index,
-                        message=assistant_message,
-                    ),
-                )
+        delta = chunk.choices[0]
+        text = delta.text
+
+        if delta.finish_reason is not None:
+            state.finish(chunk, delta.index, delta.finish_reason, text or "")
+            return None
+
+        if not text:
+            return None
+
+        state.parts.append(text)
+        return text
+
+    def _finish_completions_stream(
+        self, model: str, messages: list[Message], state: "_StreamState"
+    ) -> ResultChunk:
+        """
+        Returns the final chunk of llm completion stream response, including the usage
+        """
+
+        input_tokens = state.input_tokens
+        output_tokens = state.output_tokens
 
         # calculate input tokens
         if not input_tokens:
@@ -541,15 +907,14 @@ class OpenAILargeLanguageModel(LLMModelCollection):
 
         # calculate output tokens
         if not output_tokens:
-            output_tokens = self._get_tokens_count_from_string(model=model, text=full_text)
+            output_tokens = self._get_tokens_count_from_string(model=model, text=state.get_text())
 
         # build usage entity
         usage = self._calculate_usage(
             model=model, input_tokens=input_tokens, output_tokens=output_tokens
         )
-        final_chunk.delta.usage = usage
 
-        yield final_chunk
+        return state.to_result_chunk(model, messages, usage)
 
     def _process_completions_response(
         self, model: str, response: Completion, messages: list[Message]
@@ -46,3 +46,4 @@ class OpenAIProvider(AIProvider):
 
 # pylint: disable=unused-import
 import genflow.apps.ai.providers.openai.llm  # noqa
+import genflow.apps.ai.providers.openai.text_embedding  # noqa
@@ -0,0 +1,143 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import base64
+from typing import Optional
+
+import numpy as np
+from openai.types import CreateEmbeddingResponse
+
+from genflow.apps.ai.base.entities.shared import ModelType
+from genflow.apps.ai.providers.openai.client import OpenAIClient
+from genflow.apps.ai.providers.openai.client_pool import (
+    async_openai_client_pool,
+    openai_client_pool,
+)
+from genflow.apps.ai.providers.registry import register_model_collection
+from genflow.apps.ai.text_embedding.text_embedding_model_collection import (
+    TextEmbeddingModelCollection,
+)
+from genflow.apps.ai.tokenizer import tokenizer_registry
+from genflow.apps.common.log import ServerLogManager
+
+slogger = ServerLogManager(__name__)
+
+
+@register_model_collection(ai_provider="openai", model_type=ModelType.TEXT_EMBEDDING.value)
+class OpenAITextEmbeddingModel(TextEmbeddingModelCollection):
+    """
+    Defines the interface for a collection of text embedding models provided by OpenAI.
+    """
+
+    def validate_credentials(self, model: str, credentials: dict) -> None:
+        """
+        Validates model credentials
+        """
+        try:
+            client = OpenAIClient(credentials=credentials)
+            client.embeddings.create(input=["ping"], model=model)
+        except Exception as ex:
+            slogger.glob.error(f"Error validating credentials for model {model}: {ex}")
+            raise ex
+
+    def warm_up(self) -> None:
+        """
+        Preloads the tokenizers of all models in the collection.
+        """
+
+        tokenizer_registry.preload({model.id for model in self.get_models()})
+
+    def get_cache_namespace(self, credentials: dict) -> str:
+        """
+        Returns the namespace of the embeddings cached for the given credentials, the
+            OpenAI compatible API serving them.
+        """
+
+        api_base = credentials.get("openai_api_base") or ""
+        return f"{super().get_cache_namespace(credentials)}\0{api_base}"
+
+    def get_tokens_count(self, model: str, texts: list[str]) -> list[int]:
+        """
+        Gets the token counts of the given texts for a given model.
+        """
+
+        encoding = tokenizer_registry.get_encoding(model)
+        return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+    def _embed(
+        self, model: str, credentials: dict, texts: list[str], user: Optional[str] = None
+    ) -> tuple[np.ndarray, int]:
+        """
+        Embeds a batch of texts with a single request.
+        """
+
+        client = openai_client_pool.acquire(credentials)
+        try:
+            response = client.embeddings.create(**self._get_embedding_kwargs(model, texts, user))
+        finally:
+            openai_client_pool.release(client)
+
+        return self._to_embeddings(response)
+
+    async def _aembed(
+        self, model: str, credentials: dict, texts: list[str], user: Optional[str] = None
+    ) -> tuple[np.ndarray, int]:
+        """
+        Embeds a batch of texts with a single request of the asyncio client.
+        """
+
+        client = async_openai_client_pool.acquire(credentials)
+        try:
+            response = await client.embeddings.create(
+                **self._get_embedding_kwargs(model, texts, user)
+            )
+        finally:
+            async_openai_client_pool.release(client)
+
+        return self._to_embeddings(response)
+
+    def _get_embedding_kwargs(self, model: str, texts: list[str], user: Optional[str]) -> dict:
+        """
+        Returns the arguments of an embeddings request, truncating the texts longer
+            than the context size of the model.
+        """
+
+        context_size = self.get_context_size(model)
+        if context_size:
+            encoding = tokenizer_registry.get_encoding(model)
+            texts = list(texts)
+            for position, text in enumerate(texts):
+                # a token spans at least one byte, shorter texts are not encoded
+                if len(text.encode()) > context_size:
+                    tokens = encoding.encode_ordinary(text)
+                    if len(tokens) > context_size:
+                        texts[position] = encoding.decode(tokens[:context_size])
+
+        # vectors are decoded from base64 straight into a float32 array
+        kwargs = {"input": texts, "model": model, "encoding_format": "base64"}
+        if user:
+            kwargs["user"] = user
+
+        return kwargs
+
+    @staticmethod
+    def _to_embeddings(response: CreateEmbeddingResponse) -> tuple[np.ndarray, int]:
+        """
+        Returns the embeddings of the response, ordered as the inputs, and the tokens used.
+        """
+
+        data = sorted(response.data, key=lambda item: item.index)
+        embeddings = np.vstack(
+            [
+                (
+                    np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+                    if isinstance(item.embedding, str)
+                    else np.asarray(item.embedding, dtype=np.float32)
+                )
+                for item in data
+            ]
+        )
+
+        tokens = response.usage.total_tokens if response.usage else 0
+        return embeddings, tokens
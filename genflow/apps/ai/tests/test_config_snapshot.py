@@ -0,0 +1,116 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import os
+from os import path as osp
+from unittest import TestCase
+
+from django.conf import settings
+
+from genflow.apps.ai.config_snapshot import (
+    build_config_version,
+    compile_config_snapshot,
+    load_config_snapshot,
+    write_config_snapshot,
+)
+from genflow.apps.ai.config_store import ConfigStore
+from genflow.apps.ai.providers.registry import AIProviderExtension
+from genflow.apps.ai.tests.utils import (
+    DummyAIProvider,
+    DummyModelCollection,
+    create_dummy_model_config,
+    remove_dummy_model_config,
+)
+
+
+class ConfigSnapshotTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        create_dummy_model_config()
+        cls.snapshot_path = osp.join(settings.CACHE_ROOT, "model_config_test.json")
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_dummy_model_config()
+
+    def setUp(self):
+        self.ai_providers = self.create_ai_providers()
+
+    def tearDown(self):
+        if osp.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
+
+    @staticmethod
+    def create_ai_providers() -> dict[str, AIProviderExtension]:
+        dummy_provider = DummyAIProvider()
+        dummy_provider.config_path = osp.join(
+            settings.MODEL_CONFIG_ROOT, DummyAIProvider.PROVIDER_FOLDER
+        )
+        dummy_provider.add_model_collection_instance(
+            osp.join(dummy_provider.config_path, "llm"), DummyModelCollection
+        )
+        return {"dummy": AIProviderExtension(name="dummy", ai_provider_instance=dummy_provider)}
+
+    def test_load_config_snapshot(self):
+        snapshot = compile_config_snapshot(self.ai_providers, settings.MODEL_CONFIG_ROOT)
+        write_config_snapshot(snapshot, self.snapshot_path)
+
+        ai_providers = self.create_ai_providers()
+        loaded = load_config_snapshot(self.snapshot_path, settings.MODEL_CONFIG_ROOT)
+        self.assertEqual(loaded, snapshot)
+        config_store = ConfigStore(ai_providers, config_root=settings.MODEL_CONFIG_ROOT)
+        self.assertTrue(config_store.set_snapshot(loaded))
+
+        # the schemas are read from the version without parsing the YAML files
+        ai_provider_instance = ai_providers["dummy"].ai_provider_instance
+        model_collection = ai_provider_instance.get_model_collection_instance("llm")
+        self.assertEqual(ai_provider_instance.get_schema(), snapshot.providers["dummy"])
+        self.assertIsNone(model_collection.schemas)
+        expected_model_collection = self.get_model_collection()
+        self.assertEqual(model_collection.get_models(), expected_model_collection.get_models())
+        model_collection_version = model_collection.get_model_collection_version()
+        self.assertEqual(
+            model_collection_version.default_parameter_configs,
+            expected_model_collection.default_parameter_configs,
+        )
+        for model in model_collection.get_models():
+            self.assertIs(model_collection.get_model_schema(model.id), model)
+
+    def test_load_stale_config_snapshot(self):
+        snapshot = compile_config_snapshot(self.ai_providers, settings.MODEL_CONFIG_ROOT)
+        write_config_snapshot(snapshot, self.snapshot_path)
+
+        yaml_path = osp.join(settings.MODEL_CONFIG_ROOT, "dummy", "llm", "_new.yaml")
+        with open(yaml_path, "w", encoding="utf-8") as f:
+            f.write("{}")
+        try:
+            self.assertIsNone(load_config_snapshot(self.snapshot_path, settings.MODEL_CONFIG_ROOT))
+        finally:
+            os.remove(yaml_path)
+
+        self.assertIsNotNone(load_config_snapshot(self.snapshot_path, settings.MODEL_CONFIG_ROOT))
+
+    def test_load_invalid_config_snapshot(self):
+        self.assertIsNone(load_config_snapshot(self.snapshot_path, settings.MODEL_CONFIG_ROOT))
+
+        with open(self.snapshot_path, "w", encoding="utf-8") as f:
+            f.write('{"version": 1}')
+        self.assertIsNone(load_config_snapshot(self.snapshot_path, settings.MODEL_CONFIG_ROOT))
+
+    def test_build_config_version_of_other_providers(self):
+        snapshot = compile_config_snapshot(self.ai_providers, settings.MODEL_CONFIG_ROOT)
+        snapshot.model_collections.clear()
+
+        ai_providers = self.create_ai_providers()
+        self.assertIsNone(build_config_version(snapshot, ai_providers, 1))
+        config_store = ConfigStore(ai_providers, config_root=settings.MODEL_CONFIG_ROOT)
+        self.assertFalse(config_store.set_snapshot(snapshot))
+        self.assertIsNone(config_store.current)
+
+    def get_model_collection(self) -> DummyModelCollection:
+        model_collection = DummyModelCollection()
+        model_collection.config_path = osp.join(
+            settings.MODEL_CONFIG_ROOT, DummyAIProvider.PROVIDER_FOLDER, "llm"
+        )
+        return model_collection
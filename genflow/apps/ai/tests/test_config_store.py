@@ -0,0 +1,165 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import os
+import time
+from decimal import Decimal
+from os import path as osp
+from typing import Generator, Optional, Union
+from unittest import TestCase
+
+from django.conf import settings
+
+from genflow.apps.ai.base.entities.model import PricingType
+from genflow.apps.ai.config_store import ConfigStore
+from genflow.apps.ai.llm.entities import Result
+from genflow.apps.ai.llm.llm_model_collection import LLMMode
+from genflow.apps.ai.llm.messages import Message, UserMessage
+from genflow.apps.ai.providers.registry import AIProviderExtension
+from genflow.apps.ai.tests.utils import (
+    DummyAIProvider,
+    DummyLLMModelCollection,
+    DummyModelCollection,
+    create_dummy_model_config,
+    remove_dummy_model_config,
+)
+
+
+class ReloadingLLMModelCollection(DummyLLMModelCollection):
+    """
+    Dummy LLM Model Collection class, reloading the model config when called before
+    the usage is calculated.
+    """
+
+    # pylint: disable=too-many-positional-arguments
+    def _call(
+        self,
+        model: str,
+        credentials: dict,
+        messages: list[Message],
+        parameters: dict,
+        stop: Optional[list[str]] = None,
+        stream: bool = True,
+        user: Optional[str] = None,
+    ) -> Union[Result, Generator]:
+        self.config_store.reload()
+        return super()._call(model, credentials, messages, parameters, stop, stream, user)
+
+
+class ConfigStoreTest(TestCase):
+    def setUp(self):
+        create_dummy_model_config()
+        self.config_path = osp.join(settings.MODEL_CONFIG_ROOT, DummyAIProvider.PROVIDER_FOLDER)
+        dummy_provider = DummyAIProvider()
+        dummy_provider.config_path = self.config_path
+        dummy_provider.add_model_collection_instance(
+            osp.join(self.config_path, "llm"), DummyModelCollection
+        )
+        self.model_collection = dummy_provider.get_model_collection_instance("llm")
+        self.reloads = 0
+        self.config_store = ConfigStore(
+            {"dummy": AIProviderExtension(name="dummy", ai_provider_instance=dummy_provider)},
+            config_root=settings.MODEL_CONFIG_ROOT,
+            on_reload=self.on_reload,
+        )
+
+    def tearDown(self):
+        self.config_store.stop()
+        remove_dummy_model_config()
+
+    def on_reload(self):
+        self.reloads += 1
+
+    def add_model(self, model: str, content: str = None):
+        with open(osp.join(self.config_path, "llm", "model1.yaml"), encoding="utf-8") as f:
+            default_content = f.read().replace("model1", model)
+        with open(osp.join(self.config_path, "llm", f"{model}.yaml"), "w", encoding="utf-8") as f:
+            f.write(content if content is not None else default_content)
+
+    def test_reload(self):
+        self.assertTrue(self.config_store.reload())
+        self.assertEqual(self.config_store.version, 1)
+        model1 = self.model_collection.get_model_schema("model1")
+
+        # unchanged files are not compiled again
+        self.assertFalse(self.config_store.reload())
+        self.assertIs(self.model_collection.get_model_schema("model1"), model1)
+
+        self.add_model("model3")
+        self.assertTrue(self.config_store.reload())
+        self.assertEqual(self.config_store.version, 2)
+        self.assertEqual(self.reloads, 2)
+        self.assertIsNotNone(self.model_collection.get_model_schema("model3"))
+        # the schemas of the previous version are left untouched
+        self.assertIsNot(self.model_collection.get_model_schema("model1"), model1)
+        self.assertEqual(self.model_collection.get_model_schema("model1"), model1)
+
+    def test_reload_invalid_config(self):
+        self.config_store.reload()
+        schemas = self.model_collection.get_models()
+
+        self.add_model("model3", content="id: model3\n")
+        self.assertFalse(self.config_store.reload())
+        self.assertEqual(self.config_store.version, 1)
+        self.assertIs(self.model_collection.get_models(), schemas)
+        self.assertIsNone(self.model_collection.get_model_schema("model3"))
+
+        # the version is swapped once the file is fixed
+        self.add_model("model3")
+        self.assertTrue(self.config_store.reload())
+        self.assertIsNotNone(self.model_collection.get_model_schema("model3"))
+
+    def test_watch(self):
+        self.config_store.reload()
+        self.config_store.watch(interval=0.01)
+
+        self.add_model("model3")
+        deadline = time.monotonic() + 5
+        while self.config_store.version < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.config_store.version, 2)
+        self.assertIsNotNone(self.model_collection.get_model_schema("model3"))
+
+    def test_reload_during_call(self):
+        dummy_provider = DummyAIProvider()
+        dummy_provider.config_path = self.config_path
+        dummy_provider.add_model_collection_instance(
+            osp.join(self.config_path, "llm"), ReloadingLLMModelCollection
+        )
+        model_collection = dummy_provider.get_model_collection_instance("llm")
+        config_store = ConfigStore(
+            {"dummy": AIProviderExtension(name="dummy", ai_provider_instance=dummy_provider)},
+            config_root=settings.MODEL_CONFIG_ROOT,
+        )
+        config_store.reload()
+        config_version = config_store.current
+
+        # the price and mode of the model change, reloaded while it is called
+        yaml_path = osp.join(self.config_path, "llm", "model2.yaml")
+        with open(yaml_path, encoding="utf-8") as f:
+            content = f.read()
+        with open(yaml_path, "w", encoding="utf-8") as f:
+            f.write(content.replace("0.15", "0.30").replace("mode: chat", "mode: completion"))
+        result = model_collection.call(
+            "model2", credentials={}, messages=[UserMessage(content="hello")], stream=False
+        )
+
+        # the call is priced with the version it was started with
+        self.assertEqual(config_store.version, 2)
+        self.assertEqual(result.usage.input_unit_price, Decimal("0.15"))
+        self.assertEqual(model_collection.get_model_mode("model2", config_version), LLMMode.CHAT)
+        self.assertEqual(model_collection.get_model_mode("model2"), LLMMode.COMPLETION)
+        price = model_collection.get_price("model2", PricingType.INPUT, 1)
+        self.assertEqual(price.unit_price, Decimal("0.30"))
+
+    def test_reload_writes_snapshot(self):
+        snapshot_path = osp.join(settings.CACHE_ROOT, "model_config_store_test.json")
+        self.config_store.snapshot_path = snapshot_path
+        try:
+            self.config_store.reload()
+            self.assertTrue(osp.exists(snapshot_path))
+        finally:
+            if osp.exists(snapshot_path):
+                os.remove(snapshot_path)
@@ -2,17 +2,21 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
+import asyncio
 from os import path as osp
 from unittest import TestCase
+from unittest.mock import patch
 
 from django.conf import settings
 
+from genflow.apps.ai.llm.entities import ResultChunk, ResultChunkDelta, Usage
 from genflow.apps.ai.llm.messages import (
     AssistantMessage,
     SystemMessage,
     TextMessageContent,
     UserMessage,
 )
+from genflow.apps.ai.llm.stream import StreamAccumulator
 from genflow.apps.ai.tests.utils import (
     DummyAIProvider,
     DummyLLMModelCollection,
@@ -183,3 +187,62 @@ class LLMModelCollectionTest(TestCase):
                     + output_count * model.pricing.unit * model.pricing.output
                 )
                 self.assertEqual(result.usage.total_price, total)
+
+    def test_acall(self):
+        model = self.llm_model_collection.get_models()[0]
+        messages = [UserMessage(content="hello")]
+
+        result = asyncio.run(self.llm_model_collection.acall(model.id, {}, messages, {}))
+        self.assertEqual(result.message, self.llm_model_collection.RESPONSE)
+        self.assertEqual(result.messages, messages)
+
+    def test_acall_stream_in_thread(self):
+        model = self.llm_model_collection.get_models()[0]
+        messages = [UserMessage(content="hello")]
+
+        def stream_response():
+            for text in ["hello", " ", "world"]:
+                yield ResultChunk(
+                    model=model.id,
+                    messages=messages,
+                    delta=ResultChunkDelta(index=0, message=AssistantMessage(content=text)),
+                )
+
+        async def collect():
+            response = await self.llm_model_collection.acall(model.id, {}, messages, {})
+            return [chunk.delta.message.content async for chunk in response]
+
+        with patch.object(self.llm_model_collection, "_call", return_value=stream_response()):
+            self.assertEqual(asyncio.run(collect()), ["hello", " ", "world"])
+
+
+class StreamAccumulatorTest(TestCase):
+    def test_to_result(self):
+        messages = [UserMessage(content="hello")]
+        usage = Usage.empty_usage()
+        usage.total_tokens = 3
+
+        accumulator = StreamAccumulator()
+        texts = [
+            accumulator.add("hello"),
+            accumulator.add(" "),
+            accumulator.add(
+                ResultChunk(
+                    model="model",
+                    messages=messages,
+                    delta=ResultChunkDelta(
+                        index=0,
+                        message=AssistantMessage(content="world"),
+                        usage=usage,
+                        finish_reason="stop",
+                    ),
+                )
+            ),
+        ]
+        self.assertEqual(texts, ["hello", " ", "world"])
+
+        result = accumulator.to_result()
+        self.assertEqual(result.model, "model")
+        self.assertEqual(result.messages, messages)
+        self.assertEqual(result.message, AssistantMessage(content="hello world"))
+        self.assertEqual(result.usage, usage)
@@ -8,13 +8,14 @@ from unittest import TestCase
 
 from django.conf import settings
 
-from genflow.apps.ai.base.entities.model import PricingType
+from genflow.apps.ai.base.entities.model import ModelIndex, PricingType, PropertyKey
 from genflow.apps.ai.tests.utils import (
     DummyAIProvider,
     DummyModelCollection,
     create_dummy_model_config,
     remove_dummy_model_config,
 )
+from genflow.apps.common.entities import ConfigurationEntity
 
 
 class ModelCollectionTest(TestCase):
@@ -67,3 +68,41 @@ class ModelCollectionTest(TestCase):
                 total = total.quantize(decimal.Decimal("0.0000001"), rounding=decimal.ROUND_HALF_UP)
                 self.assertEqual(price.total_amount, total)
                 self.assertEqual(price.unit, model.pricing.unit)
+
+    def test_get_model_index(self):
+        model_collection = DummyModelCollection()
+        model_collection.config_path = self.config_path
+        self.assertIsNone(model_collection.get_model_index("unknown"))
+
+        # the indexes are built once with the schemas
+        indexes = model_collection.indexes
+        for model in model_collection.get_models():
+            model_index = model_collection.get_model_index(model.id)
+            self.assertIs(model_index.model_schema, model)
+            self.assertIs(model_collection.get_model_schema(model.id), model)
+            self.assertEqual(
+                model_index.context_size, model.properties.get(PropertyKey.CONTEXT_SIZE)
+            )
+            self.assertEqual(model_index.pricing, model.pricing)
+        self.assertIs(model_collection.indexes, indexes)
+
+    def test_build_model_index(self):
+        model_collection = DummyModelCollection()
+        model_collection.config_path = self.config_path
+        model = model_collection.get_models()[0]
+        parameter_configs = [
+            ConfigurationEntity(name="max_tokens", label={"en_US": "Max"}, type="int"),
+            ConfigurationEntity(
+                name="max_output", label={"en_US": "Max"}, type="int", use_template="max_tokens"
+            ),
+            ConfigurationEntity(name="seed", label={"en_US": "Seed"}, type="int"),
+        ]
+        model_index = ModelIndex.build(
+            model.model_copy(update={"parameter_configs": parameter_configs})
+        )
+
+        self.assertEqual(list(model_index.parameter_configs), ["max_tokens", "max_output", "seed"])
+        self.assertEqual(
+            [parameter_config.name for parameter_config in model_index.max_tokens_parameters],
+            ["max_tokens", "max_output"],
+        )
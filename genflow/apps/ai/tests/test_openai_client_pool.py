@@ -0,0 +1,94 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import asyncio
+from unittest import TestCase
+
+from genflow.apps.ai.providers.openai.client_pool import AsyncOpenAIClientPool, OpenAIClientPool
+
+
+class OpenAIClientPoolTest(TestCase):
+    def setUp(self):
+        self.pool = OpenAIClientPool(max_size=2)
+
+    def tearDown(self):
+        self.pool.clear()
+
+    def test_acquire_reuses_client(self):
+        client1 = self.pool.acquire({"openai_api_key": "key1"})
+        self.pool.release(client1)
+        client2 = self.pool.acquire({"openai_api_key": "key1"})
+        self.pool.release(client2)
+
+        self.assertIs(client1, client2)
+        stats = self.pool.get_stats()
+        self.assertEqual((stats.size, stats.hits, stats.misses), (1, 1, 1))
+
+    def test_acquire_keyed_by_credentials(self):
+        client1 = self.pool.acquire({"openai_api_key": "key1"})
+        client2 = self.pool.acquire(
+            {"openai_api_key": "key1", "openai_api_base": "http://localhost:8080"}
+        )
+        self.pool.release(client1)
+        self.pool.release(client2)
+
+        self.assertIsNot(client1, client2)
+        self.assertEqual(str(client2.base_url), "http://localhost:8080/v1/")
+
+    def test_evict_least_recently_used(self):
+        client1 = self.pool.acquire({"openai_api_key": "key1"})
+        self.pool.release(client1)
+        client2 = self.pool.acquire({"openai_api_key": "key2"})
+        self.pool.release(client2)
+        # key1 becomes the most recently used client
+        self.pool.release(self.pool.acquire({"openai_api_key": "key1"}))
+        client3 = self.pool.acquire({"openai_api_key": "key3"})
+        self.pool.release(client3)
+
+        self.assertTrue(client2.is_closed())
+        self.assertFalse(client1.is_closed())
+        stats = self.pool.get_stats()
+        self.assertEqual((stats.size, stats.evictions, stats.in_use), (2, 1, 0))
+
+    def test_evicted_leased_client_closed_on_release(self):
+        client1 = self.pool.acquire({"openai_api_key": "key1"})
+        self.pool.release(self.pool.acquire({"openai_api_key": "key2"}))
+        self.pool.release(self.pool.acquire({"openai_api_key": "key3"}))
+
+        # client1 is evicted but still in use
+        self.assertFalse(client1.is_closed())
+        self.pool.release(client1)
+        self.assertTrue(client1.is_closed())
+
+
+class AsyncOpenAIClientPoolTest(TestCase):
+    def setUp(self):
+        self.pool = AsyncOpenAIClientPool(max_size=1)
+
+    def test_acquire_reuses_client_per_loop(self):
+        async def acquire_twice():
+            client1 = self.pool.acquire({"openai_api_key": "key1"})
+            self.pool.release(client1)
+            client2 = self.pool.acquire({"openai_api_key": "key1"})
+            self.pool.release(client2)
+            return client1, client2
+
+        client1, client2 = asyncio.run(acquire_twice())
+        self.assertIs(client1, client2)
+
+        # clients are not shared between event loops
+        client3, _ = asyncio.run(acquire_twice())
+        self.assertIsNot(client1, client3)
+
+    def test_evicted_client_closed(self):
+        async def evict():
+            client1 = self.pool.acquire({"openai_api_key": "key1"})
+            self.pool.release(client1)
+            self.pool.release(self.pool.acquire({"openai_api_key": "key2"}))
+            # let the scheduled close run
+            await asyncio.sleep(0)
+            return client1
+
+        client1 = asyncio.run(evict())
+        self.assertTrue(client1.is_closed())
@@ -0,0 +1,88 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import asyncio
+import gc
+from unittest import TestCase
+from unittest.mock import patch
+
+from genflow.apps.ai.llm.llm_model_collection import LLMMode
+from genflow.apps.ai.providers.openai.client_pool import AsyncOpenAIClientPool
+
+# the openai provider is not registered in tests
+with patch(
+    "genflow.apps.ai.providers.registry.register_model_collection",
+    lambda **kwargs: lambda cls: cls,
+):
+    from genflow.apps.ai.providers.openai.llm import OpenAILargeLanguageModel
+
+CREDENTIALS = {"openai_api_key": "key"}
+
+
+class OpenAILargeLanguageModelClientTest(TestCase):
+    def setUp(self):
+        self.pool = AsyncOpenAIClientPool()
+        self.model_collection = OpenAILargeLanguageModel()
+        for target, kwargs in (
+            ("genflow.apps.ai.providers.openai.llm.async_openai_client_pool", {"new": self.pool}),
+            (
+                "genflow.apps.ai.providers.openai.llm.OpenAILargeLanguageModel.get_model_mode",
+                {"return_value": LLMMode.CHAT},
+            ),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def call(self, achat_completions):
+        with patch.object(self.model_collection, "_achat_completions", achat_completions):
+            return await self.model_collection._acall("model", CREDENTIALS, [], {}, stream=True)
+
+    def get_in_use(self) -> int:
+        return self.pool.get_stats().in_use
+
+    def test_client_released_on_cancel(self):
+        async def achat_completions(**kwargs):
+            raise asyncio.CancelledError()
+
+        async def run():
+            with self.assertRaises(asyncio.CancelledError):
+                await self.call(achat_completions)
+
+        asyncio.run(run())
+        self.assertEqual(self.get_in_use(), 0)
+
+    def test_client_released_after_stream(self):
+        closed = []
+
+        async def stream():
+            try:
+                for text in ("a", "b", "c"):
+                    yield text
+            finally:
+                closed.append(True)
+
+        async def achat_completions(**kwargs):
+            return stream()
+
+        async def run():
+            response = await self.call(achat_completions)
+            self.assertEqual(self.get_in_use(), 1)
+            self.assertEqual([text async for text in response], ["a", "b", "c"])
+            self.assertEqual(self.get_in_use(), 0)
+
+            # a stream closed early closes the model stream
+            response = await self.call(achat_completions)
+            self.assertEqual(await anext(response), "a")
+            await response.aclose()
+            self.assertEqual(self.get_in_use(), 0)
+            self.assertEqual(len(closed), 2)
+
+            # a stream dropped before being iterated
+            response = await self.call(achat_completions)
+            del response
+            gc.collect()
+            self.assertEqual(self.get_in_use(), 0)
+
+        asyncio.run(run())
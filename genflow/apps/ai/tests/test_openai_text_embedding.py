@@ -0,0 +1,159 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import asyncio
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import path as osp
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import tiktoken
+from django.test import SimpleTestCase
+
+from genflow.apps.ai.text_embedding.cache import embedding_cache
+from genflow.apps.ai.tokenizer import tokenizer_registry
+
+# the openai provider is not registered in tests
+with patch(
+    "genflow.apps.ai.providers.registry.register_model_collection",
+    lambda **kwargs: lambda cls: cls,
+):
+    from genflow.apps.ai.providers.openai.text_embedding import OpenAITextEmbeddingModel
+
+MODEL = "text-embedding-3-small"
+
+
+class EmbeddingsStubHandler(BaseHTTPRequestHandler):
+    """
+    Serves the embeddings endpoint of the OpenAI API, embedding each input as its length
+    and position in the request.
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+
+        data = []
+        for index, text in enumerate(body["input"]):
+            vector = np.array([len(text), index, 1.0], dtype=np.float32)
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vector.tobytes()).decode()
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        tokens = sum(len(text) for text in body["input"])
+        response = json.dumps(
+            {
+                "object": "list",
+                # out of order, as the API does not guarantee it
+                "data": data[::-1],
+                "model": body["model"],
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            }
+        ).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+class OpenAITextEmbeddingModelTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), EmbeddingsStubHandler)
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.credentials = {
+            "openai_api_key": "key",
+            "openai_api_base": f"http://127.0.0.1:{cls.server.server_address[1]}",
+        }
+
+        # byte level encoding, the tiktoken files are downloaded on first use
+        tokenizer_registry._encodings[MODEL] = tiktoken.Encoding(
+            name="bytes",
+            pat_str=r"\S+|\s+",
+            mergeable_ranks={bytes([i]): i for i in range(256)},
+            special_tokens={},
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        tokenizer_registry._encodings.pop(MODEL, None)
+        super().tearDownClass()
+
+    def setUp(self):
+        embedding_cache.clear()
+        self.server.requests.clear()
+        self.model_collection = OpenAITextEmbeddingModel()
+        self.model_collection.config_path = osp.join(
+            Path(__file__).parents[4], "config", "model", "openai", "text_embedding"
+        )
+
+    def test_embed(self):
+        texts = ["hello", "hello world", "hi"]
+        result = self.model_collection.embed(MODEL, self.credentials, texts)
+
+        self.assertEqual(result.embeddings[:, 0].tolist(), [5, 11, 2])
+        self.assertEqual(result.embeddings[:, 1].tolist(), [0, 1, 2])
+        self.assertEqual(result.usage.tokens, 18)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.server.requests[0]["encoding_format"], "base64")
+
+    def test_embed_truncated(self):
+        result = self.model_collection.embed(MODEL, self.credentials, ["a" * 9000])
+
+        context_size = self.model_collection.get_context_size(MODEL)
+        self.assertEqual(len(self.server.requests[0]["input"][0]), context_size)
+        self.assertEqual(result.embeddings[0, 0], context_size)
+
+    def test_embed_batches(self):
+        texts = [f"text {i}" for i in range(5)]
+        with self.settings(
+            GF_EMBEDDINGS={
+                "BATCH_SIZE": 2,
+                "BATCH_TOKENS": 1000,
+                "CONCURRENCY": 2,
+                "CACHE_ENTRIES": 100,
+            }
+        ):
+            result = self.model_collection.embed(MODEL, self.credentials, texts)
+
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(result.embeddings[:, 1].tolist(), [0, 1, 0, 1, 0])
+
+        # embedded texts are served from the cache
+        self.model_collection.embed(MODEL, self.credentials, texts)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_aembed(self):
+        result = asyncio.run(self.model_collection.aembed(MODEL, self.credentials, ["hello", "hi"]))
+
+        self.assertEqual(result.embeddings[:, 0].tolist(), [5, 2])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_embed_cached_per_api_base(self):
+        self.model_collection.embed(MODEL, self.credentials, ["hello"])
+        self.model_collection.embed(MODEL, self.credentials, ["hello"])
+        self.assertEqual(len(self.server.requests), 1)
+
+        # the same model served by another endpoint is not answered from the cache
+        credentials = {
+            **self.credentials,
+            "openai_api_base": f"{self.credentials['openai_api_base']}/",
+        }
+        self.model_collection.embed(MODEL, credentials, ["hello"])
+        self.assertEqual(len(self.server.requests), 2)
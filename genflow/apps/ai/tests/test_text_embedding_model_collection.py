@@ -0,0 +1,115 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import asyncio
+import decimal
+from os import path as osp
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from genflow.apps.ai.tests.utils import (
+    DummyAIProvider,
+    DummyTextEmbeddingModelCollection,
+    create_dummy_model_config,
+    remove_dummy_model_config,
+)
+from genflow.apps.ai.text_embedding.cache import EmbeddingCache, embedding_cache
+
+EMBEDDINGS = {"BATCH_SIZE": 512, "BATCH_TOKENS": 12, "CONCURRENCY": 2, "CACHE_ENTRIES": 100}
+
+
+@override_settings(GF_EMBEDDINGS=EMBEDDINGS)
+class TextEmbeddingModelCollectionTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        create_dummy_model_config()
+        cls.config_path = osp.join(
+            settings.MODEL_CONFIG_ROOT, DummyAIProvider.PROVIDER_FOLDER, "text_embedding"
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_dummy_model_config()
+        super().tearDownClass()
+
+    def setUp(self):
+        embedding_cache.clear()
+        self.model_collection = DummyTextEmbeddingModelCollection()
+        self.model_collection.config_path = self.config_path
+
+    def test_get_batches(self):
+        # at most 3 texts (max_chunks) and 12 tokens per batch
+        texts = ["a", "b", "c", "d", "eeeeeeeeee", "ff", "g" * 20]
+        batches = self.model_collection.get_batches("embedding1", texts)
+
+        # longer texts are counted with the context size, 10 tokens
+        self.assertEqual(batches, [[0, 1, 2], [3, 4], [5, 6]])
+
+    def test_embed(self):
+        texts = ["a", "b c", "dd", "e", "ffff f"]
+        result = self.model_collection.embed("embedding1", {}, texts)
+
+        self.assertEqual(result.embeddings.shape, (5, 3))
+        self.assertEqual(result.embeddings[:, 0].tolist(), [len(text) for text in texts])
+        self.assertEqual(len(self.model_collection.batches), 2)
+        self.assertEqual(result.usage.tokens, 13)
+        self.assertEqual(result.usage.total_price, decimal.Decimal("0.0013"))
+
+    def test_embed_cached(self):
+        self.model_collection.embed("embedding1", {}, ["a", "b"])
+        result = self.model_collection.embed("embedding1", {}, ["b", "a", "b", "c"])
+
+        self.assertEqual(result.embeddings[:, 0].tolist(), [1, 1, 1, 1])
+        # duplicates and cached texts are not embedded again
+        self.assertEqual(self.model_collection.batches, [["a", "b"], ["c"]])
+        self.assertEqual(result.usage.cached, 3)
+        self.assertEqual(result.usage.tokens, 1)
+
+    def test_embed_concurrently(self):
+        self.model_collection.delay = 0.05
+        texts = [str(i) for i in range(12)]
+        result = self.model_collection.embed("embedding1", {}, texts)
+
+        self.assertEqual(len(self.model_collection.batches), 4)
+        self.assertEqual(self.model_collection.max_concurrency, 2)
+        self.assertEqual(result.embeddings[:, 0].tolist(), [len(text) for text in texts])
+
+    def test_aembed(self):
+        self.model_collection.delay = 0.05
+        texts = [str(i) for i in range(12)]
+        result = asyncio.run(self.model_collection.aembed("embedding1", {}, texts))
+
+        self.assertEqual(len(self.model_collection.batches), 4)
+        self.assertEqual(self.model_collection.max_concurrency, 2)
+        self.assertEqual(result.embeddings[:, 0].tolist(), [len(text) for text in texts])
+
+    def test_embed_empty(self):
+        result = self.model_collection.embed("embedding1", {}, [])
+
+        self.assertEqual(len(result.embeddings), 0)
+        self.assertEqual(self.model_collection.batches, [])
+
+
+class EmbeddingCacheTest(SimpleTestCase):
+    def test_evict_least_recently_used(self):
+        cache = EmbeddingCache(max_entries=2)
+        keys = [cache.get_key("dummy", "model", text) for text in "abc"]
+        for key in keys:
+            cache.put(key, key)
+
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertEqual(cache.get(keys[2]), keys[2])
+        stats = cache.get_stats()
+        self.assertEqual((stats.size, stats.hits, stats.misses), (2, 1, 1))
+
+    def test_get_key(self):
+        self.assertNotEqual(
+            EmbeddingCache.get_key("p", "a", "b"), EmbeddingCache.get_key("p", "b", "a")
+        )
+        # the same model of other endpoints is cached apart
+        self.assertNotEqual(
+            EmbeddingCache.get_key("p1", "a", "b"), EmbeddingCache.get_key("p2", "a", "b")
+        )
@@ -0,0 +1,61 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from genflow.apps.ai.tokenizer import TokenizerRegistry
+
+
+class TokenizerRegistryTest(TestCase):
+    def setUp(self):
+        self.registry = TokenizerRegistry()
+
+    @patch("genflow.apps.ai.tokenizer.tiktoken.encoding_for_model")
+    def test_get_encoding_cached(self, encoding_for_model):
+        encoding_for_model.return_value = "encoding"
+
+        self.assertEqual(self.registry.get_encoding("model"), "encoding")
+        self.assertEqual(self.registry.get_encoding("model"), "encoding")
+
+        encoding_for_model.assert_called_once_with("model")
+        stats = self.registry.get_stats()
+        self.assertEqual(stats.hits, 1)
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.size, 1)
+
+    @patch("genflow.apps.ai.tokenizer.tiktoken.get_encoding")
+    @patch("genflow.apps.ai.tokenizer.tiktoken.encoding_for_model")
+    def test_get_encoding_fallback(self, encoding_for_model, get_encoding):
+        encoding_for_model.side_effect = KeyError("unknown")
+        get_encoding.return_value = "default"
+
+        with self.assertLogs("genflow.apps.ai.tokenizer", level="WARNING") as logs:
+            self.assertEqual(self.registry.get_encoding("unknown"), "default")
+            self.assertEqual(self.registry.get_encoding("unknown"), "default")
+
+        # the fallback is resolved and logged only once
+        self.assertEqual(len(logs.output), 1)
+        get_encoding.assert_called_once_with(TokenizerRegistry.DEFAULT_ENCODING)
+
+    @patch("genflow.apps.ai.tokenizer.tiktoken.encoding_for_model")
+    def test_preload(self, encoding_for_model):
+        encoding_for_model.side_effect = lambda model: f"{model}-encoding"
+
+        self.registry.preload(["model1", "model2"])
+        self.assertEqual(self.registry.get_stats().misses, 2)
+
+        self.assertEqual(self.registry.get_encoding("model1"), "model1-encoding")
+        self.assertEqual(self.registry.get_stats().hits, 1)
+        self.assertEqual(encoding_for_model.call_count, 2)
+
+    @patch("genflow.apps.ai.tokenizer.tiktoken.encoding_for_model")
+    def test_clear(self, encoding_for_model):
+        encoding_for_model.return_value = "encoding"
+
+        self.registry.get_encoding("model")
+        self.registry.clear()
+
+        stats = self.registry.get_stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (0, 0, 0))
@@ -3,9 +3,12 @@
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
 import os
+import threading
+import time
 from os import path as osp
 from typing import Generator, Mapping, Optional, Union
 
+import numpy as np
 from django.conf import settings
 
 from genflow.apps.ai.base.ai_provider import AIProvider
@@ -13,6 +16,9 @@ from genflow.apps.ai.base.model_collection import ModelCollection
 from genflow.apps.ai.llm.entities import Result
 from genflow.apps.ai.llm.llm_model_collection import LLMModelCollection
 from genflow.apps.ai.llm.messages import AssistantMessage, Message
+from genflow.apps.ai.text_embedding.text_embedding_model_collection import (
+    TextEmbeddingModelCollection,
+)
 
 
 class DummyAIProvider(AIProvider):
@@ -88,6 +94,52 @@ class DummyLLMModelCollection(LLMModelCollection):
         return Result(model=model, messages=messages, message=self.RESPONSE, usage=usage)
 
 
+class DummyTextEmbeddingModelCollection(TextEmbeddingModelCollection):
+    """
+    Dummy Text Embedding Model Collection class.
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.batches: list[list[str]] = []
+        self.max_concurrency = 0
+        self._concurrency = 0
+        self._lock = threading.Lock()
+
+    def validate_credentials(self, model: str, credentials: Mapping) -> None:
+        """
+        Validate model credentials
+        """
+
+    def get_tokens_count(self, model: str, texts: list[str]) -> list[int]:
+        """
+        Gets the token counts of the given texts, one token per character.
+        """
+
+        return [len(text) for text in texts]
+
+    def _embed(
+        self, model: str, credentials: dict, texts: list[str], user: Optional[str] = None
+    ) -> tuple[np.ndarray, int]:
+        """
+        Embeds each text as its length and number of spaces, records the batches.
+        """
+
+        with self._lock:
+            self.batches.append(texts)
+            self._concurrency += 1
+            self.max_concurrency = max(self.max_concurrency, self._concurrency)
+
+        time.sleep(self.delay)
+        embeddings = np.array([[len(text), text.count(" "), 1.0] for text in texts], np.float32)
+
+        with self._lock:
+            self._concurrency -= 1
+
+        return embeddings, sum(self.get_tokens_count(model, texts))
+
+
 def create_dummy_model_config():
     src_path = osp.join(osp.dirname(__file__), "assets")
     dist_path = settings.MODEL_CONFIG_ROOT
@@ -0,0 +1,104 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+from django.conf import settings
+from pydantic import BaseModel
+
+
+class EmbeddingCacheStats(BaseModel):
+    """
+    Represents the usage counters of the embedding cache.
+    """
+
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+
+
+class EmbeddingCache:
+    """
+    Process-wide cache of embeddings keyed by a hash of the provider endpoint, model and
+    text, so that texts embedded again, e.g. repeated chunks or queries, do not call the
+    provider. Vectors are kept as float32 arrays with LRU eviction.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self.max_entries = (
+            max_entries if max_entries is not None else settings.GF_EMBEDDINGS["CACHE_ENTRIES"]
+        )
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(namespace: str, model: str, text: str) -> bytes:
+        """
+        Returns the cache key of the text embedded with the given model, in the namespace
+            of the provider and endpoint serving it.
+        """
+
+        return hashlib.sha256(f"{namespace}\0{model}\0{text}".encode()).digest()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """
+        Returns the cached embedding of the given key, if any.
+        """
+
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return embedding
+
+    def put(self, key: bytes, embedding: np.ndarray) -> None:
+        """
+        Caches the embedding of the given key, evicting the least recently used entries.
+        """
+
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> EmbeddingCacheStats:
+        """
+        Returns the cache size and usage counters.
+        """
+
+        with self._lock:
+            return EmbeddingCacheStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self.hits,
+                misses=self.misses,
+            )
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the counters.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+embedding_cache = EmbeddingCache()
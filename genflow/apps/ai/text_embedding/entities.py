@@ -0,0 +1,28 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from decimal import Decimal
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+
+class EmbeddingUsage(BaseModel):
+    tokens: int
+    unit_price: Decimal
+    price_unit: Decimal
+    total_price: Decimal
+    currency: str
+    latency: float
+    # texts whose embeddings were served from the cache, not billed
+    cached: int = 0
+
+
+class EmbeddingResult(BaseModel):
+    model: str
+    # float32 array with one row per input text
+    embeddings: np.ndarray
+    usage: EmbeddingUsage
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
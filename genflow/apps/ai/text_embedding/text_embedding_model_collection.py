@@ -0,0 +1,304 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import asyncio
+import time
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from genflow.apps.ai.base.entities.config import ConfigVersion
+from genflow.apps.ai.base.entities.model import PricingType, PropertyKey
+from genflow.apps.ai.base.entities.shared import ModelType
+from genflow.apps.ai.base.model_collection import ModelCollection
+from genflow.apps.ai.text_embedding.cache import embedding_cache
+from genflow.apps.ai.text_embedding.entities import EmbeddingResult, EmbeddingUsage
+from genflow.apps.common.log import ServerLogManager
+
+slogger = ServerLogManager(__name__)
+
+
+class TextEmbeddingModelCollection(ModelCollection):
+    """
+    Abstract base class that defines the interface for a collection of text embedding models.
+    Texts are deduplicated and looked up in the embedding cache, the remaining texts are
+    split into batches within the input and token limits of a request, and the batches
+    are embedded concurrently.
+    """
+
+    model_type: ModelType = ModelType.TEXT_EMBEDDING
+
+    @abstractmethod
+    def get_tokens_count(self, model: str, texts: list[str]) -> list[int]:
+        """
+        Gets the token counts of the given texts for a given model.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def _embed(
+        self, model: str, credentials: dict, texts: list[str], user: Optional[str] = None
+    ) -> tuple[np.ndarray, int]:
+        """
+        Embeds a batch of texts with a single request. Returns a float32 array with one
+            row per text and the number of tokens billed. Texts longer than the context
+            size of the model are truncated.
+        """
+
+        raise NotImplementedError
+
+    async def _aembed(
+        self, model: str, credentials: dict, texts: list[str], user: Optional[str] = None
+    ) -> tuple[np.ndarray, int]:
+        """
+        Embeds a batch of texts asynchronously. Collections without a native async client
+            run `_embed` in a worker thread.
+        """
+
+        return await sync_to_async(self._embed, thread_sensitive=False)(
+            model, credentials, texts, user
+        )
+
+    def get_context_size(self, model: str) -> Optional[int]:
+        """
+        Returns the max tokens of a single input of the model, if known.
+        """
+
+        model_index = self.get_model_index(model)
+        if model_index:
+            return model_index.context_size
+
+        return None
+
+    def get_max_chunks(self, model: str) -> int:
+        """
+        Returns the max inputs of a single request of the model.
+        """
+
+        max_chunks = settings.GF_EMBEDDINGS["BATCH_SIZE"]
+        model_schema = self.get_model_schema(model)
+        if model_schema and model_schema.properties.get(PropertyKey.MAX_CHUNKS):
+            max_chunks = min(max_chunks, model_schema.properties[PropertyKey.MAX_CHUNKS])
+
+        return max_chunks
+
+    def get_batches(self, model: str, texts: list[str]) -> list[list[int]]:
+        """
+        Splits the positions of the given texts into batches within the max inputs
+            and max tokens of a request.
+        """
+
+        max_chunks = self.get_max_chunks(model)
+        max_tokens = settings.GF_EMBEDDINGS["BATCH_TOKENS"]
+        context_size = self.get_context_size(model)
+
+        batches: list[list[int]] = []
+        batch: list[int] = []
+        batch_tokens = 0
+        for position, tokens in enumerate(self.get_tokens_count(model, texts)):
+            if context_size:
+                # longer texts are truncated
+                tokens = min(tokens, context_size)
+            if batch and (len(batch) >= max_chunks or batch_tokens + tokens > max_tokens):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(position)
+            batch_tokens += tokens
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    def get_cache_namespace(self, credentials: dict) -> str:
+        """
+        Returns the namespace of the embeddings cached for the given credentials. The same
+            model name served by another provider or endpoint gives other vectors.
+        """
+
+        return f"{type(self).__module__}.{type(self).__qualname__}"
+
+    # pylint: disable=too-many-positional-arguments
+    def embed(
+        self,
+        model: str,
+        credentials: dict,
+        texts: list[str],
+        user: Optional[str] = None,
+        config_version: Optional[ConfigVersion] = None,
+    ) -> EmbeddingResult:
+        """
+        Embeds the given texts, returns their embeddings in the same order. The texts are
+            priced with the given version of the model config, the current one by default.
+        """
+
+        started_at = time.perf_counter()
+        if config_version is None:
+            config_version = self.get_config_version()
+        namespace = self.get_cache_namespace(credentials)
+        embeddings, pending = self._get_cached_embeddings(namespace, model, texts)
+        cached = len(texts) - sum(len(positions) for positions in pending.values())
+
+        tokens = 0
+        if pending:
+            unique_texts = list(pending)
+            batches = self.get_batches(model, unique_texts)
+
+            def embed_batch(batch: list[int]) -> tuple[np.ndarray, int]:
+                return self._embed(
+                    model, credentials, [unique_texts[position] for position in batch], user
+                )
+
+            try:
+                if len(batches) == 1:
+                    results = [embed_batch(batches[0])]
+                else:
+                    concurrency = min(settings.GF_EMBEDDINGS["CONCURRENCY"], len(batches))
+                    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                        results = list(executor.map(embed_batch, batches))
+            except Exception as e:
+                slogger.glob.error(f"Error embedding texts with model {model}: {str(e)}")
+                raise e
+
+            tokens = self._set_embeddings(
+                namespace, model, embeddings, pending, unique_texts, batches, results
+            )
+
+        return self._to_result(model, embeddings, tokens, cached, started_at, config_version)
+
+    # pylint: disable=too-many-positional-arguments
+    async def aembed(
+        self,
+        model: str,
+        credentials: dict,
+        texts: list[str],
+        user: Optional[str] = None,
+        config_version: Optional[ConfigVersion] = None,
+    ) -> EmbeddingResult:
+        """
+        Embeds the given texts without blocking the event loop, returns their embeddings
+            in the same order, priced like `embed`.
+        """
+
+        started_at = time.perf_counter()
+        if config_version is None:
+            config_version = self.get_config_version()
+        namespace = self.get_cache_namespace(credentials)
+        embeddings, pending = self._get_cached_embeddings(namespace, model, texts)
+        cached = len(texts) - sum(len(positions) for positions in pending.values())
+
+        tokens = 0
+        if pending:
+            unique_texts = list(pending)
+            batches = self.get_batches(model, unique_texts)
+            semaphore = asyncio.Semaphore(settings.GF_EMBEDDINGS["CONCURRENCY"])
+
+            async def embed_batch(batch: list[int]) -> tuple[np.ndarray, int]:
+                async with semaphore:
+                    return await self._aembed(
+                        model, credentials, [unique_texts[position] for position in batch], user
+                    )
+
+            try:
+                results = await asyncio.gather(*[embed_batch(batch) for batch in batches])
+            except Exception as e:
+                slogger.glob.error(f"Error embedding texts with model {model}: {str(e)}")
+                raise e
+
+            tokens = self._set_embeddings(
+                namespace, model, embeddings, pending, unique_texts, batches, results
+            )
+
+        return self._to_result(model, embeddings, tokens, cached, started_at, config_version)
+
+    def _get_cached_embeddings(
+        self, namespace: str, model: str, texts: list[str]
+    ) -> tuple[list[Optional[np.ndarray]], dict[str, list[int]]]:
+        """
+        Returns the cached embedding of each text, and the positions of each distinct
+            text that is not cached.
+        """
+
+        embeddings: list[Optional[np.ndarray]] = [None] * len(texts)
+        pending: dict[str, list[int]] = {}
+        for position, text in enumerate(texts):
+            if text in pending:
+                pending[text].append(position)
+                continue
+
+            embedding = embedding_cache.get(embedding_cache.get_key(namespace, model, text))
+            if embedding is None:
+                pending[text] = [position]
+            else:
+                embeddings[position] = embedding
+
+        return embeddings, pending
+
+    # pylint: disable=too-many-positional-arguments
+    def _set_embeddings(
+        self,
+        namespace: str,
+        model: str,
+        embeddings: list[Optional[np.ndarray]],
+        pending: dict[str, list[int]],
+        unique_texts: list[str],
+        batches: list[list[int]],
+        results: list[tuple[np.ndarray, int]],
+    ) -> int:
+        """
+        Sets and caches the embeddings of the embedded batches, returns the tokens billed.
+        """
+
+        tokens = 0
+        for batch, (vectors, batch_tokens) in zip(batches, results):
+            tokens += batch_tokens
+            for position, vector in zip(batch, vectors):
+                text = unique_texts[position]
+                embedding_cache.put(embedding_cache.get_key(namespace, model, text), vector)
+                for text_position in pending[text]:
+                    embeddings[text_position] = vector
+
+        return tokens
+
+    # pylint: disable=too-many-positional-arguments
+    def _to_result(
+        self,
+        model: str,
+        embeddings: list[np.ndarray],
+        tokens: int,
+        cached: int,
+        started_at: float,
+        config_version: Optional[ConfigVersion] = None,
+    ) -> EmbeddingResult:
+        """
+        Returns the result containing the embeddings and usage details.
+        """
+
+        price_info = self.get_price(
+            model=model, price_type=PricingType.INPUT, tokens=tokens, config_version=config_version
+        )
+        usage = EmbeddingUsage(
+            tokens=tokens,
+            unit_price=price_info.unit_price,
+            price_unit=price_info.unit,
+            total_price=price_info.total_amount,
+            currency=price_info.currency,
+            latency=time.perf_counter() - started_at,
+            cached=cached,
+        )
+
+        return EmbeddingResult(
+            model=model,
+            embeddings=(
+                np.vstack(embeddings).astype(np.float32, copy=False)
+                if embeddings
+                else np.empty((0, 0), dtype=np.float32)
+            ),
+            usage=usage,
+        )
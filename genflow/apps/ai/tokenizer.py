@@ -0,0 +1,108 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import threading
+from collections.abc import Iterable
+
+import tiktoken
+from pydantic import BaseModel
+
+from genflow.apps.common.log import ServerLogManager
+
+slogger = ServerLogManager(__name__)
+
+
+class TokenizerStats(BaseModel):
+    """
+    Represents the usage counters of the tokenizer registry.
+    """
+
+    hits: int
+    misses: int
+    size: int
+
+
+class TokenizerRegistry:
+    """
+    Process-wide registry that resolves a model name to its tiktoken encoding once
+    and keeps it for the life of the worker.
+    """
+
+    DEFAULT_ENCODING = "cl100k_base"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._encodings: dict[str, tiktoken.Encoding] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_encoding(self, model: str) -> tiktoken.Encoding:
+        """
+        Returns the encoding of the given model, resolving and caching it on first use.
+        """
+
+        encoding = self._encodings.get(model)
+        if encoding is not None:
+            self.hits += 1
+            return encoding
+
+        with self._lock:
+            encoding = self._encodings.get(model)
+            if encoding is not None:
+                self.hits += 1
+                return encoding
+
+            self.misses += 1
+            encoding = self._resolve_encoding(model)
+            self._encodings[model] = encoding
+
+        return encoding
+
+    def preload(self, models: Iterable[str]) -> None:
+        """
+        Resolves the encodings of the given models ahead of the first request.
+        Failures are logged and do not prevent the remaining models from loading.
+        """
+
+        for model in models:
+            if model in self._encodings:
+                continue
+            try:
+                self.get_encoding(model)
+            except Exception as e:
+                slogger.glob.warning(f"Failed to preload tokenizer for model {model}: {str(e)}")
+
+    def get_stats(self) -> TokenizerStats:
+        """
+        Returns the hit/miss counters and the number of cached encodings.
+        """
+
+        return TokenizerStats(hits=self.hits, misses=self.misses, size=len(self._encodings))
+
+    def clear(self) -> None:
+        """
+        Drops all cached encodings and resets the counters.
+        """
+
+        with self._lock:
+            self._encodings.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _resolve_encoding(self, model: str) -> tiktoken.Encoding:
+        """
+        Resolves the encoding of the given model, falling back to the default encoding
+        if tiktoken does not know the model.
+        """
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            slogger.glob.warning(
+                f"Model {model} not found. Using {self.DEFAULT_ENCODING} encoding."
+            )
+            return tiktoken.get_encoding(self.DEFAULT_ENCODING)
+
+
+tokenizer_registry = TokenizerRegistry()
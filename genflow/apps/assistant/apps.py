@@ -11,7 +11,7 @@ class AssistantConfig(AppConfig):
     def ready(self):
         from django.conf import settings
 
-        from genflow.apps.restriction.registry import register_limit
+        from genflow.apps.restriction.registry import register_counter, register_limit
 
         # Register limits for the assistant app
         register_limit(
@@ -33,5 +33,16 @@ class AssistantConfig(AppConfig):
             default=settings.GF_LIMITS.get("MAX_FILES_PER_ASSISTANT", None),
         )
 
+        # Register the usage counted for the limits
+        register_counter(
+            "ASSISTANT_GROUP",
+            "core.EntityGroup",
+            {"user": "owner_id", "team": "team_id"},
+            filters={"entity_type": "assistant"},
+        )
+        register_counter(
+            "ASSISTANT", "assistant.Assistant", {"user": "owner_id", "team": "team_id"}
+        )
+
         # pylint: disable=unused-import
         from genflow.apps.assistant import signals
@@ -0,0 +1,264 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from os import path as osp
+from typing import Callable, Generic, Optional, TypeVar
+
+from django.conf import settings
+from pydantic import BaseModel
+
+from genflow.apps.common.log import ServerLogManager
+
+slogger = ServerLogManager(__name__)
+
+
+class FilesCacheEntry(BaseModel):
+    """
+    Represents an entry built from the files of an assistant, with the key of the files.
+    """
+
+    key: str
+
+
+EntryT = TypeVar("EntryT", bound=FilesCacheEntry)
+
+
+class FilesContext(FilesCacheEntry):
+    """
+    Represents the text extracted from the files of an assistant, with its token
+    counts per tokenizer.
+    """
+
+    text: str
+    tokens: dict[str, int] = {}
+
+
+class FilesContextCacheStats(BaseModel):
+    """
+    Represents the usage counters of the files context cache.
+    """
+
+    size: int
+    max_entries: int
+    hits: int
+    disk_hits: int
+    misses: int
+
+
+class AssistantFilesCache(Generic[EntryT]):
+    """
+    Caches an entry built from the files of each assistant, e.g. their text or index.
+    Entries are keyed by the names, modification times and sizes of the files, kept in
+    memory with LRU eviction and stored on disk to survive restarts.
+    """
+
+    def __init__(self, entry_class: type[EntryT], root: str, max_entries: int, name: str):
+        """
+        Stores the entries of the given model as JSON files in the given directory,
+            `name` describes the entries in the logs.
+        """
+
+        self.entry_class = entry_class
+        self.root = root
+        self.max_entries = max_entries
+        self.name = name
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, EntryT] = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(dirname: str) -> str:
+        """
+        Returns the cache key of the files in the given directory.
+        """
+
+        files = []
+        if osp.isdir(dirname):
+            with os.scandir(dirname) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+
+        return hashlib.sha256(json.dumps(sorted(files)).encode()).hexdigest()
+
+    def get_entry(self, assistant_id: int, key: str, builder: Callable[[], EntryT]) -> EntryT:
+        """
+        Returns the entry of the assistant for the given key, building it with the builder
+            if it is not cached.
+        """
+
+        with self._lock:
+            entry = self._entries.get(assistant_id)
+            if entry is not None and entry.key == key:
+                self.hits += 1
+                self._entries.move_to_end(assistant_id)
+                return entry
+
+        entry = self._read(assistant_id)
+        if entry is not None and entry.key == key:
+            with self._lock:
+                self.disk_hits += 1
+            self._put(assistant_id, entry)
+            return entry
+
+        with self._lock:
+            self.misses += 1
+
+        entry = builder()
+        self.put(assistant_id, entry)
+        return entry
+
+    def put(self, assistant_id: int, entry: EntryT) -> None:
+        """
+        Caches the entry of the assistant in memory and on disk.
+        """
+
+        self._put(assistant_id, entry)
+        self._write(assistant_id, entry)
+
+    def invalidate(self, assistant_id: int) -> None:
+        """
+        Removes the entry of the assistant from memory and disk.
+        """
+
+        with self._lock:
+            self._entries.pop(assistant_id, None)
+
+        try:
+            os.remove(self._get_path(assistant_id))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Removes all entries from memory and resets the counters, disk entries are kept.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def _put(self, assistant_id: int, entry: EntryT) -> None:
+        """
+        Keeps the entry in memory, evicting the least recently used entries.
+        """
+
+        with self._lock:
+            self._entries[assistant_id] = entry
+            self._entries.move_to_end(assistant_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_path(self, assistant_id: int) -> str:
+        """
+        Returns the path of the disk entry of the assistant.
+        """
+
+        return osp.join(self.root, f"{assistant_id}.json")
+
+    def _read(self, assistant_id: int) -> Optional[EntryT]:
+        """
+        Reads the disk entry of the assistant, if any.
+        """
+
+        try:
+            with open(self._get_path(assistant_id), "r", encoding="utf-8") as file:
+                return self.entry_class.model_validate_json(file.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            slogger.glob.warning(f"Failed to read {self.name} of assistant {assistant_id}: {e}")
+            return None
+
+    def _write(self, assistant_id: int, entry: EntryT) -> None:
+        """
+        Writes the disk entry of the assistant, replacing the previous one atomically.
+        """
+
+        path = self._get_path(assistant_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.write(entry.model_dump_json())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            slogger.glob.warning(f"Failed to write {self.name} of assistant {assistant_id}: {e}")
+            if osp.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class FilesContextCache(AssistantFilesCache[FilesContext]):
+    """
+    Caches the files context of assistants, so that their files are not parsed on every
+    message.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, cache_root: Optional[str] = None):
+        super().__init__(
+            FilesContext,
+            root=cache_root or osp.join(settings.CACHE_ROOT, "files_context"),
+            max_entries=(
+                max_entries
+                if max_entries is not None
+                else settings.GF_FILES_CONTEXT_CACHE["MAX_ENTRIES"]
+            ),
+            name="files context",
+        )
+
+    def get(self, assistant_id: int, dirname: str, loader: Callable[[], str]) -> FilesContext:
+        """
+        Returns the files context of the assistant, extracting it with the loader
+            if it is not cached for the current files.
+        """
+
+        key = self.get_key(dirname)
+        return self.get_entry(assistant_id, key, lambda: FilesContext(key=key, text=loader()))
+
+    def get_tokens_count(
+        self,
+        assistant_id: int,
+        files_context: FilesContext,
+        tokenizer_name: str,
+        count: Callable[[str], int],
+    ) -> int:
+        """
+        Returns the tokens of the files context for the given tokenizer, counting them
+            with the given function only once.
+        """
+
+        tokens = files_context.tokens.get(tokenizer_name)
+        if tokens is None:
+            tokens = count(files_context.text)
+            files_context.tokens[tokenizer_name] = tokens
+            self._write(assistant_id, files_context)
+
+        return tokens
+
+    def get_stats(self) -> FilesContextCacheStats:
+        """
+        Returns the cache size and usage counters.
+        """
+
+        with self._lock:
+            return FilesContextCacheStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self.hits,
+                disk_hits=self.disk_hits,
+                misses=self.misses,
+            )
+
+
+files_context_cache = FilesContextCache()
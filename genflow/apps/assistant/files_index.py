@@ -0,0 +1,160 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import heapq
+import math
+import re
+from collections import Counter
+from os import path as osp
+from typing import Callable, Optional
+
+from django.conf import settings
+
+from genflow.apps.assistant.context_cache import AssistantFilesCache, FilesCacheEntry
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def get_terms(text: str) -> list[str]:
+    """
+    Returns the lowercased terms of the given text.
+    """
+
+    return _TERM_PATTERN.findall(text.lower())
+
+
+def split_text(text: str, chunk_size: int, chunk_overlap: int) -> list[str]:
+    """
+    Splits the text into chunks of at most `chunk_size` words, consecutive chunks share
+        `chunk_overlap` words.
+    """
+
+    words = text.split()
+    step = max(chunk_size - chunk_overlap, 1)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start : start + chunk_size]))
+        if start + chunk_size >= len(words):
+            break
+
+    return chunks
+
+
+class FilesIndex(FilesCacheEntry):
+    """
+    Represents a BM25 index of the chunks of the files of an assistant. Postings map
+    each term to the chunks containing it, with the term frequency in the chunk.
+    """
+
+    chunks: list[str] = []
+    lengths: list[int] = []
+    postings: dict[str, list[tuple[int, int]]] = {}
+
+    @classmethod
+    def build(cls, key: str, documents: list[str], chunk_size: int, chunk_overlap: int):
+        """
+        Chunks the given documents and builds the index of the chunks.
+        """
+
+        index = cls(key=key)
+        for document in documents:
+            for chunk in split_text(document, chunk_size, chunk_overlap):
+                chunk_id = len(index.chunks)
+                terms = Counter(get_terms(chunk))
+                index.chunks.append(chunk)
+                index.lengths.append(sum(terms.values()))
+                for term, frequency in terms.items():
+                    index.postings.setdefault(term, []).append((chunk_id, frequency))
+
+        return index
+
+    def search(
+        self, query: str, top_k: int, k1: float = 1.5, b: float = 0.75
+    ) -> list[tuple[int, float]]:
+        """
+        Returns the ids and scores of the `top_k` chunks that best match the query,
+            best first. Chunks not containing any term of the query are not returned.
+        """
+
+        if not self.chunks:
+            return []
+
+        count = len(self.chunks)
+        avg_length = (sum(self.lengths) / count) or 1.0
+        scores: dict[int, float] = {}
+        for term in set(get_terms(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, frequency in postings:
+                norm = k1 * (1 - b + b * self.lengths[chunk_id] / avg_length)
+                score = idf * frequency * (k1 + 1) / (frequency + norm)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + score
+
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+    def select(
+        self, query: str, top_k: int, token_budget: int, count: Callable[[str], int]
+    ) -> list[str]:
+        """
+        Returns the best matching chunks whose tokens fit the budget, in the order of
+            the files. Chunks exceeding the remaining budget are skipped.
+        """
+
+        selected = []
+        for chunk_id, _ in self.search(query, top_k):
+            tokens = count(self.chunks[chunk_id])
+            if tokens <= token_budget:
+                selected.append(chunk_id)
+                token_budget -= tokens
+
+        return [self.chunks[chunk_id] for chunk_id in sorted(selected)]
+
+
+class FilesIndexStore(AssistantFilesCache[FilesIndex]):
+    """
+    Keeps the BM25 indexes of the files of assistants, so that they are built once when
+    the files change rather than on every message.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, index_root: Optional[str] = None):
+        config = settings.GF_FILES_RETRIEVAL
+        super().__init__(
+            FilesIndex,
+            root=index_root or osp.join(settings.CACHE_ROOT, "files_index"),
+            max_entries=max_entries if max_entries is not None else config["MAX_ENTRIES"],
+            name="files index",
+        )
+        self.chunk_size = config["CHUNK_SIZE"]
+        self.chunk_overlap = config["CHUNK_OVERLAP"]
+
+    def build(self, assistant_id: int, dirname: str, loader: Callable[[], list[str]]) -> FilesIndex:
+        """
+        Builds the index of the documents returned by the loader and stores it.
+        """
+
+        index = self._build(self.get_key(dirname), loader)
+        self.put(assistant_id, index)
+        return index
+
+    def get(self, assistant_id: int, dirname: str, loader: Callable[[], list[str]]) -> FilesIndex:
+        """
+        Returns the index of the files of the assistant, building it if the files changed
+            since it was built.
+        """
+
+        key = self.get_key(dirname)
+        return self.get_entry(assistant_id, key, lambda: self._build(key, loader))
+
+    def _build(self, key: str, loader: Callable[[], list[str]]) -> FilesIndex:
+        """
+        Chunks and indexes the documents returned by the loader.
+        """
+
+        return FilesIndex.build(key, loader(), self.chunk_size, self.chunk_overlap)
+
+
+files_index_store = FilesIndexStore()
@@ -0,0 +1,117 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from os import path as osp
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from llama_index.core import SimpleDirectoryReader
+
+from genflow.apps.ai.base.entities.shared import ModelType
+from genflow.apps.assistant.files_index import split_text
+from genflow.apps.assistant.vector_store import vector_collection_store
+from genflow.apps.core.config.provider_service import AIProviderConfigurationService
+from genflow.apps.core.config.text_embedding_model_bundle import TextEmbeddingModelBundle
+from genflow.apps.core.models import Provider
+from genflow.apps.team.models import Team
+
+
+class Command(BaseCommand):
+    help = "Chunks and embeds the given files into a vector collection of a team."
+
+    def add_arguments(self, parser):
+        parser.add_argument("team", type=int, help="Id of the team owning the collection.")
+        parser.add_argument("name", help="Name of the collection, created if it does not exist.")
+        parser.add_argument("files", nargs="+", help="Files to add to the collection.")
+        parser.add_argument(
+            "--provider",
+            required=True,
+            help="Provider of the embedding model, configured for the team.",
+        )
+        parser.add_argument("--model", required=True, help="Name of the embedding model.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=64,
+            help="Number of chunks embedded per request.",
+        )
+
+    def handle(self, *args, **options):
+        team = Team.objects.filter(id=options["team"]).first()
+        if team is None:
+            raise CommandError(f"Team {options['team']} does not exist")
+
+        try:
+            vector_collection_store.validate_name(options["name"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for filename in options["files"]:
+            if not osp.isfile(filename):
+                raise CommandError(f"File {filename} does not exist")
+
+        text_embedding_model_bundle = self.get_text_embedding_model_bundle(
+            team, options["provider"], options["model"]
+        )
+
+        config = settings.GF_FILES_RETRIEVAL
+        batch_size = options["batch_size"]
+        added = 0
+        for filename in options["files"]:
+            text = " ".join(
+                document.get_content()
+                for document in SimpleDirectoryReader(input_files=[filename]).load_data()
+            )
+            chunks = split_text(text, config["CHUNK_SIZE"], config["CHUNK_OVERLAP"])
+            for start in range(0, len(chunks), batch_size):
+                batch = chunks[start : start + batch_size]
+                embeddings = text_embedding_model_bundle.embed(batch).embeddings
+                collection = vector_collection_store.get(
+                    team.id, options["name"], dimension=len(embeddings[0])
+                )
+                try:
+                    collection.add(embeddings, batch, document=osp.basename(filename))
+                except ValueError as e:
+                    raise CommandError(str(e))
+
+            added += len(chunks)
+            self.stdout.write(f"Added {len(chunks)} chunks of {filename}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Added {added} chunks to collection {options['name']}")
+        )
+
+    @staticmethod
+    def get_text_embedding_model_bundle(
+        team: Team, provider_name: str, model_name: str
+    ) -> TextEmbeddingModelBundle:
+        """
+        Returns the bundle of the embedding model with the provider configuration of the team.
+        """
+
+        try:
+            model_collection_bundle = AIProviderConfigurationService.get_model_collection_bundle(
+                provider_name,
+                queryset=Provider.objects.filter(team=team),
+                model_type=ModelType.TEXT_EMBEDDING.value,
+            )
+            model_schema = model_collection_bundle.model_collection_instance.get_model_schema(
+                model_name=model_name
+            )
+        except Exception as e:
+            raise CommandError(f"Failed to load embedding model {provider_name}/{model_name}: {e}")
+
+        if model_schema is None:
+            raise CommandError(f"Embedding model {provider_name}/{model_name} does not exist")
+        user_configuration = model_collection_bundle.configuration.user_configuration
+        if user_configuration.provider is None:
+            raise CommandError(f"Provider {provider_name} is not configured for team {team.id}")
+
+        return TextEmbeddingModelBundle(
+            configuration=model_collection_bundle.configuration,
+            ai_provider_instance=model_collection_bundle.ai_provider_instance,
+            model_collection_instance=model_collection_bundle.model_collection_instance,
+            model_schema=model_schema,
+            credentials=user_configuration.provider.credentials,
+        )
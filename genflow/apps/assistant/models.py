@@ -4,6 +4,7 @@
 
 import shutil
 from os import path as osp
+from typing import Optional
 
 from django.conf import settings
 from django.db import models
@@ -11,12 +12,17 @@ from django.utils.functional import SimpleLazyObject
 from django.utils.text import get_valid_filename
 from llama_index.core import SimpleDirectoryReader
 
+from genflow.apps.assistant.context_cache import FilesContext, files_context_cache
+from genflow.apps.assistant.files_index import FilesIndex, files_index_store
 from genflow.apps.common.entities import FileEntity
 from genflow.apps.common.file_utils import get_files
+from genflow.apps.common.log import ServerLogManager
 from genflow.apps.common.models import TeamAssociatedModel, TimeAuditModel, UserOwnedModel
 from genflow.apps.core.models import AIAssociatedEntity, CommonEntity
 from genflow.apps.prompt.models import CommonPrompt
 
+slogger = ServerLogManager(__name__)
+
 
 def get_assistant_media_path(instance: "Assistant", filename: str) -> str:
     """
@@ -63,7 +69,10 @@ class Assistant(
         context_source (CharField): The source of context for the assistant, with choices
             defined in `AssistantContextSource`. Defaults to `AssistantContextSource.FILES`.
         collection_config (JSONField): An optional JSON field for storing assistant-specific
-            configuration details.
+            configuration details. With `files_retrieval` set, only the chunks of the files
+            matching the query are used as context. `collections` lists the names of the
+            team collections used as context, searched with the `embedding_model`
+            given by its `provider_name` and `model_name`.
         assistant_status (CharField): The current status of the assistant, with choices
             defined in `AssistantStatus`. Defaults to `AssistantStatus.DRAFTED`.
         avatar (ImageField): An optional image field for storing the assistant's avatar,
@@ -99,19 +108,108 @@ class Assistant(
 
         return SimpleLazyObject(lambda: get_files(self.dirname))
 
+    @property
+    def files_retrieval(self) -> bool:
+        """
+        Returns whether the context is retrieved from the indexed chunks of the files
+        instead of using the whole files context.
+        """
+
+        return bool(
+            (self.collection_config or {}).get(
+                "files_retrieval", settings.GF_FILES_RETRIEVAL["ENABLED"]
+            )
+        )
+
+    @property
+    def collection_names(self) -> list[str]:
+        """
+        Returns the names of the team collections used as context when the context source
+        is `AssistantContextSource.COLLECTIONS`.
+        """
+
+        collections = (self.collection_config or {}).get("collections")
+        if not isinstance(collections, list):
+            return []
+
+        return [name for name in collections if isinstance(name, str)]
+
+    @property
+    def embedding_model(self) -> Optional[dict]:
+        """
+        Returns the provider and model names of the text embedding model the collections
+        are searched with, if set.
+        """
+
+        embedding_model = (self.collection_config or {}).get("embedding_model")
+        if not isinstance(embedding_model, dict) or not all(
+            isinstance(embedding_model.get(key), str) for key in ("provider_name", "model_name")
+        ):
+            return None
+
+        return embedding_model
+
     def get_files_context(self) -> str:
         """
         Retrieves the combined content of all files in a specified directory.
+        The content is cached until the files change.
+        """
+
+        return self.get_cached_files_context().text
+
+    def get_cached_files_context(self) -> FilesContext:
+        """
+        Returns the cached files context, reading the files if they changed since
+            they were last read.
+        """
+
+        return files_context_cache.get(self.id, self.dirname, self.read_files_context)
+
+    def read_files_context(self) -> str:
+        """
+        Reads the combined content of all files in a specified directory.
 
         it uses `SimpleDirectoryReader` to load all files in the
         directory and concatenates their content into a single string.
         """
 
-        context = ""
-        if osp.exists(self.dirname):
+        return " ".join(self.read_files_documents())
+
+    def read_files_documents(self) -> list[str]:
+        """
+        Reads the content of the documents of all files in a specified directory.
+        """
+
+        if osp.exists(self.dirname) and get_files(self.dirname):
             documents = SimpleDirectoryReader(self.dirname).load_data()
-            context = " ".join([document.get_content() for document in documents])
-        return context
+            return [document.get_content() for document in documents]
+        return []
+
+    def get_files_index(self) -> FilesIndex:
+        """
+        Returns the index of the chunks of the files, building it if the files changed
+            since it was built.
+        """
+
+        return files_index_store.get(self.id, self.dirname, self.read_files_documents)
+
+    def on_files_changed(self) -> None:
+        """
+        Called after a file of the assistant was uploaded or deleted.
+        With files retrieval, the files are chunked and indexed right away.
+        """
+
+        files_context_cache.invalidate(self.id)
+        if not self.files_retrieval:
+            files_index_store.invalidate(self.id)
+            return
+
+        try:
+            files_index_store.build(self.id, self.dirname, self.read_files_documents)
+        except Exception as e:
+            # the index is built again on the next message
+            slogger.glob.warning(f"Failed to index files of assistant {self.id}: {e}")
+            files_index_store.invalidate(self.id)
 
     def media_dir(self) -> str:
         """
@@ -129,6 +227,8 @@ class Assistant(
         super().remove_media_dir()
         if osp.exists(self.dirname):
             shutil.rmtree(self.dirname)
+        files_context_cache.invalidate(self.id)
+        files_index_store.invalidate(self.id)
 
     def __str__(self) -> str:
         """
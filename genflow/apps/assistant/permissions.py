@@ -4,10 +4,9 @@
 
 from django.conf import settings
 
-from genflow.apps.assistant.models import Assistant
-from genflow.apps.core.models import EntityGroup
 from genflow.apps.core.permissions import EntityBasePermission, EntityGroupPermission
 from genflow.apps.iam.permissions import GenFLowBasePermission, StrEnum
+from genflow.apps.restriction.counters import get_usage
 from genflow.apps.restriction.mixin import LimitMixin
 from genflow.apps.team.models import TeamRole
 
@@ -17,6 +16,8 @@ class AssistantGroupPermission(GenFLowBasePermission, EntityGroupPermission, Lim
     Handles the permissions for assistant group-related actions.
     """
 
+    basename = "assistant-group"
+
     @staticmethod
     def get_scopes(request, view, obj):
         """
@@ -34,7 +35,7 @@ class AssistantGroupPermission(GenFLowBasePermission, EntityGroupPermission, Lim
         """
 
         permissions = []
-        if view.basename == "assistant-group":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -46,9 +47,7 @@ class AssistantGroupPermission(GenFLowBasePermission, EntityGroupPermission, Lim
         Get the number of assistant group owned by the user.
         """
 
-        return EntityGroup.objects.filter(
-            entity_type=Assistant.__name__.lower(), owner_id=self.user_id
-        ).count()
+        return get_usage("ASSISTANT_GROUP", "user", self.user_id)
 
     def get_team_usage(self) -> int:
         """
@@ -58,9 +57,7 @@ class AssistantGroupPermission(GenFLowBasePermission, EntityGroupPermission, Lim
         if self.team_id is None:
             return 0
 
-        return EntityGroup.objects.filter(
-            entity_type=Assistant.__name__.lower(), team_id=self.team_id
-        ).count()
+        return get_usage("ASSISTANT_GROUP", "team", self.team_id)
 
     def check_access(self) -> bool:
         """
@@ -98,6 +95,8 @@ class AssistantPermission(GenFLowBasePermission, EntityBasePermission, LimitMixi
     Handles the permissions for assistant-related actions.
     """
 
+    basename = "assistant"
+
     class FileManagementScopes(StrEnum):
         """
         Defines the possible scopes of actions.
@@ -133,7 +132,7 @@ class AssistantPermission(GenFLowBasePermission, EntityBasePermission, LimitMixi
         """
 
         permissions = []
-        if view.basename == "assistant":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -145,7 +144,7 @@ class AssistantPermission(GenFLowBasePermission, EntityBasePermission, LimitMixi
         Get the number of assistant owned by the user.
         """
 
-        return Assistant.objects.filter(owner_id=self.user_id).count()
+        return get_usage("ASSISTANT", "user", self.user_id)
 
     def get_team_usage(self) -> int:
         """
@@ -155,7 +154,7 @@ class AssistantPermission(GenFLowBasePermission, EntityBasePermission, LimitMixi
         if self.team_id is None:
             return 0
 
-        return Assistant.objects.filter(team_id=self.team_id).count()
+        return get_usage("ASSISTANT", "team", self.team_id)
 
     def check_access(self) -> bool:
         """
@@ -3,12 +3,15 @@
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
 import os
+from typing import Optional
 
 from django.db import transaction
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from genflow.apps.ai.base.entities.shared import ModelType
 from genflow.apps.assistant.models import Assistant
+from genflow.apps.assistant.vector_store import vector_collection_store
 from genflow.apps.core.serializers import (
     EntityBaseWriteSerializer,
     EntityGroupReadSerializer,
@@ -16,6 +19,7 @@ from genflow.apps.core.serializers import (
     ProviderModelConfigReadSerializer,
     common_entity_read_fields,
     common_entity_write_fields,
+    get_model,
 )
 from genflow.apps.prompt.serializers import common_prompt_read_fields, common_prompt_write_fields
 
@@ -63,6 +67,70 @@ class AssistantReadSerializer(serializers.ModelSerializer):
         )
 
 
+class EmbeddingModelSerializer(serializers.Serializer):
+    """
+    Serializer for the text embedding model the collections of an assistant are searched with.
+    """
+
+    provider_name = serializers.CharField()
+    model_name = serializers.CharField()
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Validates that the text embedding model is enabled for the team.
+        """
+
+        provider_name = attrs["provider_name"]
+        model_name = attrs["model_name"]
+        model = get_model(
+            context=self.context,
+            model_name=model_name,
+            provider_name=provider_name,
+            model_type=ModelType.TEXT_EMBEDDING,
+        )
+        if not model:
+            raise serializers.ValidationError(
+                f"Text embedding model {model_name} not found for provider {provider_name}"
+            )
+
+        return attrs
+
+
+class CollectionConfigSerializer(serializers.Serializer):
+    """
+    Serializer for the `collection_config` of an assistant.
+    """
+
+    files_retrieval = serializers.BooleanField(required=False)
+    collections = serializers.ListField(child=serializers.CharField(), required=False)
+    embedding_model = EmbeddingModelSerializer(required=False)
+
+    def validate_collections(self, value: list[str]) -> list[str]:
+        """
+        Validates the names of the collections.
+        """
+
+        for name in value:
+            try:
+                vector_collection_store.validate_name(name)
+            except ValueError as e:
+                raise serializers.ValidationError(str(e))
+
+        return value
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Validates that the collections are searched with an embedding model.
+        """
+
+        if attrs.get("collections") and "embedding_model" not in attrs:
+            raise serializers.ValidationError(
+                {"embedding_model": "An embedding model is required to search the collections."}
+            )
+
+        return attrs
+
+
 class AssistantWriteSerializer(EntityBaseWriteSerializer):
     """
     Serializer for writing Assistant data, to be used by post/patch actions.
@@ -71,6 +139,18 @@ class AssistantWriteSerializer(EntityBaseWriteSerializer):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def validate_collection_config(self, value: Optional[dict]) -> Optional[dict]:
+        """
+        Validates the collection configuration of the assistant.
+        """
+
+        if value is None:
+            return value
+
+        serializer = CollectionConfigSerializer(data=value, context=self.context)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
     class Meta:
         model = Assistant
         fields = (
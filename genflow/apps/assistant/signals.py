@@ -6,7 +6,9 @@ from django.db.models.signals import post_delete, post_migrate
 from django.dispatch import receiver
 
 from genflow.apps.assistant.models import Assistant
+from genflow.apps.assistant.vector_store import vector_collection_store
 from genflow.apps.restriction.signals import add_global_limits
+from genflow.apps.team.models import Team
 
 
 # post_migrate is different from other signals
@@ -22,3 +24,8 @@ def add_assistant_global_limits(sender, **kwargs):
 @receiver(post_delete, sender=Assistant)
 def delete_key_on_assistant_delete(sender, instance, **kwargs):
     instance.remove_media_dir()
+
+
+@receiver(post_delete, sender=Team)
+def delete_collections_on_team_delete(sender, instance, **kwargs):
+    vector_collection_store.delete_team(instance.id)
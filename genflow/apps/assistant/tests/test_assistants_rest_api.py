@@ -6,12 +6,16 @@ import os
 from http.client import HTTPResponse
 from os import path as osp
 from pathlib import Path
+from unittest import mock
+from unittest.mock import Mock
 
 from django.conf import settings
 from django.test import override_settings
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from genflow.apps.ai.base.entities.shared import ModelType
+from genflow.apps.assistant.files_index import files_index_store
 from genflow.apps.assistant.tests.utils import (
     ASSISTANT_DATA,
     ASSISTANT_GROUP_DATA,
@@ -19,6 +23,7 @@ from genflow.apps.assistant.tests.utils import (
     create_dummy_assistant_group,
 )
 from genflow.apps.common.entities import FileEntity
+from genflow.apps.core.config.entities import AIProviderConfiguration
 from genflow.apps.core.tests.utils import enable_provider
 from genflow.apps.prompt.tests.utils import PROVIDER_DATA
 from genflow.apps.restriction.tests.utils import override_limit
@@ -155,6 +160,55 @@ class AssistantCreateTestCase(AssistantTestCase):
         response = self.create_assistant(user, data, team_id=team.id)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_create_assistant_user_collection_config(self):
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        group = self.regular_users[0]["teams"][0]["group"]
+        _ = enable_provider(team=team, owner=user, data=PROVIDER_DATA)
+
+        get_provider_models = AIProviderConfiguration.get_provider_models
+
+        # the provider also supports text embedding models
+        def get_provider_models_with_embedding(configuration, model_type=None):
+            if model_type != ModelType.TEXT_EMBEDDING:
+                return get_provider_models(configuration, model_type=model_type)
+            embedding = get_provider_models(configuration, model_type=ModelType.LLM)[0]
+            return [
+                embedding.model_copy(update={"id": "embedding1", "type": ModelType.TEXT_EMBEDDING})
+            ]
+
+        embedding_model = {"provider_name": "dummy", "model_name": "embedding1"}
+        invalid_configs = [
+            "docs",
+            {"collections": "docs", "embedding_model": embedding_model},
+            {"collections": ["../docs"], "embedding_model": embedding_model},
+            {"collections": ["docs"]},
+            {"collections": ["docs"], "embedding_model": {"provider_name": "dummy"}},
+            {"collections": ["docs"], "embedding_model": "embedding1"},
+            # an llm model
+            {
+                "collections": ["docs"],
+                "embedding_model": {"provider_name": "dummy", "model_name": "model2"},
+            },
+        ]
+        data = ASSISTANT_DATA.copy()
+        data["group_id"] = group.id
+        with mock.patch.object(
+            AIProviderConfiguration, "get_provider_models", get_provider_models_with_embedding
+        ):
+            for collection_config in invalid_configs:
+                data["collection_config"] = collection_config
+                response = self.create_assistant(user, data, team_id=team.id)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+            data["collection_config"] = {
+                "collections": ["docs"],
+                "embedding_model": embedding_model,
+            }
+            response = self.create_assistant(user, data, team_id=team.id)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["collection_config"], data["collection_config"])
+
     def test_create_assistant_user_user_check_global_limit(self):
         override_limit(
             key="ASSISTANT",
@@ -627,6 +681,21 @@ class AssistantUploadFileTestCase(AssistantTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.check_data(response)
 
+    def test_upload_file_files_retrieval(self):
+        self.assistant.collection_config = {"files_retrieval": True}
+        self.assistant.save()
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        response = self.upload_file(user, self.assistant.id, team_id=team.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the files are indexed on upload
+        loader = Mock()
+        index = files_index_store.get(self.assistant.id, self.assistant.dirname, loader)
+        self.assertEqual(index.chunks, ["fake content"])
+        loader.assert_not_called()
+        self.check_data(response)
+        files_index_store.invalidate(self.assistant.id)
+
     def test_upload_file_user_another_team(self):
         team = self.regular_users[0]["teams"][0]["team"]
         another_user = self.regular_users[1]["user"]
@@ -0,0 +1,82 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import os
+import tempfile
+from os import path as osp
+from unittest import TestCase
+from unittest.mock import Mock
+
+from genflow.apps.assistant.context_cache import FilesContextCache
+
+
+class FilesContextCacheTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dirname = osp.join(self.temp_dir.name, "files")
+        self.cache_root = osp.join(self.temp_dir.name, "cache")
+        os.makedirs(self.dirname)
+        self.write_file("file1.txt", "hello")
+        self.cache = FilesContextCache(max_entries=2, cache_root=self.cache_root)
+        self.loader = Mock(return_value="context")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name, content):
+        with open(osp.join(self.dirname, name), "w", encoding="utf-8") as file:
+            file.write(content)
+
+    def test_get_cached(self):
+        self.assertEqual(self.cache.get(1, self.dirname, self.loader).text, "context")
+        self.assertEqual(self.cache.get(1, self.dirname, self.loader).text, "context")
+
+        self.loader.assert_called_once()
+        stats = self.cache.get_stats()
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+
+    def test_get_files_changed(self):
+        self.cache.get(1, self.dirname, self.loader)
+        self.write_file("file2.txt", "world")
+        self.cache.get(1, self.dirname, self.loader)
+
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_get_from_disk(self):
+        self.cache.get(1, self.dirname, self.loader)
+
+        # a new process only finds the disk entry
+        cache = FilesContextCache(max_entries=2, cache_root=self.cache_root)
+        self.assertEqual(cache.get(1, self.dirname, self.loader).text, "context")
+        self.loader.assert_called_once()
+        self.assertEqual(cache.get_stats().disk_hits, 1)
+
+    def test_invalidate(self):
+        self.cache.get(1, self.dirname, self.loader)
+        self.cache.invalidate(1)
+        self.cache.get(1, self.dirname, self.loader)
+
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_evict_least_recently_used(self):
+        for assistant_id in range(3):
+            self.cache.get(assistant_id, self.dirname, self.loader)
+
+        self.assertEqual(self.cache.get_stats().size, 2)
+        # the evicted entry is still found on disk
+        self.cache.get(0, self.dirname, self.loader)
+        self.assertEqual(self.loader.call_count, 3)
+
+    def test_get_tokens_count(self):
+        files_context = self.cache.get(1, self.dirname, self.loader)
+        count = Mock(return_value=7)
+
+        self.assertEqual(self.cache.get_tokens_count(1, files_context, "tokenizer", count), 7)
+        self.assertEqual(self.cache.get_tokens_count(1, files_context, "tokenizer", count), 7)
+        count.assert_called_once_with("context")
+
+        # token counts are stored with the disk entry
+        cache = FilesContextCache(max_entries=2, cache_root=self.cache_root)
+        files_context = cache.get(1, self.dirname, self.loader)
+        self.assertEqual(files_context.tokens, {"tokenizer": 7})
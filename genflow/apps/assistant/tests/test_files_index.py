@@ -0,0 +1,99 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import os
+import tempfile
+from os import path as osp
+from unittest import TestCase
+from unittest.mock import Mock
+
+from genflow.apps.assistant.files_index import FilesIndex, FilesIndexStore, split_text
+
+DOCUMENTS = [
+    "The cat sat on the mat.",
+    "Dogs chase cats in the garden.",
+    "Stock markets fell sharply today.",
+]
+
+
+class SplitTextTest(TestCase):
+    def test_split_text(self):
+        text = " ".join(str(i) for i in range(10))
+
+        self.assertEqual(split_text(text, 4, 1), ["0 1 2 3", "3 4 5 6", "6 7 8 9"])
+        self.assertEqual(split_text(text, 20, 2), [text])
+        self.assertEqual(split_text("", 4, 1), [])
+
+
+class FilesIndexTest(TestCase):
+    def setUp(self):
+        self.index = FilesIndex.build("key", DOCUMENTS, chunk_size=50, chunk_overlap=5)
+
+    def test_search(self):
+        results = self.index.search("stock markets", top_k=3)
+
+        self.assertEqual([chunk_id for chunk_id, _ in results], [2])
+
+    def test_search_ranks_by_score(self):
+        results = self.index.search("cat mat", top_k=3)
+
+        self.assertEqual(results[0][0], 0)
+        self.assertEqual(self.index.search("unknown", top_k=3), [])
+
+    def test_select_within_budget(self):
+        count = len
+
+        # both chunks match, only the best one fits the budget
+        selected = self.index.select("the cat mat", top_k=3, token_budget=25, count=count)
+        self.assertEqual(selected, [DOCUMENTS[0]])
+
+        selected = self.index.select("the cat mat", top_k=3, token_budget=100, count=count)
+        self.assertEqual(selected, DOCUMENTS[:2])
+
+
+class FilesIndexStoreTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dirname = osp.join(self.temp_dir.name, "files")
+        self.index_root = osp.join(self.temp_dir.name, "index")
+        os.makedirs(self.dirname)
+        self.write_file("file1.txt", "hello")
+        self.store = FilesIndexStore(max_entries=2, index_root=self.index_root)
+        self.loader = Mock(return_value=DOCUMENTS)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name, content):
+        with open(osp.join(self.dirname, name), "w", encoding="utf-8") as file:
+            file.write(content)
+
+    def test_get_built_once(self):
+        self.store.build(1, self.dirname, self.loader)
+        index = self.store.get(1, self.dirname, self.loader)
+
+        self.assertEqual(index.chunks, DOCUMENTS)
+        self.loader.assert_called_once()
+
+    def test_get_from_disk(self):
+        self.store.build(1, self.dirname, self.loader)
+
+        store = FilesIndexStore(max_entries=2, index_root=self.index_root)
+        index = store.get(1, self.dirname, self.loader)
+        self.assertEqual(index.search("stock", top_k=1)[0][0], 2)
+        self.loader.assert_called_once()
+
+    def test_get_files_changed(self):
+        self.store.build(1, self.dirname, self.loader)
+        self.write_file("file2.txt", "world")
+        self.store.get(1, self.dirname, self.loader)
+
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_invalidate(self):
+        self.store.build(1, self.dirname, self.loader)
+        self.store.invalidate(1)
+        self.store.get(1, self.dirname, self.loader)
+
+        self.assertEqual(self.loader.call_count, 2)
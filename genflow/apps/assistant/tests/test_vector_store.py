@@ -0,0 +1,249 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import tempfile
+import threading
+from io import StringIO
+from os import path as osp
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from genflow.apps.assistant.management.commands.ingest_collection import Command
+from genflow.apps.assistant.vector_store import (
+    VectorCollection,
+    VectorCollectionStore,
+    vector_collection_store,
+)
+from genflow.apps.team.tests.utils import create_dummy_users
+
+VECTOR_COLLECTIONS = {"PARTITION_MIN_VECTORS": 1000, "PARTITION_PROBES": 4}
+
+
+@override_settings(GF_VECTOR_COLLECTIONS=VECTOR_COLLECTIONS)
+class VectorCollectionTest(SimpleTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dirname = osp.join(self.temp_dir.name, "collection")
+        self.collection = VectorCollection(self.dirname, dimension=3)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_search(self):
+        self.collection.add(np.eye(3), ["x", "y", "z"], document="axes")
+
+        matches = self.collection.search([0.1, 1, 0], k=2)
+        self.assertEqual([match.text for match in matches], ["y", "x"])
+        self.assertEqual(matches[0].document, "axes")
+        self.assertAlmostEqual(matches[0].score, 1 / np.sqrt(1.01), places=5)
+
+    def test_add_incrementally(self):
+        self.collection.add([[1, 0, 0]], ["x"])
+        self.collection.add([[0, 1, 0], [0, 0, 1]], ["y", "z"])
+
+        self.assertEqual(self.collection.count, 3)
+        self.assertEqual(self.collection.search([0, 0, 2], k=1)[0].text, "z")
+
+    def test_reopen(self):
+        self.collection.add(np.eye(3), ["x", "y", "z"])
+
+        collection = VectorCollection(self.dirname)
+        self.assertEqual(collection.count, 3)
+        self.assertEqual(collection.search([0, 0, 1], k=1)[0].text, "z")
+
+        # changes of another process are loaded
+        collection.add([[1, 1, 0]], ["xy"])
+        self.assertEqual(self.collection.search([1, 1, 0], k=1)[0].text, "xy")
+
+    def test_concurrent_writers(self):
+        # each collection stands for a process writing the same directory
+        collections = [self.collection, VectorCollection(self.dirname)]
+
+        def add(collection, axis):
+            for i in range(20):
+                collection.add([np.eye(3)[axis]], [f"{axis}-{i}"])
+
+        threads = [
+            threading.Thread(target=add, args=(collections[axis % 2], axis)) for axis in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        collection = VectorCollection(self.dirname)
+        self.assertEqual(collection.count, 60)
+        for axis in range(3):
+            matches = collection.search(np.eye(3)[axis], k=20)
+            self.assertTrue(all(match.text.startswith(f"{axis}-") for match in matches))
+
+    def test_add_after_failed_add(self):
+        self.collection.add([[1, 0, 0]], ["x"])
+        with mock.patch.object(VectorCollection, "_write_meta", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                self.collection.add([[0, 1, 0]], ["lost"])
+
+        # the chunks of the failed add are dropped, in this and in another process
+        self.collection.add([[0, 0, 1]], ["z"])
+        VectorCollection(self.dirname).add([[0, 1, 0]], ["y"])
+        collection = VectorCollection(self.dirname)
+        for vector, text in zip(np.eye(3), ["x", "y", "z"]):
+            self.assertEqual(collection.search(vector, k=1)[0].text, text)
+
+    def test_add_validation(self):
+        with self.assertRaises(ValueError):
+            self.collection.add([[1, 0]], ["x"])
+        with self.assertRaises(ValueError):
+            self.collection.add(np.eye(3), ["x"])
+        with self.assertRaises(ValueError):
+            VectorCollection(self.dirname, dimension=4)
+        with self.assertRaises(ValueError):
+            VectorCollection(osp.join(self.temp_dir.name, "missing"))
+
+    def test_partition(self):
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(2000, 8))
+        texts = [str(i) for i in range(len(vectors))]
+        collection = VectorCollection(osp.join(self.temp_dir.name, "large"), dimension=8)
+        collection.add(vectors[:1500], texts[:1500])
+        collection.add(vectors[1500:], texts[1500:])
+
+        self.assertGreater(collection.meta.lists, 0)
+        # vectors added after partitioning are found as well
+        for i in (10, 1900):
+            self.assertEqual(collection.search(vectors[i], k=1)[0].text, texts[i])
+
+        # all lists probed gives the exhaustive result
+        exact = VectorCollection(osp.join(self.temp_dir.name, "exact"), dimension=8)
+        with override_settings(
+            GF_VECTOR_COLLECTIONS={**VECTOR_COLLECTIONS, "PARTITION_MIN_VECTORS": 10**6}
+        ):
+            exact.add(vectors, texts)
+        query = rng.normal(size=8)
+        self.assertEqual(
+            [match.text for match in collection.search(query, k=5, probes=collection.meta.lists)],
+            [match.text for match in exact.search(query, k=5)],
+        )
+
+
+class VectorCollectionStoreTest(SimpleTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = VectorCollectionStore(root=self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_team_collections(self):
+        self.store.get(1, "docs", dimension=2).add([[1, 0]], ["team 1"])
+        self.store.get(2, "docs", dimension=2).add([[1, 0]], ["team 2"])
+
+        self.assertEqual(self.store.get_names(1), ["docs"])
+        matches = self.store.search(1, ["docs", "missing"], np.array([1, 0]), k=5)
+        self.assertEqual([match.text for match in matches], ["team 1"])
+
+    def test_search_across_collections(self):
+        self.store.get(1, "a", dimension=2).add([[1, 0], [0, 1]], ["a1", "a2"])
+        self.store.get(1, "b", dimension=2).add([[1, 0.1]], ["b1"])
+
+        matches = self.store.search(1, ["a", "b"], np.array([1, 0]), k=2)
+        self.assertEqual([match.text for match in matches], ["a1", "b1"])
+
+    def test_search_other_dimension(self):
+        self.store.get(1, "a", dimension=2).add([[1, 0]], ["a1"])
+        self.store.get(1, "b", dimension=3).add([[1, 0, 0]], ["b1"])
+
+        # collections embedded with another model are skipped
+        matches = self.store.search(1, ["a", "b"], np.array([1, 0]), k=2)
+        self.assertEqual([match.text for match in matches], ["a1"])
+
+    def test_delete(self):
+        self.store.get(1, "docs", dimension=2)
+        self.store.get(2, "docs", dimension=2)
+        self.store.delete(1, "docs")
+        self.store.delete_team(2)
+
+        self.assertEqual(self.store.get_names(1), [])
+        self.assertEqual(self.store.get_names(2), [])
+        with self.assertRaises(ValueError):
+            self.store.get(1, "docs")
+
+    def test_invalid_name(self):
+        with self.assertRaises(ValueError):
+            self.store.get(1, "../docs", dimension=2)
+
+
+class IngestCollectionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        _, regular_users = create_dummy_users(create_teams=True)
+        cls.team = regular_users[0]["teams"][0]["team"]
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(vector_collection_store.delete_team, self.team.id)
+        patcher = mock.patch.object(vector_collection_store, "root", self.temp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # embeds each chunk on the axis of its first word
+        def embed(texts, user=None):
+            axes = {"red": 0, "green": 1, "blue": 2}
+            return SimpleNamespace(embeddings=[np.eye(3)[axes[text.split()[0]]] for text in texts])
+
+        patcher = mock.patch.object(
+            Command,
+            "get_text_embedding_model_bundle",
+            return_value=SimpleNamespace(embed=embed),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_file(self, name: str, text: str) -> str:
+        filename = osp.join(self.temp_dir.name, name)
+        with open(filename, "w", encoding="utf-8") as file:
+            file.write(text)
+        return filename
+
+    @override_settings(GF_FILES_RETRIEVAL={"CHUNK_SIZE": 2, "CHUNK_OVERLAP": 0})
+    def test_ingest_collection(self):
+        colors = self.create_file("colors.txt", "red apple green leaf")
+        sky = self.create_file("sky.txt", "blue sky")
+
+        out = StringIO()
+        call_command(
+            "ingest_collection",
+            self.team.id,
+            "docs",
+            colors,
+            sky,
+            provider="dummy",
+            model="embedding",
+            batch_size=1,
+            stdout=out,
+        )
+        self.assertIn("Added 3 chunks", out.getvalue())
+
+        collection = vector_collection_store.get(self.team.id, "docs")
+        self.assertEqual(collection.count, 3)
+        match = collection.search([0, 1, 0], k=1)[0]
+        self.assertEqual((match.text, match.document), ("green leaf", "colors.txt"))
+
+    def test_ingest_collection_validation(self):
+        filename = self.create_file("colors.txt", "red apple")
+        with self.assertRaises(CommandError):
+            call_command(
+                "ingest_collection", self.team.id, "../docs", filename, provider="p", model="m"
+            )
+        with self.assertRaises(CommandError):
+            call_command(
+                "ingest_collection", self.team.id, "docs", "missing.txt", provider="p", model="m"
+            )
+        with self.assertRaises(CommandError):
+            call_command("ingest_collection", 0, "docs", filename, provider="p", model="m")
@@ -0,0 +1,497 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import fcntl
+import json
+import math
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from os import path as osp
+from typing import Iterator, Optional
+
+import numpy as np
+from django.conf import settings
+from django.utils.text import get_valid_filename
+from pydantic import BaseModel
+
+from genflow.apps.common.log import ServerLogManager
+
+slogger = ServerLogManager(__name__)
+
+# rows the vectors file grows by at least
+_MIN_CAPACITY = 1024
+
+
+class VectorCollectionMeta(BaseModel):
+    """
+    Represents the state of a vector collection stored next to its vectors.
+    """
+
+    dimension: int
+    count: int = 0
+    capacity: int = 0
+    # lists of the coarse partition, 0 if the collection is not partitioned
+    lists: int = 0
+    # vectors of the collection when the partition was built
+    partitioned_count: int = 0
+    # bytes of the chunks file holding the `count` chunks, None in collections written
+    # before it was stored
+    chunks_size: Optional[int] = None
+
+
+class VectorMatch(BaseModel):
+    """
+    Represents a chunk of a collection matching a search, with its cosine similarity.
+    """
+
+    text: str
+    document: Optional[str] = None
+    score: float
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Returns the given vectors as float32 rows of unit length.
+    """
+
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns the positions of the k highest scores, highest first.
+    """
+
+    if k < len(scores):
+        positions = np.argpartition(-scores, k)[:k]
+    else:
+        positions = np.arange(len(scores))
+
+    return positions[np.argsort(-scores[positions], kind="stable")]
+
+
+class VectorCollection:
+    """
+    Stores the chunks of the documents of a collection with their embeddings. Vectors are
+    normalized and kept in a memory-mapped float32 file, so that a search is a single matrix
+    product over the collection. Large collections are split into lists around k-means
+    centroids, and a search then only scores the lists closest to the query.
+    """
+
+    META_FILE = "meta.json"
+    VECTORS_FILE = "vectors.f32"
+    CHUNKS_FILE = "chunks.jsonl"
+    CENTROIDS_FILE = "centroids.npy"
+    ASSIGNMENTS_FILE = "assignments.i32"
+    LOCK_FILE = "lock"
+
+    def __init__(self, dirname: str, dimension: Optional[int] = None) -> None:
+        """
+        Opens the collection stored in the given directory, creating it with the given
+            dimension if it does not exist. Raises ValueError if the dimension does not match.
+        """
+
+        self.dirname = dirname
+        self._lock = threading.RLock()
+        # lock file held by the thread writing the collection
+        self._lock_file = None
+        # identifies the meta file loaded, replaced on every write
+        self._meta_stamp: Optional[tuple[int, int]] = None
+        self._vectors: Optional[np.memmap] = None
+        self._assignments: Optional[np.memmap] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._chunks: list[dict] = []
+
+        if not osp.exists(self._get_path(self.META_FILE)):
+            if dimension is None:
+                raise ValueError(f"Collection {dirname} does not exist")
+            os.makedirs(dirname, exist_ok=True)
+            self.meta = VectorCollectionMeta(dimension=dimension, chunks_size=0)
+            self._write_meta()
+
+        self._load()
+        if dimension is not None and dimension != self.meta.dimension:
+            raise ValueError(
+                f"Collection {dirname} has dimension {self.meta.dimension}, not {dimension}"
+            )
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the number of chunks of the collection.
+        """
+
+        self._reload_if_changed()
+        return self.meta.count
+
+    def add(self, vectors: np.ndarray, texts: list[str], document: Optional[str] = None) -> None:
+        """
+        Adds chunks of a document with their vectors to the collection. Large collections
+            are partitioned again once they doubled since they were last partitioned.
+        """
+
+        vectors = normalize(vectors)
+        if len(vectors) != len(texts):
+            raise ValueError("The number of vectors and texts must match")
+        if vectors.shape[1] != self.meta.dimension:
+            raise ValueError(f"Vectors must have dimension {self.meta.dimension}")
+
+        with self._write_lock():
+            self._reload_if_changed()
+            start = self.meta.count
+            end = start + len(vectors)
+            self._reserve(end)
+            self._vectors[start:end] = vectors
+            self._vectors.flush()
+
+            chunks = [{"text": text, "document": document} for text in texts]
+            with open(self._get_path(self.CHUNKS_FILE), "ab") as file:
+                # drops the chunks of an add that failed before its meta was written
+                file.truncate(self.meta.chunks_size or 0)
+                file.seek(0, os.SEEK_END)
+                file.writelines((json.dumps(chunk) + "\n").encode() for chunk in chunks)
+                chunks_size = file.tell()
+
+            if self._centroids is not None:
+                self._assignments[start:end] = self._assign(vectors)
+                self._assignments.flush()
+
+            # the collection is changed in memory once its meta is written
+            self._write_meta(
+                self.meta.model_copy(update={"count": end, "chunks_size": chunks_size})
+            )
+            self._chunks.extend(chunks)
+
+            config = settings.GF_VECTOR_COLLECTIONS
+            if end >= config["PARTITION_MIN_VECTORS"] and end >= 2 * self.meta.partitioned_count:
+                self.partition()
+
+    def search(self, vector: np.ndarray, k: int, probes: Optional[int] = None) -> list[VectorMatch]:
+        """
+        Returns the k chunks most similar to the given vector, most similar first. In a
+            partitioned collection only the vectors of the `probes` closest lists are scored.
+        """
+
+        query = normalize(vector)[0]
+        with self._lock:
+            self._reload_if_changed()
+            count = self.meta.count
+            if count == 0:
+                return []
+
+            vectors = self._vectors[:count]
+            if self._centroids is not None:
+                probes = probes or settings.GF_VECTOR_COLLECTIONS["PARTITION_PROBES"]
+                lists = top_k(self._centroids @ query, probes)
+                positions = np.flatnonzero(np.isin(self._assignments[:count], lists))
+                scores = vectors[positions] @ query
+                order = top_k(scores, k)
+                positions, scores = positions[order], scores[order]
+            else:
+                scores = vectors @ query
+                positions = top_k(scores, k)
+                scores = scores[positions]
+
+            return [
+                VectorMatch(
+                    text=self._chunks[position]["text"],
+                    document=self._chunks[position]["document"],
+                    score=float(score),
+                )
+                for position, score in zip(positions, scores)
+            ]
+
+    def partition(self, lists: Optional[int] = None, iterations: int = 10) -> None:
+        """
+        Splits the vectors into lists around centroids found with spherical k-means,
+            about the square root of the number of vectors by default.
+        """
+
+        with self._write_lock():
+            self._reload_if_changed()
+            count = self.meta.count
+            if count == 0:
+                return
+
+            lists = min(lists or int(math.sqrt(count)), count)
+            vectors = self._vectors[:count]
+            # centroids are trained on a sample of the collection
+            rng = np.random.default_rng(0)
+            sample = vectors[np.sort(rng.choice(count, min(count, lists * 256), replace=False))]
+            centroids = sample[rng.choice(len(sample), lists, replace=False)]
+            for _ in range(iterations):
+                assignments = np.argmax(sample @ centroids.T, axis=1)
+                for i in range(lists):
+                    members = sample[assignments == i]
+                    if len(members):
+                        centroids[i] = members.sum(axis=0)
+                centroids = normalize(centroids)
+
+            self._centroids = centroids
+            np.save(self._get_path(self.CENTROIDS_FILE), centroids)
+            self._assignments = self._open_memmap(
+                self.ASSIGNMENTS_FILE, np.int32, (self.meta.capacity,)
+            )
+            self._assignments[:count] = self._assign(vectors)
+            self._assignments.flush()
+
+            self.meta.lists = lists
+            self.meta.partitioned_count = count
+            self._write_meta()
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """
+        Locks the collection for writing, against the other threads of the process and
+            the other processes writing it, e.g. an ingestion running next to the server.
+        """
+
+        with self._lock:
+            if self._lock_file is not None:
+                # flock is not reentrant across open files, partition is called by add
+                yield
+                return
+
+            with open(self._get_path(self.LOCK_FILE), "a+b") as file:
+                fcntl.flock(file, fcntl.LOCK_EX)
+                self._lock_file = file
+                try:
+                    yield
+                finally:
+                    self._lock_file = None
+                    fcntl.flock(file, fcntl.LOCK_UN)
+
+    def _assign(self, vectors: np.ndarray, batch_size: int = 8192) -> np.ndarray:
+        """
+        Returns the closest list of each vector.
+        """
+
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), batch_size):
+            batch = vectors[start : start + batch_size]
+            assignments[start : start + batch_size] = np.argmax(batch @ self._centroids.T, axis=1)
+
+        return assignments
+
+    def _reserve(self, count: int) -> None:
+        """
+        Grows the memory-mapped files so that they hold at least the given number of vectors.
+        """
+
+        if count <= self.meta.capacity:
+            return
+
+        self.meta.capacity = max(count, 2 * self.meta.capacity, _MIN_CAPACITY)
+        self._vectors = self._open_memmap(
+            self.VECTORS_FILE, np.float32, (self.meta.capacity, self.meta.dimension)
+        )
+        if self._centroids is not None:
+            self._assignments = self._open_memmap(
+                self.ASSIGNMENTS_FILE, np.int32, (self.meta.capacity,)
+            )
+
+    def _open_memmap(self, name: str, dtype, shape: tuple) -> np.memmap:
+        """
+        Maps the given file, growing it to the given shape if needed.
+        """
+
+        path = self._get_path(name)
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with open(path, "a+b") as file:
+            if file.seek(0, os.SEEK_END) < size:
+                file.truncate(size)
+
+        return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+
+    def _load(self) -> None:
+        """
+        Loads the meta of the collection and maps its files.
+        """
+
+        path = self._get_path(self.META_FILE)
+        self._meta_stamp = self._get_meta_stamp()
+        with open(path, "r", encoding="utf-8") as file:
+            self.meta = VectorCollectionMeta.model_validate_json(file.read())
+
+        self._vectors = None
+        self._assignments = None
+        self._centroids = None
+        self._chunks = []
+        if self.meta.capacity:
+            self._vectors = self._open_memmap(
+                self.VECTORS_FILE, np.float32, (self.meta.capacity, self.meta.dimension)
+            )
+            chunks_size = 0
+            with open(self._get_path(self.CHUNKS_FILE), "rb") as file:
+                for _, line in zip(range(self.meta.count), file):
+                    self._chunks.append(json.loads(line))
+                    chunks_size += len(line)
+            if self.meta.chunks_size is None:
+                self.meta.chunks_size = chunks_size
+
+        if self.meta.lists:
+            self._centroids = np.load(self._get_path(self.CENTROIDS_FILE))
+            self._assignments = self._open_memmap(
+                self.ASSIGNMENTS_FILE, np.int32, (self.meta.capacity,)
+            )
+
+    def _reload_if_changed(self) -> None:
+        """
+        Loads the collection again if another process changed it.
+        """
+
+        try:
+            stamp = self._get_meta_stamp()
+        except FileNotFoundError:
+            return
+
+        if stamp != self._meta_stamp:
+            self._load()
+
+    def _write_meta(self, meta: Optional[VectorCollectionMeta] = None) -> None:
+        """
+        Writes the given meta of the collection atomically, after the files it describes,
+            and makes it the meta of the collection. Writes the current meta by default.
+        """
+
+        meta = meta or self.meta
+        path = self._get_path(self.META_FILE)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(meta.model_dump_json())
+        os.replace(tmp_path, path)
+        self.meta = meta
+        self._meta_stamp = self._get_meta_stamp()
+
+    def _get_meta_stamp(self) -> tuple[int, int]:
+        """
+        Returns the inode and modification time of the meta file.
+        """
+
+        stat = os.stat(self._get_path(self.META_FILE))
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _get_path(self, name: str) -> str:
+        """
+        Returns the path of the given file of the collection.
+        """
+
+        return osp.join(self.dirname, name)
+
+
+class VectorCollectionStore:
+    """
+    Keeps the vector collections of teams, each team has its own namespace of collections.
+    Opened collections are shared by the requests of the process.
+    """
+
+    def __init__(self, root: Optional[str] = None) -> None:
+        self.root = root or settings.COLLECTIONS_ROOT
+        self._lock = threading.Lock()
+        self._collections: dict[tuple[int, str], VectorCollection] = {}
+
+    @staticmethod
+    def validate_name(name: str) -> None:
+        """
+        Raises ValueError if the name is not a valid collection name.
+        """
+
+        if not name or get_valid_filename(name) != name:
+            raise ValueError(f"Invalid collection name: {name}")
+
+    def get_dirname(self, team_id: int, name: str) -> str:
+        """
+        Returns the directory of the collection of the team. Raises ValueError if the
+            name is not a valid collection name.
+        """
+
+        self.validate_name(name)
+        return osp.join(self.root, "teams", str(team_id), name)
+
+    def get(self, team_id: int, name: str, dimension: Optional[int] = None) -> VectorCollection:
+        """
+        Returns the collection of the team, creating it with the given dimension if it
+            does not exist. Raises ValueError if it does not exist and no dimension is given.
+        """
+
+        key = (team_id, name)
+        with self._lock:
+            collection = self._collections.get(key)
+            if collection is None or not osp.exists(collection.dirname):
+                collection = VectorCollection(self.get_dirname(team_id, name), dimension)
+                self._collections[key] = collection
+
+        return collection
+
+    def get_names(self, team_id: int) -> list[str]:
+        """
+        Returns the names of the collections of the team.
+        """
+
+        dirname = osp.join(self.root, "teams", str(team_id))
+        if not osp.isdir(dirname):
+            return []
+
+        return sorted(
+            name
+            for name in os.listdir(dirname)
+            if osp.exists(osp.join(dirname, name, VectorCollection.META_FILE))
+        )
+
+    def delete(self, team_id: int, name: str) -> None:
+        """
+        Removes the collection of the team.
+        """
+
+        dirname = self.get_dirname(team_id, name)
+        with self._lock:
+            self._collections.pop((team_id, name), None)
+        if osp.exists(dirname):
+            shutil.rmtree(dirname)
+
+    def delete_team(self, team_id: int) -> None:
+        """
+        Removes all collections of the team.
+        """
+
+        with self._lock:
+            for key in [key for key in self._collections if key[0] == team_id]:
+                del self._collections[key]
+
+        dirname = osp.join(self.root, "teams", str(team_id))
+        if osp.exists(dirname):
+            shutil.rmtree(dirname)
+
+    def search(
+        self, team_id: int, names: list[str], vector: np.ndarray, k: int
+    ) -> list[VectorMatch]:
+        """
+        Returns the k chunks most similar to the given vector across the given collections
+            of the team, most similar first. Missing collections and collections embedded
+            with a model of another dimension are skipped.
+        """
+
+        dimension = np.shape(vector)[-1]
+        matches: list[VectorMatch] = []
+        for name in names:
+            try:
+                collection = self.get(team_id, name)
+                if collection.meta.dimension != dimension:
+                    raise ValueError(
+                        f"Collection has dimension {collection.meta.dimension}, not {dimension}"
+                    )
+            except ValueError as e:
+                slogger.glob.warning(f"Failed to search collection {name} of team {team_id}: {e}")
+                continue
+            matches.extend(collection.search(vector, k))
+
+        return sorted(matches, key=lambda match: match.score, reverse=True)[:k]
+
+
+vector_collection_store = VectorCollectionStore()
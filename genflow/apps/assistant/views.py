@@ -117,7 +117,8 @@ class AssistantsViewSet(EntityBaseViewSet, FileManagementMixin):
     for managing Prompt objects..
     """
 
-    queryset = Assistant.objects.all().order_by("name")
+    queryset = Assistant.objects.select_related("related_model", "group").order_by("name")
+    limited_actions = ("create", "upload_file")
     filterset_fields = EntityBaseViewSet.filterset_fields + ["prompt_type", "assistant_status"]
     ordering_fields = EntityBaseViewSet.ordering_fields + ["prompt_type", "assistant_status"]
 
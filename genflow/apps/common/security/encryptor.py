@@ -5,6 +5,7 @@
 import base64
 
 from genflow.apps.common.security import rsa
+from genflow.apps.common.security.keyring import keyring
 
 
 def obfuscated_token(token: str):
@@ -28,7 +29,9 @@ def encrypt_token(team_id: str, token: str):
 
 
 def decrypt_token(team_id: str, token: str):
-    return rsa.decrypt(base64.b64decode(token), team_id)
+    return rsa.decrypt_token_with_decoding(
+        base64.b64decode(token), keyring.get_private_key(team_id)
+    )
 
 
 def decrypt_token_with_decoding(token: str, rsa_key):
@@ -0,0 +1,69 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
+from django.conf import settings
+
+from genflow.apps.common.security import rsa
+
+
+class Keyring:
+    """
+    Keeps the parsed private keys of teams in memory, so that the PEM files are not read
+    and parsed for every decryption. Keys are evicted in LRU order. The key material is
+    held by OpenSSL and cannot be zeroed from Python, eviction drops the last reference
+    so that it is freed.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = (
+            max_entries if max_entries is not None else settings.GF_KEYRING["MAX_ENTRIES"]
+        )
+        self._lock = threading.Lock()
+        self._keys: OrderedDict[str, PrivateKeyTypes] = OrderedDict()
+
+    def get_private_key(self, team_id: str) -> PrivateKeyTypes:
+        """
+        Returns the private key of the team, loading it from its PEM file on first use.
+        """
+
+        team_id = str(team_id)
+        with self._lock:
+            private_key = self._keys.get(team_id)
+            if private_key is not None:
+                self._keys.move_to_end(team_id)
+                return private_key
+
+        private_key = rsa.get_decrypt_decoding(team_id)
+
+        with self._lock:
+            self._keys[team_id] = private_key
+            self._keys.move_to_end(team_id)
+            while len(self._keys) > self.max_entries:
+                self._keys.popitem(last=False)
+
+        return private_key
+
+    def invalidate(self, team_id: str) -> None:
+        """
+        Removes the private key of the team, e.g. when the team is deleted.
+        """
+
+        with self._lock:
+            self._keys.pop(str(team_id), None)
+
+    def clear(self) -> None:
+        """
+        Removes all private keys.
+        """
+
+        with self._lock:
+            self._keys.clear()
+
+
+keyring = Keyring()
@@ -9,4 +9,5 @@ class CoreConfig(AppConfig):
     name = "genflow.apps.core"
 
     def ready(self):
-        pass
+        # pylint: disable=unused-import
+        from genflow.apps.core import signals
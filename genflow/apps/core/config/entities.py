@@ -2,13 +2,14 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
-from pydantic import BaseModel, ConfigDict, field_serializer
+from pydantic import BaseModel, ConfigDict, PrivateAttr, field_serializer
 
 from genflow.apps.ai import ai_provider_factory
 from genflow.apps.ai.base.ai_provider import AIProvider
-from genflow.apps.ai.base.entities.model import CommonModelEntity, ModelEntity
+from genflow.apps.ai.base.entities.config import ConfigVersion
+from genflow.apps.ai.base.entities.model import CommonModelEntity, ModelEntity, ModelIndex
 from genflow.apps.ai.base.entities.provider import AIProviderEntity, CommonAIProviderEntity
 from genflow.apps.ai.base.entities.shared import ModelType
 from genflow.apps.ai.base.model_collection import ModelCollection
@@ -25,11 +26,35 @@ class UserModelConfiguration(BaseModel):
 
 class UserProviderConfiguration(BaseModel):
     """
-    Represents an AI provider configuration provided by the user.
+    Represents an AI provider configuration provided by the user. Given a loader, the
+    credentials are only loaded, e.g. decrypted, when they are first accessed.
     """
 
     provider_id: str
-    credentials: dict
+
+    _credentials: Optional[dict] = PrivateAttr(default=None)
+    _load_credentials: Optional[Callable[[], dict]] = PrivateAttr(default=None)
+
+    def __init__(
+        self,
+        credentials: Optional[dict] = None,
+        load_credentials: Optional[Callable[[], dict]] = None,
+        **data: Any,
+    ):
+        super().__init__(**data)
+        self._credentials = credentials
+        self._load_credentials = load_credentials
+
+    @property
+    def credentials(self) -> dict:
+        """
+        Returns the credentials, loading them on first access.
+        """
+
+        if self._credentials is None:
+            self._credentials = self._load_credentials() if self._load_credentials else {}
+
+        return self._credentials
 
 
 class UserConfiguration(BaseModel):
@@ -178,6 +203,26 @@ class ModelBundle(ModelCollectionBundle):
     model_schema: ModelEntity
     parameters: dict[str, Any] = {}
     credentials: dict[str, Any] = {}
+    # version of the model config the bundle was created with, used for its whole life
+    config_version: Optional[ConfigVersion] = None
 
     # pydantic configs
     model_config = ConfigDict(protected_namespaces=())
+
+    def model_post_init(self, context: Any, /) -> None:
+        if self.config_version is None:
+            self.config_version = self.model_collection_instance.get_config_version()
+
+    def get_model_index(self) -> ModelIndex:
+        """
+        Returns the index of the model schema in the version of the bundle, unless the
+            schema is not one of its models.
+        """
+
+        model_index = self.model_collection_instance.get_model_index(
+            self.model_schema.id, self.config_version
+        )
+        if model_index is None or model_index.model_schema is not self.model_schema:
+            model_index = ModelIndex.build(self.model_schema)
+
+        return model_index
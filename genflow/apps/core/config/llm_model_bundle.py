@@ -2,7 +2,7 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
-from typing import Any, Generator, Optional, Union, cast
+from typing import Any, AsyncGenerator, Generator, Optional, Union, cast
 
 from pydantic import ConfigDict
 
@@ -49,6 +49,31 @@ class LLMModelBundle(ModelBundle):
             stop=stop,
             stream=stream,
             user=user,
+            config_version=self.config_version,
+        )
+
+    # pylint: disable=too-many-positional-arguments
+    async def acall(
+        self,
+        messages: list[Message],
+        parameters: Optional[dict] = None,
+        stop: Optional[list[str]] = None,
+        stream: bool = True,
+        user: Optional[str] = None,
+    ) -> Union[Result, AsyncGenerator]:
+        """
+        Call large language model without blocking the event loop
+        """
+
+        return await self.model_collection_instance.acall(
+            model=self.model_schema.id,
+            credentials=self.credentials,
+            messages=messages,
+            parameters=parameters,
+            stop=stop,
+            stream=stream,
+            user=user,
+            config_version=self.config_version,
         )
 
     def get_tokens_count(self, messages: list[Message]) -> int:
@@ -61,6 +86,37 @@ class LLMModelBundle(ModelBundle):
             messages=messages,
         )
 
+    def get_message_tokens_count(self, message: Message) -> int:
+        """
+        Get number of tokens a single message adds to a prompt
+        """
+
+        return self.model_collection_instance.get_message_tokens_count(
+            model=self.model_schema.id,
+            message=message,
+        )
+
+    def get_max_tokens(self) -> int:
+        """
+        Get the max tokens parameter of the llm, 0 if it is not set
+        """
+
+        max_tokens = 0
+        for parameter_config in self.get_model_index().max_tokens_parameters:
+            max_tokens = (
+                self.parameters.get(parameter_config.name)
+                or self.parameters.get(parameter_config.use_template)
+            ) or 0
+
+        return max_tokens
+
+    def get_tokenizer_name(self) -> str:
+        """
+        Get name of the tokenizer used by the llm
+        """
+
+        return self.model_collection_instance.get_tokenizer_name(model=self.model_schema.id)
+
     @staticmethod
     def _fetch_credentials_from_bundle(
         model: str, model_collection_bundle: ModelCollectionBundle
@@ -0,0 +1,91 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from typing import Dict, Optional
+
+from genflow.apps.ai import ai_provider_factory
+from genflow.apps.ai.base.entities.shared import ModelType
+from genflow.apps.common.entities import ConfigurationEntity
+from genflow.apps.core.config.entities import ModelWithProviderEntity
+from genflow.apps.core.config.provider_service import AIProviderConfigurationService
+from genflow.apps.core.models import Provider
+from genflow.apps.team.models import Team
+
+
+class ModelResolver:
+    """
+    Resolves the model entities of a team for the lifetime of a request. The enabled
+    providers of the team are fetched with a single query on first use, and the model
+    entities of each provider are built once, so that serializing a list of entities
+    does not query the providers and rebuild their models per instance.
+    """
+
+    def __init__(self, team: Optional[Team]):
+        self.team = team
+        self._db_providers: Optional[Dict[str, Provider]] = None
+        self._models: Dict[tuple[str, ModelType], Dict[str, ModelWithProviderEntity]] = {}
+        self._parameter_configs: Dict[tuple[str, str], list[ConfigurationEntity]] = {}
+
+    def get_db_provider(self, provider_name: str) -> Optional[Provider]:
+        """
+        Returns the enabled provider of the given name, or None if it is not enabled
+            for the team.
+        """
+
+        if self._db_providers is None:
+            if self.team is None:
+                self._db_providers = {}
+            else:
+                self._db_providers = AIProviderConfigurationService.get_db_providers(
+                    Provider.objects.filter(team=self.team, is_valid=True),
+                    [
+                        ai_provider_entity.id
+                        for ai_provider_entity in ai_provider_factory.get_ai_provider_schemas()
+                    ],
+                )
+
+        return self._db_providers.get(provider_name)
+
+    def get_model(
+        self, provider_name: str, model_name: str, model_type: ModelType = ModelType.LLM
+    ) -> Optional[ModelWithProviderEntity]:
+        """
+        Returns the enabled model of the given name, provider name and type, or None if it
+            is not found.
+        """
+
+        key = (provider_name, model_type)
+        models = self._models.get(key)
+        if models is None:
+            db_provider = self.get_db_provider(provider_name)
+            models = {}
+            if db_provider is not None:
+                for model in AIProviderConfigurationService.get_provider_models(
+                    provider_name=provider_name,
+                    db_provider=db_provider,
+                    model_type=model_type.value,
+                    enabled_only=True,
+                ):
+                    models.setdefault(model.id, model)
+            self._models[key] = models
+
+        return models.get(model_name)
+
+    def get_parameter_configs(
+        self, provider_name: str, model_name: str
+    ) -> list[ConfigurationEntity]:
+        """
+        Returns the parameter configurations of the model of the given name and provider name.
+        """
+
+        key = (provider_name, model_name)
+        if key not in self._parameter_configs:
+            self._parameter_configs[key] = (
+                AIProviderConfigurationService.get_model_parameter_configs(
+                    provider_name=provider_name,
+                    model_name=model_name,
+                )
+            )
+
+        return self._parameter_configs[key]
@@ -68,6 +68,21 @@ class AIProviderConfigurationService:
 
         return ai_provider_configuration
 
+    @staticmethod
+    def get_db_providers(
+        queryset: QuerySet[Provider], provider_names: List[str]
+    ) -> Dict[str, Provider]:
+        """
+        Retrieves the providers of the given names with a single query. As with `first()`,
+            the provider with the lowest id is kept for each name.
+        """
+
+        db_providers: Dict[str, Provider] = {}
+        for db_provider in queryset.filter(provider_name__in=provider_names).order_by("pk"):
+            db_providers.setdefault(db_provider.provider_name, db_provider)
+
+        return db_providers
+
     @staticmethod
     def get_configuration(queryset: QuerySet[Provider]) -> Dict[str, AIProviderConfiguration]:
         """
@@ -75,12 +90,16 @@ class AIProviderConfigurationService:
         """
 
         ai_provider_entities = ai_provider_factory.get_ai_provider_schemas()
+        db_providers = AIProviderConfigurationService.get_db_providers(
+            queryset, [ai_provider_entity.id for ai_provider_entity in ai_provider_entities]
+        )
         provider_configurations = {}
         for ai_provider_entity in ai_provider_entities:
-            db_provider = queryset.filter(provider_name=ai_provider_entity.id).first()
+            db_provider = db_providers.get(ai_provider_entity.id)
             ai_provider_configuration = AIProviderConfigurationService.get_provider_configuration(
                 provider_name=ai_provider_entity.id,
-                queryset=queryset,
+                # providers missing from the batch are not queried again
+                queryset=queryset.none(),
                 db_provider=db_provider,
                 ai_provider_entity=ai_provider_entity,
             )
@@ -124,13 +143,17 @@ class AIProviderConfigurationService:
         """
 
         ai_provider_entities = ai_provider_factory.get_ai_provider_schemas()
+        db_providers = AIProviderConfigurationService.get_db_providers(
+            queryset, [ai_provider_entity.id for ai_provider_entity in ai_provider_entities]
+        )
 
         models = []
         for ai_provider_entity in ai_provider_entities:
-            db_provider = queryset.filter(provider_name=ai_provider_entity.id).first()
+            db_provider = db_providers.get(ai_provider_entity.id)
             provider_models = AIProviderConfigurationService.get_provider_models(
                 provider_name=ai_provider_entity.id,
-                queryset=queryset,
+                # providers missing from the batch are not queried again
+                queryset=queryset.none(),
                 db_provider=db_provider,
                 model_type=model_type,
                 enabled_only=enabled_only,
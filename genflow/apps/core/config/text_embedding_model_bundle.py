@@ -0,0 +1,58 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from typing import Any, Optional, cast
+
+from pydantic import ConfigDict
+
+from genflow.apps.ai.text_embedding.entities import EmbeddingResult
+from genflow.apps.ai.text_embedding.text_embedding_model_collection import (
+    TextEmbeddingModelCollection,
+)
+from genflow.apps.core.config.entities import ModelBundle
+
+
+class TextEmbeddingModelBundle(ModelBundle):
+    """
+    Represents a model bundle for text embedding.
+    """
+
+    model_collection_instance: TextEmbeddingModelCollection
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        if not isinstance(self.model_collection_instance, TextEmbeddingModelCollection):
+            raise Exception("Model collection instance is not TextEmbeddingModelCollection")
+
+        self.model_collection_instance = cast(
+            TextEmbeddingModelCollection, self.model_collection_instance
+        )
+
+    def embed(self, texts: list[str], user: Optional[str] = None) -> EmbeddingResult:
+        """
+        Embed texts
+        """
+
+        return self.model_collection_instance.embed(
+            model=self.model_schema.id,
+            credentials=self.credentials,
+            texts=texts,
+            user=user,
+            config_version=self.config_version,
+        )
+
+    async def aembed(self, texts: list[str], user: Optional[str] = None) -> EmbeddingResult:
+        """
+        Embed texts without blocking the event loop
+        """
+
+        return await self.model_collection_instance.aembed(
+            model=self.model_schema.id,
+            credentials=self.credentials,
+            texts=texts,
+            user=user,
+            config_version=self.config_version,
+        )
@@ -0,0 +1,124 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Optional
+
+from django.conf import settings
+
+
+class CredentialsEntry(NamedTuple):
+    """
+    Represents the decrypted credentials of a provider, with string values held in
+    byte arrays so that they can be zeroed when the entry is evicted.
+    """
+
+    key: str
+    expires_at: float
+    credentials: dict[str, Any]
+
+
+class CredentialsCache:
+    """
+    Caches the decrypted credentials of providers for a short time, so that they are not
+    decrypted on every request. Entries are keyed by the digest of the encrypted config,
+    so that credentials changed by another worker are never served from the cache, and
+    evicted in LRU order.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        config = settings.GF_CREDENTIALS_CACHE
+        self.ttl = ttl if ttl is not None else config["TTL"]
+        self.max_entries = max_entries if max_entries is not None else config["MAX_ENTRIES"]
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, CredentialsEntry] = OrderedDict()
+
+    @staticmethod
+    def get_key(encrypted_config: Optional[str]) -> str:
+        """
+        Returns the cache key of the given encrypted config.
+        """
+
+        return hashlib.sha256((encrypted_config or "").encode()).hexdigest()
+
+    def get(
+        self, provider_id: int, encrypted_config: Optional[str], loader: Callable[[], dict]
+    ) -> dict:
+        """
+        Returns the decrypted credentials of the provider, decrypting them with the loader
+            if they are not cached for the given encrypted config.
+        """
+
+        key = self.get_key(encrypted_config)
+        with self._lock:
+            entry = self._entries.get(provider_id)
+            if entry is not None and entry.key == key and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(provider_id)
+                return self._to_credentials(entry.credentials)
+
+        credentials = loader()
+        entry = CredentialsEntry(
+            key=key,
+            expires_at=time.monotonic() + self.ttl,
+            credentials={
+                name: bytearray(value.encode()) if isinstance(value, str) else value
+                for name, value in credentials.items()
+            },
+        )
+
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(provider_id, None)
+            if previous is not None:
+                evicted.append(previous)
+            self._entries[provider_id] = entry
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[1])
+
+        for evicted_entry in evicted:
+            self._zero(evicted_entry)
+
+        return credentials
+
+    def invalidate(self, provider_id: int) -> None:
+        """
+        Removes the credentials of the provider, e.g. when it is changed or deleted.
+        """
+
+        with self._lock:
+            entry = self._entries.pop(provider_id, None)
+
+        if entry is not None:
+            self._zero(entry)
+
+    def clear(self) -> None:
+        """
+        Removes all credentials.
+        """
+
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+
+        for entry in entries:
+            self._zero(entry)
+
+    @staticmethod
+    def _to_credentials(credentials: dict[str, Any]) -> dict:
+        return {
+            name: value.decode() if isinstance(value, bytearray) else value
+            for name, value in credentials.items()
+        }
+
+    @staticmethod
+    def _zero(entry: CredentialsEntry) -> None:
+        for value in entry.credentials.values():
+            if isinstance(value, bytearray):
+                value[:] = bytes(len(value))
+
+
+credentials_cache = CredentialsCache()
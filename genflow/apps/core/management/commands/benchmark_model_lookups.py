@@ -0,0 +1,67 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import timeit
+from typing import Callable
+
+from django.core.management.base import BaseCommand
+
+from genflow.apps.ai import ai_provider_factory
+from genflow.apps.ai.base.entities.model import PricingType
+from genflow.apps.ai.base.model_collection import ModelCollection
+from genflow.apps.ai.llm.llm_model_collection import LLMModelCollection
+
+
+class Command(BaseCommand):
+    help = "Measures the per-call cost of the model schema lookups of the model collections."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=100000,
+            help="Number of calls per lookup.",
+        )
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        for ai_provider_schema in ai_provider_factory.get_ai_provider_schemas():
+            ai_provider_instance = ai_provider_factory.get_ai_provider_instance(
+                ai_provider_schema.id
+            )
+            for model_type in ai_provider_schema.supported_model_types:
+                model_collection = ai_provider_instance.get_model_collection_instance(
+                    model_type=model_type.value
+                )
+                models = model_collection.get_models()
+                if not models:
+                    continue
+
+                self.stdout.write(
+                    f"{ai_provider_schema.id}.{model_type.value} ({len(models)} models)"
+                )
+                # the last model is the slowest to find in a list
+                for name, lookup in self.get_lookups(model_collection, models[-1].id).items():
+                    seconds = timeit.timeit(lookup, number=number)
+                    self.stdout.write(f"  {name:<32} {seconds / number * 1e9:>10.0f} ns/call")
+
+    @staticmethod
+    def get_lookups(model_collection: ModelCollection, model: str) -> dict[str, Callable]:
+        """
+        Returns the lookups to measure for the given model, with the lookup of the schema
+            by rebuilding a map of the models on every call as the baseline.
+        """
+
+        lookups = {
+            "rebuilt map (baseline)": lambda: {
+                model_schema.id: model_schema for model_schema in model_collection.get_models()
+            }.get(model),
+            "get_model_schema": lambda: model_collection.get_model_schema(model),
+            "get_price": lambda: model_collection.get_price(model, PricingType.INPUT, 100),
+        }
+        if isinstance(model_collection, LLMModelCollection):
+            lookups["get_model_mode"] = lambda: model_collection.get_model_mode(model)
+            lookups["get_parameter_configs"] = lambda: model_collection.get_parameter_configs(model)
+
+        return lookups
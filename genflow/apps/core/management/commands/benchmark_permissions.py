@@ -0,0 +1,78 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import timeit
+from types import SimpleNamespace
+from typing import Callable
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import autodiscover_modules
+
+from genflow.apps.iam.permissions import GenFLowBasePermission
+from genflow.apps.team.models import TeamRole
+
+
+class Command(BaseCommand):
+    help = "Measures the per-check cost of creating the permissions of the views."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=100000,
+            help="Number of permission checks per view.",
+        )
+        parser.add_argument(
+            "--action",
+            default="list",
+            help="Action of the views to check.",
+        )
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        # permission classes are registered when the permission modules are imported
+        autodiscover_modules("permissions")
+
+        basenames = sorted(name for name in GenFLowBasePermission.registry if name is not None)
+        self.stdout.write(
+            f"{len(GenFLowBasePermission.__subclasses__())} permission classes, "
+            f"{len(basenames)} view basenames"
+        )
+        # views without permission classes are checked as well, e.g. the users view
+        for basename in [*basenames, "unregistered"]:
+            view = SimpleNamespace(basename=basename, action=options["action"], detail=False)
+            self.stdout.write(basename)
+            for name, check in self.get_checks(view).items():
+                seconds = timeit.timeit(check, number=number)
+                self.stdout.write(f"  {name:<32} {seconds / number * 1e9:>10.0f} ns/check")
+
+    @staticmethod
+    def get_checks(view) -> dict[str, Callable]:
+        """
+        Returns the checks to measure for the given view, with the scan of all the permission
+            classes on every check as the baseline. The IAM context is given, so that no
+            query is measured.
+        """
+
+        iam_context = {
+            "user_id": 1,
+            "group_name": None,
+            "team_id": 1,
+            "team_owner_id": 1,
+            "team_role": TeamRole.OWNER.value,
+        }
+
+        def create(perm_classes):
+            return [
+                perm
+                for perm_class in perm_classes
+                for perm in perm_class.create(None, view, None, iam_context)
+            ]
+
+        return {
+            "subclass scan (baseline)": lambda: create(GenFLowBasePermission.__subclasses__()),
+            "dispatch table": lambda: create(
+                GenFLowBasePermission.get_permission_classes(view.basename)
+            ),
+        }
@@ -0,0 +1,35 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from genflow.apps.ai.config_snapshot import compile_config_snapshot, write_config_snapshot
+from genflow.apps.ai.providers.registry import AI_PROVIDERS
+
+
+class Command(BaseCommand):
+    help = (
+        "Compiles the provider and model YAML files into a validated snapshot "
+        "that is loaded by the workers instead of parsing the files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.MODEL_CONFIG_SNAPSHOT,
+            help="Path of the snapshot file.",
+        )
+
+    def handle(self, *args, **options):
+        snapshot = compile_config_snapshot(AI_PROVIDERS, settings.MODEL_CONFIG_ROOT)
+        write_config_snapshot(snapshot, options["output"])
+
+        models = sum(len(collection.schemas) for collection in snapshot.model_collections.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Compiled {len(snapshot.providers)} providers and {models} models "
+                f"into {options['output']} ({snapshot.digest[:12]})"
+            )
+        )
@@ -20,7 +20,8 @@ from genflow.apps.core.serializers import (
     EntityGroupWriteSerializer,
     FileEntitySerializer,
 )
-from genflow.apps.restriction.mixin import TeamLimitMixin
+from genflow.apps.restriction.counters import add_counter, get_counter
+from genflow.apps.restriction.mixin import AtomicLimitViewMixin, TeamLimitMixin
 from genflow.apps.team.middleware import HttpRequestWithIamContext
 
 
@@ -63,7 +64,7 @@ from genflow.apps.team.middleware import HttpRequestWithIamContext
         },
     ),
 )
-class EntityGroupViewSetMixin(viewsets.ModelViewSet):
+class EntityGroupViewSetMixin(AtomicLimitViewMixin, viewsets.ModelViewSet):
     """
     A mixin that filters EntityGroup by entity_type based on the model class name.
     Assumes `queryset` and `serializer_class` are defined.
@@ -133,7 +134,26 @@ class FileManagementMixin(TeamLimitMixin, metaclass=ABCMeta):
         """
 
         instance = self.get_object()
-        return len(get_files(instance.dirname))
+        return get_counter(
+            instance._meta.model_name,
+            instance.pk,
+            self.get_file_limit_key(),
+            loader=lambda: len(get_files(instance.dirname)),
+            lock=True,
+        )
+
+    def add_files_count(self, instance, delta: int) -> None:
+        """
+        Adds the delta to the files count of the entity.
+        """
+
+        add_counter(
+            instance._meta.model_name,
+            instance.pk,
+            self.get_file_limit_key(),
+            delta,
+            loader=lambda: len(get_files(instance.dirname)),
+        )
 
     def check_limit(self) -> bool:
         """
@@ -147,6 +167,14 @@ class FileManagementMixin(TeamLimitMixin, metaclass=ABCMeta):
             return self.check_global_limit(key)
         return self.check_team_limit(team, key)
 
+    def on_files_changed(self, instance) -> None:
+        """
+        Notifies the entity that its files changed, so that it can drop data derived from them.
+        """
+
+        if hasattr(instance, "on_files_changed"):
+            instance.on_files_changed()
+
     @action(detail=True, methods=["get"], url_path="files")
     def list_files(self, request, pk=None):
         """
@@ -184,6 +212,8 @@ class FileManagementMixin(TeamLimitMixin, metaclass=ABCMeta):
 
         if serializer.is_valid():
             serializer.save()
+            self.add_files_count(instance, 1)
+            self.on_files_changed(instance)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -205,5 +235,7 @@ class FileManagementMixin(TeamLimitMixin, metaclass=ABCMeta):
         file_path = osp.join(instance.dirname, filename)
         if osp.exists(file_path):
             fs.delete(file_path)
+            self.add_files_count(instance, -1)
+            self.on_files_changed(instance)
             return Response(status=status.HTTP_204_NO_CONTENT)
         return Response(status=status.HTTP_404_NOT_FOUND)
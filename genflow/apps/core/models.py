@@ -19,6 +19,7 @@ from genflow.apps.common.log import ServerLogManager
 from genflow.apps.common.models import TeamAssociatedModel, TimeAuditModel, UserOwnedModel
 from genflow.apps.common.security.encryptor import decrypt_token, obfuscated_token
 from genflow.apps.core.config.entities import SystemConfiguration, UserProviderConfiguration
+from genflow.apps.core.credentials_cache import credentials_cache
 
 slogger = ServerLogManager(__name__)
 
@@ -125,34 +126,49 @@ class Provider(TimeAuditModel, UserOwnedModel, TeamAssociatedModel):
     def user_provider_configuration(self) -> UserProviderConfiguration:
         """
         Returns the user provider configuration if enabled.
-        Credentials are decrypted using the team's RSA key.
+        Credentials are decrypted using the team's RSA key when first accessed.
         """
 
         if not self.is_enabled:
             return None
-        else:
-            # Get provider credential secret variables
-            provider_credential_secret_variables = Provider.extract_secret_variables(
-                provider_name=self.provider_name
-            )
-            # fix origin data
-            provider_credentials = self.fix_encrypted_config()
-
-            for variable in provider_credential_secret_variables:
-                if variable in provider_credentials:
-                    try:
-                        provider_credentials[variable] = decrypt_token(
-                            str(self.team.id), provider_credentials.get(variable)
-                        )
-                    except ValueError as e:
-                        slogger.glob.error(
-                            f"Error decrypting credentials for provider {self.provider_name}: {str(e)}"
-                        )
-                        raise e
-
-            return UserProviderConfiguration(
-                provider_id=str(self.id), credentials=provider_credentials
-            )
+
+        return UserProviderConfiguration(
+            provider_id=str(self.id), load_credentials=self.get_decrypted_credentials
+        )
+
+    def get_decrypted_credentials(self) -> dict:
+        """
+        Returns the credentials with their secret variables decrypted, cached for a short
+            time as long as the encrypted config does not change.
+        """
+
+        return credentials_cache.get(self.id, self.encrypted_config, self.decrypt_credentials)
+
+    def decrypt_credentials(self) -> dict:
+        """
+        Returns the credentials with their secret variables decrypted.
+        """
+
+        # Get provider credential secret variables
+        provider_credential_secret_variables = Provider.extract_secret_variables(
+            provider_name=self.provider_name
+        )
+        # fix origin data
+        provider_credentials = self.fix_encrypted_config()
+
+        for variable in provider_credential_secret_variables:
+            if variable in provider_credentials:
+                try:
+                    provider_credentials[variable] = decrypt_token(
+                        str(self.team_id), provider_credentials.get(variable)
+                    )
+                except ValueError as e:
+                    slogger.glob.error(
+                        f"Error decrypting credentials for provider {self.provider_name}: {str(e)}"
+                    )
+                    raise e
+
+        return provider_credentials
 
     @property
     def system_configuration(self) -> SystemConfiguration:
@@ -2,14 +2,143 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
+import json
 import sys
+from typing import Optional
 
-from rest_framework.pagination import PageNumberPagination
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """
+    Returns the number of rows of the queryset estimated by the query planner, or None if
+        the database does not provide an estimate.
+    """
+
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on the keyset ordering of a view, so that every page is fetched with an
+    indexed range scan instead of an OFFSET scan. CursorPagination positions the cursor on the
+    first ordering field only, the cursor here holds the values of all the fields of the
+    keyset, e.g. ("created_date", "id"), and rows are filtered on the whole keyset. The
+    ordering requested by the client is ignored, since the cursor is only valid for the
+    keyset ordering.
+    """
+
+    def __init__(self, ordering: tuple[str, ...], page_size: int):
+        self.ordering = ordering
+        self.page_size = page_size
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(
+                *(order[1:] if order.startswith("-") else f"-{order}" for order in self.ordering)
+            )
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(queryset, current_position, reverse))
+
+        # one more row is fetched to know whether there is a following page
+        results = list(queryset[offset : offset + self.page_size + 1])
+        self.page = results[: self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_keyset_filter(self, queryset: QuerySet, position: str, reverse: bool) -> Q:
+        """
+        Returns the filter of the rows after the given position in the keyset ordering, or
+            before it for a reverse cursor, e.g. `a > x OR (a = x AND b > y)` for (a, b).
+        """
+
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError()
+            fields = [order.lstrip("-") for order in self.ordering]
+            values = [
+                queryset.model._meta.get_field(field).to_python(value)
+                for field, value in zip(fields, values)
+            ]
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        keyset_filter = Q()
+        # built from the last field, each field is compared when the previous ones are equal
+        for order, field, value in reversed(list(zip(self.ordering, fields, values))):
+            lookup = "lt" if reverse != order.startswith("-") else "gt"
+            after = Q(**{f"{field}__{lookup}": value})
+            keyset_filter = (
+                after | (Q(**{field: value}) & keyset_filter) if keyset_filter else after
+            )
+
+        return keyset_filter
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field = order.lstrip("-")
+            value = instance[field] if isinstance(instance, dict) else getattr(instance, field)
+            values.append(str(value))
+
+        return json.dumps(values)
 
 
 class CustomPagination(PageNumberPagination):
     """
     Custom pagination class that extends PageNumberPagination to allow dynamic page size.
+    Views that define a `cursor_ordering` keyset, e.g. ("created_date", "id"), are paginated
+    with a cursor when the `cursor` query parameter is given. With `count=estimated`, the
+    exact count query is replaced with the estimate of the query planner.
 
     Methods:
         get_page_size(request):
@@ -20,6 +149,10 @@ class CustomPagination(PageNumberPagination):
     """
 
     page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    estimated_count = "estimated"
+    max_cursor_page_size = 1000
 
     def get_page_size(self, request):
         page_size = 0
@@ -33,3 +166,106 @@ class CustomPagination(PageNumberPagination):
             pass
 
         return page_size if page_size > 0 else self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_pagination = None
+        self.is_count_estimated = False
+
+        cursor_ordering = getattr(view, "cursor_ordering", None)
+        if cursor_ordering and self.cursor_query_param in request.query_params:
+            self.cursor_pagination = KeysetPagination(
+                ordering=cursor_ordering,
+                page_size=min(self.get_page_size(request), self.max_cursor_page_size),
+            )
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+
+        if request.query_params.get(self.count_query_param) == self.estimated_count:
+            return self.paginate_queryset_estimated(queryset, request)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_queryset_estimated(self, queryset: QuerySet, request) -> list:
+        """
+        Paginates the queryset by page number without counting its rows. One more row than
+            the page size is fetched to know whether there is a next page.
+        """
+
+        page_size = self.get_page_size(request)
+        page_number = request.query_params.get(self.page_query_param, 1)
+        try:
+            self.page_number = int(page_number)
+            if self.page_number < 1:
+                raise ValueError()
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number))
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset : offset + min(page_size, sys.maxsize - 1) + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message.format(page_number=self.page_number))
+
+        # the count is at least the number of rows seen so far
+        lower_bound = offset + len(rows) + int(self.has_next)
+        self.count = max(estimate_count(queryset) or 0, lower_bound)
+        self.request = request
+        self.is_count_estimated = True
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_paginated_response(data)
+
+        if self.is_count_estimated:
+            return Response(
+                {
+                    "count": self.count,
+                    "count_estimated": True,
+                    "next": (
+                        self.get_estimated_link(self.page_number + 1) if self.has_next else None
+                    ),
+                    "previous": (
+                        self.get_estimated_link(self.page_number - 1)
+                        if self.page_number > 1
+                        else None
+                    ),
+                    "results": data,
+                }
+            )
+
+        return super().get_paginated_response(data)
+
+    def get_estimated_link(self, page_number: int) -> str:
+        """
+        Returns the link of the given page in the estimated count mode.
+        """
+
+        url = self.request.build_absolute_uri()
+        if page_number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, page_number)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to 'estimated' to skip counting the results exactly.",
+                "schema": {"type": "string", "enum": [self.estimated_count]},
+            }
+        )
+        if getattr(view, "cursor_ordering", None):
+            parameters.append(
+                {
+                    "name": self.cursor_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": "The pagination cursor value, "
+                    "pass it empty to get the first page by cursor.",
+                    "schema": {"type": "string"},
+                }
+            )
+        return parameters
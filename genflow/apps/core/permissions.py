@@ -13,6 +13,8 @@ class ProviderPermission(GenFLowBasePermission):
     Handles the permissions for provider-related actions.
     """
 
+    basename = "provider"
+
     class Scopes(StrEnum):
         """
         Defines the possible scopes of actions.
@@ -48,7 +50,7 @@ class ProviderPermission(GenFLowBasePermission):
         """
 
         permissions = []
-        if view.basename == "provider":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -93,6 +95,8 @@ class AIModelPermission(GenFLowBasePermission):
     Handles the permissions for model-related actions.
     """
 
+    basename = "model"
+
     class Scopes(StrEnum):
         """
         Defines the possible scopes of actions.
@@ -124,7 +128,7 @@ class AIModelPermission(GenFLowBasePermission):
         """
 
         permissions = []
-        if view.basename == "model":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -12,11 +12,13 @@ from rest_framework import serializers
 
 from genflow.apps.ai import ai_provider_factory
 from genflow.apps.ai.base.entities.provider import CommonAIProviderEntity
+from genflow.apps.ai.base.entities.shared import ModelType
 from genflow.apps.common.entities import ConfigurationEntity, FileEntity, TranslationEntity
 from genflow.apps.common.file_utils import create_media_symbolic_links
 from genflow.apps.common.security.encryptor import decrypt_token, encrypt_token
 from genflow.apps.common.storage import fs
 from genflow.apps.core.config.entities import AIProviderConfiguration, ModelWithProviderEntity
+from genflow.apps.core.config.model_resolver import ModelResolver
 from genflow.apps.core.config.provider_service import AIProviderConfigurationService
 from genflow.apps.core.models import CommonEntity, EntityGroup, Provider, ProviderModelConfig
 from genflow.apps.team.middleware import HttpRequestWithIamContext
@@ -274,28 +276,36 @@ class ProviderWriteSerializer(serializers.ModelSerializer):
         return serializer.data
 
 
+def get_model_resolver(context: dict) -> ModelResolver:
+    """
+    Returns the model resolver of the serializer context, creating it for the team of the
+        request on first use. Nested and list serializers share the context of their root,
+        so that the resolver is shared by all the instances serialized in a request.
+    """
+
+    model_resolver = context.get("model_resolver")
+    if model_resolver is None:
+        request = cast(HttpRequestWithIamContext, context.get("request"))
+        model_resolver = ModelResolver(request.iam_context.team)
+        context["model_resolver"] = model_resolver
+
+    return model_resolver
+
+
 def get_model(
-    request: HttpRequestWithIamContext, model_name: str, provider_name: str
+    context: dict, model_name: str, provider_name: str, model_type: ModelType = ModelType.LLM
 ) -> ModelWithProviderEntity:
     """
-    Returns the model entity for the given model name and provider name.
+    Returns the model entity for the given model name, provider name and model type.
     """
-    try:
-        db_provider = Provider.objects.get(
-            provider_name=provider_name,
-            is_valid=True,
-            team=request.iam_context.team,
-        )
-    except Provider.DoesNotExist:
+
+    model_resolver = get_model_resolver(context)
+    if model_resolver.get_db_provider(provider_name) is None:
         raise serializers.ValidationError(f"AI Provider {provider_name} not enabled")
 
-    model = AIProviderConfigurationService.get_model(
-        model_name=model_name,
-        provider_name=provider_name,
-        db_provider=db_provider,
-        enabled_only=True,
+    return model_resolver.get_model(
+        provider_name=provider_name, model_name=model_name, model_type=model_type
     )
-    return model
 
 
 class ProviderModelConfigReadSerializer(serializers.ModelSerializer):
@@ -309,7 +319,7 @@ class ProviderModelConfigReadSerializer(serializers.ModelSerializer):
         """
 
         return get_model(
-            request=self.context.get("request"),
+            context=self.context,
             model_name=instance.model_name,
             provider_name=instance.provider_name,
         )
@@ -321,7 +331,7 @@ class ProviderModelConfigReadSerializer(serializers.ModelSerializer):
         Retrieves the model parameter configurations for a given provider model instance.
         """
 
-        parameter_configs = AIProviderConfigurationService.get_model_parameter_configs(
+        parameter_configs = get_model_resolver(self.context).get_parameter_configs(
             provider_name=instance.provider_name,
             model_name=instance.model_name,
         )
@@ -387,9 +397,7 @@ class ProviderModelConfigWriteSerializer(serializers.ModelSerializer):
 
         # Retrieves the AI model using the provided `provider_name` and `model_name`.
         # Raises a `ValidationError` if the model is not found.
-        model = get_model(
-            request=self.context.get("request"), model_name=model_name, provider_name=provider_name
-        )
+        model = get_model(context=self.context, model_name=model_name, provider_name=provider_name)
         if not model:
             raise serializers.ValidationError(
                 f"AI Model {model_name} not found for provider {provider_name}"
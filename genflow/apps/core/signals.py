@@ -0,0 +1,15 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from genflow.apps.core.credentials_cache import credentials_cache
+from genflow.apps.core.models import Provider
+
+
+@receiver(post_save, sender=Provider)
+@receiver(post_delete, sender=Provider)
+def invalidate_credentials_on_provider_change(sender, instance, **kwargs):
+    credentials_cache.invalidate(instance.id)
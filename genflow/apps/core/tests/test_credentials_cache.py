@@ -0,0 +1,98 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import base64
+import shutil
+from os import path as osp
+from unittest.mock import Mock, patch
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from genflow.apps.common.security import rsa
+from genflow.apps.common.security.encryptor import decrypt_token
+from genflow.apps.common.security.keyring import Keyring, keyring
+from genflow.apps.core.credentials_cache import CredentialsCache
+
+
+class KeyringTest(SimpleTestCase):
+    TEAM_ID = "keyring"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.public_key = rsa.generate_key_pair(cls.TEAM_ID)
+
+    @classmethod
+    def tearDownClass(cls):
+        keyring.invalidate(cls.TEAM_ID)
+        shutil.rmtree(osp.join(settings.BASE_DIR, "keys", "teams", cls.TEAM_ID))
+        super().tearDownClass()
+
+    def test_decrypt_token(self):
+        keyring.invalidate(self.TEAM_ID)
+        token = base64.b64encode(rsa.encrypt("secret", self.public_key)).decode()
+
+        with patch(
+            "genflow.apps.common.security.keyring.rsa.get_decrypt_decoding",
+            wraps=rsa.get_decrypt_decoding,
+        ) as get_decrypt_decoding:
+            self.assertEqual(decrypt_token(self.TEAM_ID, token), "secret")
+            self.assertEqual(decrypt_token(self.TEAM_ID, token), "secret")
+
+        # the private key is parsed once
+        get_decrypt_decoding.assert_called_once_with(self.TEAM_ID)
+
+    def test_evict_least_recently_used(self):
+        keys = {"1": Mock(), "2": Mock(), "3": Mock()}
+        test_keyring = Keyring(max_entries=2)
+        with patch(
+            "genflow.apps.common.security.keyring.rsa.get_decrypt_decoding",
+            side_effect=keys.get,
+        ) as get_decrypt_decoding:
+            for team_id in keys:
+                self.assertIs(test_keyring.get_private_key(team_id), keys[team_id])
+            test_keyring.get_private_key("1")
+
+        self.assertEqual(get_decrypt_decoding.call_count, 4)
+
+
+class CredentialsCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.loader = Mock(return_value={"api_key": "secret", "timeout": 10})
+
+    def test_get(self):
+        cache = CredentialsCache(ttl=60, max_entries=10)
+
+        self.assertEqual(cache.get(1, "config", self.loader), {"api_key": "secret", "timeout": 10})
+        self.assertEqual(cache.get(1, "config", self.loader), {"api_key": "secret", "timeout": 10})
+        self.loader.assert_called_once()
+
+        # changed credentials are decrypted again
+        cache.get(1, "changed", self.loader)
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_get_expired(self):
+        cache = CredentialsCache(ttl=0, max_entries=10)
+
+        cache.get(1, "config", self.loader)
+        cache.get(1, "config", self.loader)
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_invalidate_zeroes_secrets(self):
+        cache = CredentialsCache(ttl=60, max_entries=10)
+        cache.get(1, "config", self.loader)
+        secret = cache._entries[1].credentials["api_key"]
+
+        cache.invalidate(1)
+        self.assertEqual(secret, bytearray(len("secret")))
+        cache.get(1, "config", self.loader)
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_evict_least_recently_used(self):
+        cache = CredentialsCache(ttl=60, max_entries=2)
+        for provider_id in range(3):
+            cache.get(provider_id, "config", self.loader)
+
+        self.assertEqual(list(cache._entries), [1, 2])
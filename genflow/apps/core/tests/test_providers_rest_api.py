@@ -3,6 +3,7 @@
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
 from http.client import HTTPResponse
+from unittest.mock import patch
 
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
@@ -287,3 +288,25 @@ class ProviderListTestCase(ProviderTestCase):
         _ = enable_provider(team=team, owner=user, data=self.data)
         response = self.list_provider(user, team_id=team.id)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_provider_without_decrypting_credentials(self):
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        provider = enable_provider(team=team, owner=user, data=self.data)
+        with patch("genflow.apps.core.models.decrypt_token") as decrypt_token:
+            response = self.list_provider(user, team_id=team.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"][0]["user_configuration"]["provider"], str(provider.id)
+        )
+        decrypt_token.assert_not_called()
+
+        # credentials are decrypted once, when accessed
+        provider.encrypted_config = '{"api_key": "encrypted"}'
+        user_provider_configuration = provider.user_provider_configuration
+        with patch(
+            "genflow.apps.core.models.decrypt_token", return_value="decrypted"
+        ) as decrypt_token:
+            self.assertEqual(user_provider_configuration.credentials, {"api_key": "decrypted"})
+            self.assertEqual(user_provider_configuration.credentials, {"api_key": "decrypted"})
+        decrypt_token.assert_called_once()
@@ -30,6 +30,7 @@ from genflow.apps.core.serializers import (
     ProviderReadSerializer,
     ProviderWriteSerializer,
 )
+from genflow.apps.restriction.mixin import AtomicLimitViewMixin
 from genflow.apps.team.middleware import HttpRequestWithIamContext
 
 
@@ -394,7 +395,7 @@ class AIModelViewSet(
         return model
 
 
-class EntityBaseViewSet(viewsets.ModelViewSet):
+class EntityBaseViewSet(AtomicLimitViewMixin, viewsets.ModelViewSet):
     """
     Base view set for managing entities. It provides common functionality.
     It must be inherited by other view sets that manage models that are
@@ -4,12 +4,13 @@
 
 from abc import ABCMeta, abstractmethod
 from enum import Enum
-from typing import Any, Dict, Optional, Sequence, TypeVar
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
 
 from django.conf import settings
 from django.db.models import Model
 from rest_framework.permissions import BasePermission
 
+from genflow.apps.team.membership_cache import membership_cache
 from genflow.apps.team.middleware import HttpRequestWithIamContext
 from genflow.apps.team.models import Membership, Team
 
@@ -19,6 +20,20 @@ class StrEnum(str, Enum):
         return self.value
 
 
+def get_request_cache(request) -> Dict[str, Any]:
+    """
+    Returns the IAM cache of the given request, shared by all the permission checks of
+        the request.
+    """
+
+    # DRF requests wrap the Django request, which is the one shared by the whole request
+    request = getattr(request, "_request", request)
+    cache = getattr(request, "_iam_cache", None)
+    if cache is None:
+        cache = request._iam_cache = {}
+    return cache
+
+
 def get_team(request: HttpRequestWithIamContext, obj):
     """
     Retrieve the team associated with the given object or request.
@@ -45,30 +60,40 @@ def get_team(request: HttpRequestWithIamContext, obj):
 
             raise exc
 
-        try:
-            return Team.objects.get(id=team_id)
-        except Team.DoesNotExist:
-            return None
+        team = request.iam_context.team
+        if team is not None and team.id == team_id:
+            return team
+
+        teams = get_request_cache(request).setdefault("teams", {})
+        if team_id not in teams:
+            teams[team_id] = Team.objects.filter(id=team_id).first()
+        return teams[team_id]
 
     return request.iam_context.team
 
 
-def get_membership(request, team):
+def get_membership_role(request, team) -> Optional[str]:
     """
-    Retrieve the active membership of a user in a given team.
+    Retrieve the role of the active membership of a user in a given team.
     """
 
-    if team is None:
+    if team is None or not request.user.is_authenticated:
         return None
 
-    return Membership.objects.filter(team=team, user=request.user, is_active=True).first()
+    return membership_cache.get_role(
+        team.id,
+        request.user.id,
+        lambda: Membership.objects.filter(team=team, user=request.user, is_active=True)
+        .values_list("role", flat=True)
+        .first(),
+    )
 
 
 def build_iam_context(
-    request: HttpRequestWithIamContext, team: Optional[Team], membership: Optional[Membership]
+    request: HttpRequestWithIamContext, team: Optional[Team], team_role: Optional[str]
 ):
     """
-    Builds the IAM context dictionary for a given request, team, and membership.
+    Builds the IAM context dictionary for a given request, team, and membership role.
 
     Returns:
         dict: A dictionary containing the IAM context with the following keys:
@@ -76,27 +101,31 @@ def build_iam_context(
             - 'group_name': The privilege group name from the IAM context in the request.
             - 'team_id': The ID of the team, or None if the team is not provided.
             - 'team_owner_id': The ID of the team owner, or None if the team is not provided.
-            - 'team_role': The role of the user in the team, or None if the membership is not provided.
+            - 'team_role': The role of the user in the team, or None if the user is not a member.
     """
 
     return {
         "user_id": request.user.id,
         "group_name": request.iam_context.privilege,
         "team_id": getattr(team, "id", None),
-        "team_owner_id": getattr(team.owner, "id", None) if team else None,
-        "team_role": getattr(membership, "role", None),
+        "team_owner_id": getattr(team, "owner_id", None),
+        "team_role": team_role,
     }
 
 
 def get_iam_context(request, obj) -> Dict[str, Any]:
     """
-    Generate the IAM context for a given request and object.
+    Generate the IAM context for a given request and object. The context is computed once
+        per team and request.
     """
 
     team = get_team(request, obj)
-    membership = get_membership(request, team)
+    contexts = get_request_cache(request).setdefault("contexts", {})
+    key = (request.user.id, getattr(team, "id", None))
+    if key not in contexts:
+        contexts[key] = build_iam_context(request, team, get_membership_role(request, team))
 
-    return build_iam_context(request, team, membership)
+    return dict(contexts[key])
 
 
 class GenFLowBasePermission(metaclass=ABCMeta):
@@ -112,6 +141,24 @@ class GenFLowBasePermission(metaclass=ABCMeta):
     scope: str
     obj: Optional[Any]
 
+    # basename of the views the permission applies to, None for all the views
+    basename: Optional[str] = None
+    # permission classes by basename, filled in when the classes are defined
+    registry: ClassVar[Dict[Optional[str], List[Type["GenFLowBasePermission"]]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if GenFLowBasePermission in cls.__bases__:
+            GenFLowBasePermission.registry.setdefault(cls.basename, []).append(cls)
+
+    @classmethod
+    def get_permission_classes(cls, basename: str) -> Tuple[Type["GenFLowBasePermission"], ...]:
+        """
+        Returns the permission classes that apply to the views of the given basename.
+        """
+
+        return (*cls.registry.get(basename, ()), *cls.registry.get(None, ()))
+
     @classmethod
     @abstractmethod
     def create(cls, request, view, obj, iam_context) -> Sequence["GenFLowBasePermission"]:
@@ -183,7 +230,8 @@ class PermissionEnforcer(BasePermission):
         """
         Checks if the request has the necessary permissions to access the object.
         Handles DRF's OPTIONS requests and public objects separately.
-        Iterates through all subclasses of GenFlowBasePermission to check access.
+        Iterates through the subclasses of GenFlowBasePermission registered for the view to
+            check access.
         """
 
         # DRF can send OPTIONS request. Internally it will try to get
@@ -194,8 +242,12 @@ class PermissionEnforcer(BasePermission):
         if self.is_metadata_request(request, view) or obj and is_public_obj(obj):
             return True
 
+        perm_classes = GenFLowBasePermission.get_permission_classes(view.basename)
+        if not perm_classes:
+            return True
+
         iam_context = get_iam_context(request, obj)
-        for perm_class in GenFLowBasePermission.__subclasses__():
+        for perm_class in perm_classes:
             for perm in perm_class.create(request, view, obj, iam_context):
                 result = perm.check_access()
                 if not result:
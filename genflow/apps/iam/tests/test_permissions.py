@@ -0,0 +1,45 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.utils.module_loading import autodiscover_modules
+
+from genflow.apps.core.permissions import ProviderPermission
+from genflow.apps.iam.permissions import GenFLowBasePermission
+from genflow.apps.session.permissions import SessionMessagePermission, SessionPermission
+
+
+class PermissionRegistryTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        autodiscover_modules("permissions")
+
+    def test_every_permission_class_registered(self):
+        registered = [
+            perm_class
+            for perm_classes in GenFLowBasePermission.registry.values()
+            for perm_class in perm_classes
+        ]
+        self.assertCountEqual(registered, GenFLowBasePermission.__subclasses__())
+
+    def test_get_permission_classes(self):
+        self.assertEqual(
+            GenFLowBasePermission.get_permission_classes("provider"), (ProviderPermission,)
+        )
+        self.assertEqual(
+            GenFLowBasePermission.get_permission_classes("session"), (SessionPermission,)
+        )
+        self.assertEqual(
+            GenFLowBasePermission.get_permission_classes("message"), (SessionMessagePermission,)
+        )
+        self.assertEqual(GenFLowBasePermission.get_permission_classes("user"), ())
+
+    def test_benchmark_permissions(self):
+        out = StringIO()
+        call_command("benchmark_permissions", number=1, stdout=out)
+        self.assertIn("dispatch table", out.getvalue())
@@ -11,7 +11,7 @@ class PromptConfig(AppConfig):
     def ready(self):
         from django.conf import settings
 
-        from genflow.apps.restriction.registry import register_limit
+        from genflow.apps.restriction.registry import register_counter, register_limit
 
         # Register limits for the prompt app
         register_limit(
@@ -24,5 +24,14 @@ class PromptConfig(AppConfig):
             "prompt", "PROMPT", "Max prompts", default=settings.GF_LIMITS.get("PROMPT", None)
         )
 
+        # Register the usage counted for the limits
+        register_counter(
+            "PROMPT_GROUP",
+            "core.EntityGroup",
+            {"user": "owner_id", "team": "team_id"},
+            filters={"entity_type": "prompt"},
+        )
+        register_counter("PROMPT", "prompt.Prompt", {"user": "owner_id", "team": "team_id"})
+
         # pylint: disable=unused-import
         from genflow.apps.prompt import signals
@@ -4,10 +4,9 @@
 
 from django.conf import settings
 
-from genflow.apps.core.models import EntityGroup
 from genflow.apps.core.permissions import EntityBasePermission, EntityGroupPermission
 from genflow.apps.iam.permissions import GenFLowBasePermission
-from genflow.apps.prompt.models import Prompt
+from genflow.apps.restriction.counters import get_usage
 from genflow.apps.restriction.mixin import LimitMixin
 from genflow.apps.team.models import TeamRole
 
@@ -17,6 +16,8 @@ class PromptGroupPermission(GenFLowBasePermission, EntityGroupPermission, LimitM
     Handles the permissions for prompt group-related actions.
     """
 
+    basename = "prompt-group"
+
     @staticmethod
     def get_scopes(request, view, obj):
         """
@@ -34,7 +35,7 @@ class PromptGroupPermission(GenFLowBasePermission, EntityGroupPermission, LimitM
         """
 
         permissions = []
-        if view.basename == "prompt-group":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -46,9 +47,7 @@ class PromptGroupPermission(GenFLowBasePermission, EntityGroupPermission, LimitM
         Get the number of prompt group owned by the user.
         """
 
-        return EntityGroup.objects.filter(
-            entity_type=Prompt.__name__.lower(), owner_id=self.user_id
-        ).count()
+        return get_usage("PROMPT_GROUP", "user", self.user_id)
 
     def get_team_usage(self) -> int:
         """
@@ -58,9 +57,7 @@ class PromptGroupPermission(GenFLowBasePermission, EntityGroupPermission, LimitM
         if self.team_id is None:
             return 0
 
-        return EntityGroup.objects.filter(
-            entity_type=Prompt.__name__.lower(), team_id=self.team_id
-        ).count()
+        return get_usage("PROMPT_GROUP", "team", self.team_id)
 
     def check_access(self) -> bool:
         """
@@ -98,6 +95,8 @@ class PromptPermission(GenFLowBasePermission, EntityBasePermission, LimitMixin):
     Handles the permissions for prompt-related actions.
     """
 
+    basename = "prompt"
+
     @staticmethod
     def get_scopes(request, view, obj):
         """
@@ -115,7 +114,7 @@ class PromptPermission(GenFLowBasePermission, EntityBasePermission, LimitMixin):
         """
 
         permissions = []
-        if view.basename == "prompt":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -127,7 +126,7 @@ class PromptPermission(GenFLowBasePermission, EntityBasePermission, LimitMixin):
         Get the number of prompt owned by the user.
         """
 
-        return Prompt.objects.filter(owner_id=self.user_id).count()
+        return get_usage("PROMPT", "user", self.user_id)
 
     def get_team_usage(self) -> int:
         """
@@ -137,7 +136,7 @@ class PromptPermission(GenFLowBasePermission, EntityBasePermission, LimitMixin):
         if self.team_id is None:
             return 0
 
-        return Prompt.objects.filter(team_id=self.team_id).count()
+        return get_usage("PROMPT", "team", self.team_id)
 
     def check_access(self) -> bool:
         """
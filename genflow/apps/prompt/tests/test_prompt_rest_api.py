@@ -3,10 +3,16 @@
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
 from http.client import HTTPResponse
+from unittest import mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from genflow.apps.ai.base.entities.shared import ModelType
+from genflow.apps.core.config.entities import AIProviderConfiguration
+from genflow.apps.core.models import ProviderModelConfig
 from genflow.apps.core.tests.utils import enable_provider
 from genflow.apps.prompt.tests.utils import (
     PROMPT_DATA,
@@ -116,6 +122,34 @@ class PromptCreateTestCase(PromptTestCase):
         response = self.create_prompt(user, data, team_id=team.id)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_create_prompt_user_embedding_model(self):
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        group = self.regular_users[0]["teams"][0]["group"]
+        _ = enable_provider(team=team, owner=user, data=PROVIDER_DATA)
+
+        get_provider_models = AIProviderConfiguration.get_provider_models
+
+        # the provider also supports text embedding models
+        def get_provider_models_with_embedding(configuration, model_type=None):
+            models = get_provider_models(configuration, model_type=model_type)
+            if model_type not in (None, ModelType.TEXT_EMBEDDING):
+                return models
+            embedding = get_provider_models(configuration, model_type=ModelType.LLM)[0]
+            embedding = embedding.model_copy(
+                update={"id": "embedding1", "type": ModelType.TEXT_EMBEDDING}
+            )
+            return [*models, embedding]
+
+        data = PROMPT_DATA.copy()
+        data["group_id"] = group.id
+        data["related_model"] = {**PROMPT_DATA["related_model"], "model_name": "embedding1"}
+        with mock.patch.object(
+            AIProviderConfiguration, "get_provider_models", get_provider_models_with_embedding
+        ):
+            response = self.create_prompt(user, data, team_id=team.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_create_prompt_user_forbidden(self):
         user = self.regular_users[0]["user"]
         # not team member
@@ -384,3 +418,28 @@ class PromptListTestCase(PromptTestCase):
         response = self.list_prompt(another_user, team_id=another_team.id)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["count"], 0)
+
+    def test_list_prompt_constant_queries(self):
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        _ = enable_provider(team=team, owner=user, data=PROVIDER_DATA)
+
+        def create_prompts(count: int):
+            data = PROMPT_DATA.copy()
+            for _ in range(count):
+                data["related_model"] = ProviderModelConfig.objects.create(
+                    **PROMPT_DATA["related_model"]
+                )
+                create_dummy_prompt(team=team, owner=user, data=data)
+
+        create_prompts(1)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.list_prompt(user, team_id=team.id)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][1]["related_model"]["entity"]["id"], "model2")
+
+        # the related models are resolved without querying the provider per prompt
+        create_prompts(5)
+        with self.assertNumQueries(len(queries)):
+            response = self.list_prompt(user, team_id=team.id)
+        self.assertEqual(response.data["count"], 7)
@@ -86,7 +86,7 @@ class PromptViewSet(EntityBaseViewSet):
     for managing Prompt objects..
     """
 
-    queryset = Prompt.objects.all().order_by("name")
+    queryset = Prompt.objects.select_related("related_model", "group").order_by("name")
     filterset_fields = EntityBaseViewSet.filterset_fields + ["prompt_type", "prompt_status"]
     ordering_fields = EntityBaseViewSet.ordering_fields + ["prompt_type", "prompt_status"]
 
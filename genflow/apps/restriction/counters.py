@@ -0,0 +1,104 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from typing import Callable, Tuple
+
+from django.db import models, transaction
+
+from genflow.apps.restriction.models import Counter
+from genflow.apps.restriction.registry import COUNTER_REGISTRY, get_counter_definition
+
+
+def init_counter(scope: str, scope_id: int, key: str, loader: Callable[[], int]) -> bool:
+    """
+    Creates the counter with the value returned by the loader, unless another transaction
+        created it meanwhile. Returns whether the counter was created.
+    """
+
+    _, created = Counter.objects.get_or_create(
+        scope=scope, scope_id=scope_id, key=key, defaults={"value": loader()}
+    )
+    return created
+
+
+def get_counter(
+    scope: str, scope_id: int, key: str, loader: Callable[[], int], lock: bool = False
+) -> int:
+    """
+    Returns the value of the counter, initialized with the loader if it does not exist.
+        In a transaction, the counter can be locked until the transaction updates it.
+    """
+
+    counters = Counter.objects.filter(scope=scope, scope_id=scope_id, key=key)
+    if lock and transaction.get_connection().in_atomic_block:
+        counters = counters.select_for_update()
+
+    value = counters.values_list("value", flat=True).first()
+    if value is None:
+        init_counter(scope, scope_id, key, loader)
+        value = counters.values_list("value", flat=True).get()
+    return value
+
+
+def add_counter(scope: str, scope_id: int, key: str, delta: int, loader: Callable[[], int]):
+    """
+    Adds the delta to the counter, in the transaction that creates or deletes the counted
+        object. A counter that does not exist is initialized with the loader instead, which
+        already counts the change.
+    """
+
+    counters = Counter.objects.filter(scope=scope, scope_id=scope_id, key=key)
+    if counters.update(value=models.F("value") + delta):
+        return
+
+    if not init_counter(scope, scope_id, key, loader):
+        counters.update(value=models.F("value") + delta)
+
+
+def get_usage(key: str, scope: str, scope_id: int, lock: bool = True) -> int:
+    """
+    Returns the usage counted for the limit key in the given scope.
+    """
+
+    definition = get_counter_definition(key)
+    return get_counter(
+        scope, scope_id, key, loader=lambda: definition.count(scope, scope_id), lock=lock
+    )
+
+
+@transaction.atomic
+def reconcile_counters() -> Tuple[int, int]:
+    """
+    Recomputes the counters of the registered counter definitions from the counted objects.
+        Counters that are zero or not registered, e.g. the file counters, are deleted and
+        initialized again when they are used. Returns the numbers of updated and deleted
+        counters.
+    """
+
+    values = {}
+    for definitions in COUNTER_REGISTRY.values():
+        for definition in definitions:
+            for scope, lookup in definition.scopes.items():
+                rows = (
+                    definition.get_queryset()
+                    .values(lookup)
+                    .annotate(value=models.Count("pk"))
+                    .order_by()
+                )
+                for row in rows:
+                    values[(scope, row[lookup], definition.key)] = row["value"]
+
+    updated = []
+    deleted = []
+    for counter in Counter.objects.all().iterator():
+        value = values.get((counter.scope, counter.scope_id, counter.key), 0)
+        if not value:
+            deleted.append(counter.pk)
+        elif value != counter.value:
+            counter.value = value
+            updated.append(counter)
+
+    Counter.objects.bulk_update(updated, ["value"], batch_size=1000)
+    Counter.objects.filter(pk__in=deleted).delete()
+    return len(updated), len(deleted)
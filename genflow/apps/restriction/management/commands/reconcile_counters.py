@@ -0,0 +1,17 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from django.core.management.base import BaseCommand
+
+from genflow.apps.restriction.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recomputes the usage counters of the limits from the counted objects."
+
+    def handle(self, *args, **options):
+        updated, deleted = reconcile_counters()
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated {updated} usage counters, deleted {deleted}")
+        )
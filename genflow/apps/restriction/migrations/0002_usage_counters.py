@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-18 06:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restriction", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("scope", models.CharField(max_length=32)),
+                ("scope_id", models.BigIntegerField()),
+                ("key", models.CharField(max_length=255)),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Counter",
+                "verbose_name_plural": "Counters",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("scope", "scope_id", "key"), name="unique_counter"
+                    )
+                ],
+            },
+        ),
+    ]
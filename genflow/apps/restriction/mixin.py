@@ -4,6 +4,8 @@
 
 from abc import ABCMeta, abstractmethod
 
+from django.db import transaction
+
 from genflow.apps.restriction.models import Limit
 
 
@@ -85,3 +87,21 @@ class LimitMixin(UserLimitMixin, TeamLimitMixin, metaclass=ABCMeta):
         if user_limit or team_limit:
             return True
         return False
+
+
+class AtomicLimitViewMixin:
+    """
+    Mixin to run the requests of the view actions guarded by limits in a transaction, so that
+    the usage counters read by the limit checks stay locked until the request updates them.
+    It must precede the DRF view class in the bases.
+    """
+
+    limited_actions = ("create",)
+
+    def dispatch(self, request, *args, **kwargs):
+        action = getattr(self, "action_map", {}).get(request.method.lower())
+        if action not in self.limited_actions:
+            return super().dispatch(request, *args, **kwargs)
+
+        with transaction.atomic():
+            return super().dispatch(request, *args, **kwargs)
@@ -34,3 +34,25 @@ class Limit(TimeAuditModel):
     def __str__(self):
         target = self.user or self.team or "Global"
         return f"{self.key} ({target}): {self.value}"
+
+
+class Counter(models.Model):
+    """
+    Model to keep the usage counted by a limit, e.g. the sessions of a team, updated in the
+    transactions that create and delete the counted objects.
+    """
+
+    scope = models.CharField(max_length=32)
+    scope_id = models.BigIntegerField()
+    key = models.CharField(max_length=255)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "scope_id", "key"], name="unique_counter"),
+        ]
+        verbose_name = "Counter"
+        verbose_name_plural = "Counters"
+
+    def __str__(self):
+        return f"{self.key} ({self.scope} {self.scope_id}): {self.value}"
@@ -2,8 +2,11 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
-from typing import Optional
+from operator import attrgetter
+from typing import Any, Dict, List, Optional
 
+from django.apps import apps
+from django.db.models import Model, QuerySet
 from pydantic import BaseModel
 
 
@@ -42,3 +45,79 @@ def get_limit_description(key):
             if limit.key == key:
                 return limit.description
     return None
+
+
+class CounterDefinition(BaseModel):
+    """
+    Represents the usage counted for a limit key, as the number of objects of a model per
+        scope, e.g. {"user": "owner_id", "team": "team_id"}.
+    """
+
+    key: str
+    model: str
+    scopes: Dict[str, str]
+    filters: Dict[str, Any] = {}
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Returns the counted objects.
+        """
+
+        return apps.get_model(self.model)._default_manager.filter(**self.filters)
+
+    def count(self, scope: str, scope_id: int) -> int:
+        """
+        Counts the objects of the given scope.
+        """
+
+        return self.get_queryset().filter(**{self.scopes[scope]: scope_id}).count()
+
+    def is_counted(self, instance: Model) -> bool:
+        """
+        Returns whether the given object is counted.
+        """
+
+        return all(getattr(instance, name) == value for name, value in self.filters.items())
+
+    def get_scope_ids(self, instance: Model) -> Dict[str, Optional[int]]:
+        """
+        Returns the ids of the scopes of the given object.
+        """
+
+        return {
+            scope: attrgetter(lookup.replace("__", "."))(instance)
+            for scope, lookup in self.scopes.items()
+        }
+
+
+COUNTER_REGISTRY: Dict[str, List[CounterDefinition]] = {}
+
+
+def register_counter(key, model, scopes, filters=None):
+    """
+    Register the usage counted for a limit key, and keep it updated on the creation and
+        deletion of the objects of the model.
+    """
+
+    from django.db.models.signals import post_delete, post_save
+
+    from genflow.apps.restriction.signals import decrement_counters, increment_counters
+
+    definition = CounterDefinition(key=key, model=model, scopes=scopes, filters=filters or {})
+    if model not in COUNTER_REGISTRY:
+        COUNTER_REGISTRY[model] = []
+        post_save.connect(increment_counters, sender=model, dispatch_uid=f"counters_{model}")
+        post_delete.connect(decrement_counters, sender=model, dispatch_uid=f"counters_{model}")
+    COUNTER_REGISTRY[model].append(definition)
+
+
+def get_counter_definition(key: str) -> Optional[CounterDefinition]:
+    """
+    Retrieve the counter definition of a given limit key from the registry.
+    """
+
+    for definitions in COUNTER_REGISTRY.values():
+        for definition in definitions:
+            if definition.key == key:
+                return definition
+    return None
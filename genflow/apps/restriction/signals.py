@@ -2,9 +2,14 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
+from functools import partial
 
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+
+from genflow.apps.restriction.counters import add_counter
 from genflow.apps.restriction.models import Limit
-from genflow.apps.restriction.registry import LIMIT_REGISTRY, LimitDefinition
+from genflow.apps.restriction.registry import COUNTER_REGISTRY, LIMIT_REGISTRY, LimitDefinition
 
 
 def add_global_limits(app_name: str):
@@ -19,3 +24,40 @@ def add_global_limits(app_name: str):
                 key=limit.key,
                 value=limit.default,
             )
+
+
+@transaction.atomic
+def update_counters(sender, instance, delta: int):
+    """
+    Adds the delta to the counters of the given object, in the transaction of its creation
+        or deletion.
+    """
+
+    for definition in COUNTER_REGISTRY.get(sender._meta.label, []):
+        if not definition.is_counted(instance):
+            continue
+
+        try:
+            scope_ids = definition.get_scope_ids(instance)
+        except ObjectDoesNotExist:
+            # the related object is deleted already, the counters are reconciled later
+            continue
+
+        for scope, scope_id in scope_ids.items():
+            if scope_id is not None:
+                add_counter(
+                    scope,
+                    scope_id,
+                    definition.key,
+                    delta,
+                    loader=partial(definition.count, scope, scope_id),
+                )
+
+
+def increment_counters(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        update_counters(sender, instance, 1)
+
+
+def decrement_counters(sender, instance, **kwargs):
+    update_counters(sender, instance, -1)
@@ -0,0 +1,75 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import copy
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from genflow.apps.restriction.counters import get_usage
+from genflow.apps.restriction.models import Counter
+from genflow.apps.session.models import Session, SessionMessage
+from genflow.apps.session.tests.utils import (
+    SESSION_DATA,
+    SESSION_MESSAGE_DATA,
+    create_dummy_session,
+    create_dummy_session_message,
+)
+from genflow.apps.team.tests.utils import create_dummy_users
+
+
+class CounterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user, cls.regular_users = create_dummy_users(create_teams=True)
+        cls.user = cls.regular_users[0]["user"]
+        cls.team = cls.regular_users[0]["teams"][0]["team"]
+
+    def create_session(self) -> Session:
+        return create_dummy_session(self.team, self.user, copy.deepcopy(SESSION_DATA))
+
+    def test_counters_initialized_from_objects(self):
+        self.create_session()
+        self.create_session()
+        Counter.objects.all().delete()
+
+        self.assertEqual(get_usage("SESSION", "team", self.team.id), 2)
+        self.assertEqual(
+            get_usage("SESSION", "user", self.user.id),
+            Session.objects.filter(owner=self.user).count(),
+        )
+        self.assertTrue(
+            Counter.objects.filter(scope="team", scope_id=self.team.id, key="SESSION").exists()
+        )
+
+    def test_counters_updated_on_create_and_delete(self):
+        session = self.create_session()
+        for data in SESSION_MESSAGE_DATA:
+            create_dummy_session_message(self.team, self.user, session, data)
+        self.assertEqual(get_usage("MESSAGE", "session", session.id), 2)
+
+        second_session = self.create_session()
+        self.assertEqual(get_usage("SESSION", "team", self.team.id), 2)
+
+        second_session.delete()
+        SessionMessage.objects.filter(session=session).first().delete()
+        self.assertEqual(get_usage("SESSION", "team", self.team.id), 1)
+        self.assertEqual(get_usage("MESSAGE", "session", session.id), 1)
+
+    def test_reconcile_counters(self):
+        session = self.create_session()
+        self.assertEqual(get_usage("SESSION", "team", self.team.id), 1)
+        # drift by changes that bypass the signals
+        Session.objects.filter(id=session.id).update(team=self.regular_users[1]["teams"][0]["team"])
+        Counter.objects.create(scope="session", scope_id=session.id, key="MAX_FILES_PER_SESSION")
+
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        self.assertIn("usage counters", out.getvalue())
+        self.assertFalse(
+            Counter.objects.filter(scope="team", scope_id=self.team.id, key="SESSION").exists()
+        )
+        self.assertFalse(Counter.objects.filter(key="MAX_FILES_PER_SESSION").exists())
+        self.assertEqual(get_usage("SESSION", "team", self.team.id), 0)
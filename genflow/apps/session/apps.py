@@ -11,7 +11,7 @@ class SessionConfig(AppConfig):
     def ready(self):
         from django.conf import settings
 
-        from genflow.apps.restriction.registry import register_limit
+        from genflow.apps.restriction.registry import register_counter, register_limit
 
         # Register limits for the session app
         register_limit(
@@ -30,5 +30,13 @@ class SessionConfig(AppConfig):
             default=settings.GF_LIMITS.get("MAX_FILES_PER_SESSION", None),
         )
 
+        # Register the usage counted for the limits
+        register_counter("SESSION", "session.Session", {"user": "owner_id", "team": "team_id"})
+        register_counter(
+            "MESSAGE",
+            "session.SessionMessage",
+            {"user": "owner_id", "team": "team_id", "session": "session_id"},
+        )
+
         # pylint: disable=unused-import
         from genflow.apps.session import signals
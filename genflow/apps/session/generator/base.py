@@ -2,15 +2,17 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
-from typing import Callable, Generator, List, Optional, Union
+from typing import Any, AsyncGenerator, Callable, Generator, Optional, Union
 
 from genflow.apps.ai.base.entities.model import PropertyKey
-from genflow.apps.ai.llm.entities import Result, Usage
-from genflow.apps.ai.llm.messages import AssistantMessage, Message
+from genflow.apps.ai.llm.entities import Result
+from genflow.apps.ai.llm.messages import Message, SystemMessage
+from genflow.apps.ai.llm.stream import StreamAccumulator
 from genflow.apps.core.config.llm_model_bundle import LLMModelBundle
 from genflow.apps.prompt.models import PromptType
-from genflow.apps.session.models import Session
+from genflow.apps.session.models import Session, SessionMessage
 from genflow.apps.session.transform.base import PromptTemplateEntity
+from genflow.apps.session.transform.plan import PromptPlan
 from genflow.apps.session.transform.simple import SimplePromptTransform
 
 
@@ -28,46 +30,38 @@ class BaseGenerator:
         self.db_session = db_session
         self.llm_model_bundle = llm_model_bundle
 
+    # pylint: disable=too-many-positional-arguments
     def get_precalculate_rest_tokens(
         self,
         prompt_template_entity: PromptTemplateEntity,
         files: Optional[str] = None,
         query: Optional[str] = None,
+        prompt_plan: Optional[PromptPlan] = None,
     ) -> int:
         """
         Calculates the remaining tokens available for the model after accounting for the prompt
-            and maximum token limits. Raises an exception if the prompt or query exceeds the token limit
+            and maximum token limits. Raises an exception if the prompt or query exceeds the token limit.
+            The prompt tokens are taken from the given prompt plan, if any.
         """
 
         model_context_tokens = self.llm_model_bundle.model_schema.properties.get(
             PropertyKey.CONTEXT_SIZE
         )
 
-        max_tokens = 0
-        for parameter_config in self.llm_model_bundle.model_schema.parameter_configs:
-            if parameter_config.name == "max_tokens" or (
-                parameter_config.use_template and parameter_config.use_template == "max_tokens"
-            ):
-                max_tokens = (
-                    self.llm_model_bundle.parameters.get(parameter_config.name)
-                    or self.llm_model_bundle.parameters.get(parameter_config.use_template)
-                ) or 0
-
         if model_context_tokens is None:
             return -1
 
-        if max_tokens is None:
-            max_tokens = 0
-
-        # get messages without memory and context
-        input_messages, _ = self.organize_input_messages(
-            prompt_template_entity=prompt_template_entity,
-            files=files,
-            query=query,
-            memory=False,
-        )
+        max_tokens = self.llm_model_bundle.get_max_tokens()
 
-        prompt_tokens = self.llm_model_bundle.get_tokens_count(input_messages)
+        # get tokens without memory and context
+        if prompt_plan is None:
+            prompt_plan = self.create_prompt_plan(
+                prompt_template_entity=prompt_template_entity,
+                files=files,
+                query=query,
+                memory=False,
+            )
+        prompt_tokens = prompt_plan.get_prompt_tokens_without_memory()
 
         remaining_tokens = model_context_tokens - max_tokens - prompt_tokens
         if remaining_tokens < 0:
@@ -78,10 +72,13 @@ class BaseGenerator:
 
         return remaining_tokens
 
-    def recalculate_max_tokens(self, input_messages: list[Message]):
+    def recalculate_max_tokens(
+        self, input_messages: list[Message], prompt_tokens: Optional[int] = None
+    ):
         """
         Recalculates the maximum tokens allowed if the sum of prompt tokens and max tokens exceeds
-            the model's token limit. Updates the model parameters accordingly.'
+            the model's token limit. Updates the model parameters accordingly. The tokens of the
+            input messages are counted unless given as prompt_tokens.
         """
 
         # recalculate max_tokens if sum(prompt_token + max_tokens) over model token limit
@@ -89,50 +86,54 @@ class BaseGenerator:
             PropertyKey.CONTEXT_SIZE
         )
 
-        max_tokens = 0
-        for parameter_config in self.llm_model_bundle.model_schema.parameter_configs:
-            if parameter_config.name == "max_tokens" or (
-                parameter_config.use_template and parameter_config.use_template == "max_tokens"
-            ):
-                max_tokens = (
-                    self.llm_model_bundle.parameters.get(parameter_config.name)
-                    or self.llm_model_bundle.parameters.get(parameter_config.use_template)
-                ) or 0
-
         if model_context_tokens is None:
             return -1
 
-        if max_tokens is None:
-            max_tokens = 0
+        max_tokens = self.llm_model_bundle.get_max_tokens()
 
-        prompt_tokens = self.llm_model_bundle.get_tokens_count(input_messages)
+        if prompt_tokens is None:
+            prompt_tokens = self.llm_model_bundle.get_tokens_count(input_messages)
 
         if prompt_tokens + max_tokens > model_context_tokens:
             max_tokens = max(model_context_tokens - prompt_tokens, 16)
 
-            for parameter_config in self.llm_model_bundle.model_schema.parameter_configs:
-                if parameter_config.name == "max_tokens" or (
-                    parameter_config.use_template and parameter_config.use_template == "max_tokens"
-                ):
-                    self.llm_model_bundle.parameters[parameter_config.name] = max_tokens
+            for parameter_config in self.llm_model_bundle.get_model_index().max_tokens_parameters:
+                self.llm_model_bundle.parameters[parameter_config.name] = max_tokens
 
-    # pylint: disable=too-many-positional-arguments
-    def organize_input_messages(
+    def count_message_tokens(self, query: str, answer: Optional[str]) -> dict[str, Any]:
+        """
+        Counts the tokens of a query and its answer, to be stored with the session message
+            and reused when the message is part of the chat history.
+        """
+
+        return SessionMessage.count_tokens(
+            model_collection=self.llm_model_bundle.model_collection_instance,
+            model=self.llm_model_bundle.model_schema.id,
+            query=query,
+            answer=answer,
+        )
+
+    def count_context_tokens(self, context: str) -> int:
+        """
+        Counts the tokens the given context adds to the content of a system message.
+        """
+
+        return self.llm_model_bundle.get_message_tokens_count(
+            SystemMessage(content=context)
+        ) - self.llm_model_bundle.get_message_tokens_count(SystemMessage(content=""))
+
+    def create_prompt_plan(
         self,
         prompt_template_entity: PromptTemplateEntity,
         query: Optional[str] = None,
-        context: Optional[str | List[str]] = None,
         files: Optional[str] = None,
         memory: bool = False,
-    ) -> tuple[list[Message], Optional[List[str]]]:
+    ) -> PromptPlan:
         """
-        Organizes input messages based on the provided prompt template, files, query,
-            context, and memory. Returns the generated input messages and stop tokens.
+        Creates the plan to assemble the input messages of a request based on the provided
+            prompt template, query, files and memory.
         """
 
-        if context is not None and isinstance(context, list):
-            context = " ".join([item.text for item in context])
-
         if (
             prompt_template_entity is None
             or prompt_template_entity.prompt_type == PromptType.SIMPLE
@@ -141,17 +142,15 @@ class BaseGenerator:
                 db_session=self.db_session,
                 llm_model_bundle=self.llm_model_bundle,
             )
-            input_messages, stop = prompt_transform.get_prompt(
+            return PromptPlan(
+                prompt_transform=prompt_transform,
                 prompt_template_entity=prompt_template_entity,
-                context=context,
                 query=query,
                 files=files,
                 memory=memory,
             )
-        else:
-            raise NotImplementedError("Advanced prompt template is not implemented yet.")
 
-        return input_messages, stop
+        raise NotImplementedError("Advanced prompt template is not implemented yet.")
 
     def _handle_model_response(
         self,
@@ -185,29 +184,11 @@ class BaseGenerator:
             of the response. Returns the final result containing the model, messages, and usage details.
         """
 
-        model = None
-        messages = []
-        text = ""
-        usage = None
-        for result in response:
-            callback(chunk=result.delta.message.content)
-
-            text += result.delta.message.content
+        accumulator = StreamAccumulator()
+        for item in response:
+            callback(chunk=accumulator.add(item))
 
-            if not model:
-                model = result.model
-
-            if not messages:
-                messages = result.messages
-
-            if result.delta.usage:
-                usage = result.delta.usage
-        if not usage:
-            usage = Usage.empty_usage()
-
-        return Result(
-            model=model, messages=messages, message=AssistantMessage(content=text), usage=usage
-        )
+        return accumulator.to_result()
 
     def _handle_model_response_stream(
         self, response: Union[Result, Generator]
@@ -217,26 +198,30 @@ class BaseGenerator:
             of the response. Returns the final result containing the model, messages, and usage details.
         """
 
-        model = None
-        messages = []
-        text = ""
-        usage = None
-        for result in response:
-            yield result.delta.message.content
+        accumulator = StreamAccumulator()
+        for item in response:
+            yield accumulator.add(item)
 
-            text += result.delta.message.content
+        yield accumulator.to_result()
 
-            if not model:
-                model = result.model
+    async def _ahandle_model_response(
+        self, response: Union[Result, AsyncGenerator]
+    ) -> AsyncGenerator:
+        """
+        Processes the model response of an async call, yielding each chunk of a stream response
+            followed by the final result containing the model, messages, and usage details.
+        """
 
-            if not messages:
-                messages = result.messages
+        if isinstance(response, Result):
+            yield response
+            return
 
-            if result.delta.usage:
-                usage = result.delta.usage
-        if not usage:
-            usage = Usage.empty_usage()
+        accumulator = StreamAccumulator()
+        try:
+            async for item in response:
+                yield accumulator.add(item)
+        finally:
+            # closes the model stream as well when the consumer stops early
+            await response.aclose()
 
-        yield Result(
-            model=model, messages=messages, message=AssistantMessage(content=text), usage=usage
-        )
+        yield accumulator.to_result()
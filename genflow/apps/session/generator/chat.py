@@ -2,12 +2,21 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
+from typing import Any, AsyncGenerator, Mapping, Optional
+
+from channels.db import database_sync_to_async
+from django.conf import settings
 from django.db.models.query import QuerySet
 
+from genflow.apps.ai.base.entities.shared import ModelType
 from genflow.apps.ai.llm.entities import Result
+from genflow.apps.ai.llm.messages import Message
+from genflow.apps.assistant.context_cache import files_context_cache
 from genflow.apps.assistant.models import Assistant, AssistantContextSource
+from genflow.apps.assistant.vector_store import vector_collection_store
 from genflow.apps.core.config.llm_model_bundle import LLMModelBundle
 from genflow.apps.core.config.provider_service import AIProviderConfigurationService
+from genflow.apps.core.config.text_embedding_model_bundle import TextEmbeddingModelBundle
 from genflow.apps.core.models import Provider
 from genflow.apps.prompt.models import Prompt, PromptType
 from genflow.apps.session.generator.base import BaseGenerator
@@ -29,11 +38,7 @@ class ChatGenerator(BaseGenerator):
         Initializes the ChatGenerator with the given queryset, database session, and
             optional streaming configuration.
         """
-        related_model = db_session.related_model
-        if db_session.session_type == SessionType.PROMPT.value:
-            related_model = db_session.related_prompt.related_model
-        if db_session.session_type == SessionType.ASSISTANT.value:
-            related_model = db_session.related_assistant.related_model
+        related_model = db_session.get_model_config()
 
         model_collection_bundle = AIProviderConfigurationService.get_model_collection_bundle(
             related_model.provider_name,
@@ -50,6 +55,7 @@ class ChatGenerator(BaseGenerator):
             credentials=model_collection_bundle.configuration.user_configuration.provider.credentials,
         )
         super().__init__(db_session=db_session, llm_model_bundle=llm_model_bundle)
+        self.queryset = queryset
 
         prompt_entity = None
         if db_session.session_type == SessionType.PROMPT.value:
@@ -78,6 +84,58 @@ class ChatGenerator(BaseGenerator):
             optional files, and parameters.
         """
 
+        input_messages, stop, stream = self.prepare_input_messages(generate_request)
+
+        # call model
+        response = self.llm_model_bundle.call(
+            messages=input_messages,
+            parameters=self._get_request_parameters(generate_request),
+            stop=stop,
+            stream=stream,
+            user=generate_request.user_id,
+        )
+
+        # handle response
+        result = self._handle_model_response(
+            response=response,
+            callback=generate_request.callback,
+            stream=stream,
+        )
+
+        return result
+
+    async def agenerate(self, generate_request: GenerateRequest) -> AsyncGenerator:
+        """
+        Generates a response without blocking the event loop, yielding the chunks of the
+            answer followed by the final result. Only preparing the input messages, which
+            reads the database and files, runs in a worker thread.
+        """
+
+        input_messages, stop, stream = await database_sync_to_async(self.prepare_input_messages)(
+            generate_request
+        )
+
+        # call model
+        response = await self.llm_model_bundle.acall(
+            messages=input_messages,
+            parameters=self._get_request_parameters(generate_request),
+            stop=stop,
+            stream=stream,
+            user=generate_request.user_id,
+        )
+
+        # handle response
+        async for item in self._ahandle_model_response(response=response):
+            yield item
+
+    def prepare_input_messages(
+        self, generate_request: GenerateRequest
+    ) -> tuple[list[Message], Optional[list[str]], bool]:
+        """
+        Builds the input messages of the request, including the prompt template, chat history,
+            files and context. Returns the input messages, stop tokens and whether to stream.
+        """
+
         query = generate_request.query
         files = generate_request.files
         stream = (
@@ -91,19 +149,21 @@ class ChatGenerator(BaseGenerator):
         if files is not None and len(files) > 0:
             files = self.db_session.load_user_files(files)
 
-        # Include: prompt template, query(optional), files(optional)
-        # Not Include: memory
-        self.get_precalculate_rest_tokens(
+        # the input messages and their tokens are built once and shared by the checks below
+        prompt_plan = self.create_prompt_plan(
             prompt_template_entity=self.generate_entity.prompt_entity,
             files=files,
             query=query,
+            memory=use_memory,
         )
 
-        input_messages, stop = self.organize_input_messages(
+        # Include: prompt template, query(optional), files(optional)
+        # Not Include: memory
+        self.get_precalculate_rest_tokens(
             prompt_template_entity=self.generate_entity.prompt_entity,
             files=files,
             query=query,
-            memory=use_memory,
+            prompt_plan=prompt_plan,
         )
 
         # set session name if this is the first message
@@ -118,42 +178,110 @@ class ChatGenerator(BaseGenerator):
 
         # get context
         context = None
+        context_tokens = None
         if self.db_session.session_type == SessionType.ASSISTANT.value:
             assistant: Assistant = self.db_session.related_assistant
             if assistant.context_source == AssistantContextSource.FILES.value:
-                context = assistant.get_files_context()
+                context, context_tokens = self.get_files_context(assistant, query)
             elif assistant.context_source == AssistantContextSource.COLLECTIONS.value:
-                context = ""
+                context = self.get_collections_context(
+                    assistant, query, user=generate_request.user_id
+                )
 
-        input_messages, stop = self.organize_input_messages(
-            prompt_template_entity=self.generate_entity.prompt_entity,
-            files=files,
-            query=query,
-            context=context,
-            memory=use_memory,
+        input_messages, stop = prompt_plan.get_messages(
+            context=context, context_tokens=context_tokens
         )
 
         # Re-calculate the max tokens if sum(prompt_token +  max_tokens) over model token limit
-        self.recalculate_max_tokens(input_messages=input_messages)
+        self.recalculate_max_tokens(
+            input_messages=input_messages, prompt_tokens=prompt_plan.prompt_tokens
+        )
 
-        # call model
-        response = self.llm_model_bundle.call(
-            messages=input_messages,
-            parameters=(
-                self.generate_entity.llm_model_bundle.parameters
-                if generate_request.parameters is None
-                else generate_request.parameters
-            ),
-            stop=stop,
-            stream=stream,
-            user=generate_request.user_id,
+        return input_messages, stop, stream
+
+    def get_files_context(
+        self, assistant: Assistant, query: Optional[str]
+    ) -> tuple[str, Optional[int]]:
+        """
+        Returns the context from the files of the assistant and its tokens, if known.
+            With files retrieval, only the chunks best matching the query within the
+            token budget are used, otherwise the whole files context.
+        """
+
+        if assistant.files_retrieval and query:
+            config = settings.GF_FILES_RETRIEVAL
+            chunks = assistant.get_files_index().select(
+                query=query,
+                top_k=config["TOP_K"],
+                token_budget=config["TOKEN_BUDGET"],
+                count=self.count_context_tokens,
+            )
+            return "\n\n".join(chunks), None
+
+        files_context = assistant.get_cached_files_context()
+        context_tokens = files_context_cache.get_tokens_count(
+            assistant_id=assistant.id,
+            files_context=files_context,
+            tokenizer_name=self.llm_model_bundle.get_tokenizer_name(),
+            count=self.count_context_tokens,
         )
+        return files_context.text, context_tokens
 
-        # handle response
-        result = self._handle_model_response(
-            response=response,
-            callback=generate_request.callback,
-            stream=stream,
+    def get_collections_context(
+        self, assistant: Assistant, query: Optional[str], user: Optional[str] = None
+    ) -> str:
+        """
+        Returns the context from the team collections of the assistant, the chunks most
+            similar to the query within the token budget.
+        """
+
+        names = assistant.collection_names
+        embedding_model = assistant.embedding_model
+        if not query or not names or not embedding_model:
+            return ""
+
+        model_collection_bundle = AIProviderConfigurationService.get_model_collection_bundle(
+            embedding_model["provider_name"],
+            queryset=self.queryset,
+            model_type=ModelType.TEXT_EMBEDDING.value,
         )
+        model_schema = model_collection_bundle.model_collection_instance.get_model_schema(
+            model_name=embedding_model["model_name"]
+        )
+        if model_schema is None:
+            raise ValueError(
+                f"Text embedding model {embedding_model['model_name']} of the assistant not "
+                f"found for provider {embedding_model['provider_name']}"
+            )
 
-        return result
+        text_embedding_model_bundle = TextEmbeddingModelBundle(
+            configuration=model_collection_bundle.configuration,
+            ai_provider_instance=model_collection_bundle.ai_provider_instance,
+            model_collection_instance=model_collection_bundle.model_collection_instance,
+            model_schema=model_schema,
+            credentials=model_collection_bundle.configuration.user_configuration.provider.credentials,
+        )
+        result = text_embedding_model_bundle.embed([query], user=user)
+
+        config = settings.GF_VECTOR_COLLECTIONS
+        token_budget = config["TOKEN_BUDGET"]
+        chunks = []
+        for match in vector_collection_store.search(
+            assistant.team_id, names, result.embeddings[0], k=config["TOP_K"]
+        ):
+            tokens = self.count_context_tokens(match.text)
+            if tokens <= token_budget:
+                chunks.append(match.text)
+                token_budget -= tokens
+
+        return "\n\n".join(chunks)
+
+    def _get_request_parameters(self, generate_request: GenerateRequest) -> Mapping[str, Any]:
+        """
+        Returns the model parameters of the request, defaulting to the session parameters.
+        """
+
+        if generate_request.parameters is None:
+            return self.generate_entity.llm_model_bundle.parameters
+
+        return generate_request.parameters
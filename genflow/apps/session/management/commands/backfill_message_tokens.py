@@ -0,0 +1,103 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from typing import cast
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from genflow.apps.ai import ai_provider_factory
+from genflow.apps.ai.base.entities.shared import ModelType
+from genflow.apps.ai.llm.llm_model_collection import LLMModelCollection
+from genflow.apps.session.models import Session, SessionMessage
+
+
+class Command(BaseCommand):
+    help = "Stores the token counts of session messages that have none or were counted with another tokenizer."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--session",
+            type=int,
+            action="append",
+            dest="sessions",
+            help="Only backfill messages of the given session, can be repeated.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of messages to update per query.",
+        )
+
+    def handle(self, *args, **options):
+        sessions = Session.objects.filter(sessionmessage__isnull=False).distinct().order_by("id")
+        if options["sessions"]:
+            sessions = sessions.filter(id__in=options["sessions"])
+
+        total = 0
+        for db_session in sessions.iterator():
+            try:
+                total += self.backfill_session(db_session, options["batch_size"])
+            except Exception as e:
+                self.stderr.write(f"Skipping session {db_session.id}: {str(e)}")
+
+        self.stdout.write(self.style.SUCCESS(f"Updated token counts of {total} messages"))
+
+    def backfill_session(self, db_session: Session, batch_size: int) -> int:
+        """
+        Counts and stores the tokens of the session messages, using the model of the session.
+        """
+
+        model_config = db_session.get_model_config()
+        if model_config is None:
+            raise ValueError("Session has no model configuration")
+
+        model_collection = ai_provider_factory.get_ai_provider_instance(
+            provider_name=model_config.provider_name
+        ).get_model_collection_instance(model_type=ModelType.LLM.value)
+        model_collection = cast(LLMModelCollection, model_collection)
+        tokenizer_name = model_collection.get_tokenizer_name(model_config.model_name)
+
+        messages = (
+            SessionMessage.objects.filter(session=db_session)
+            .exclude(
+                Q(tokens_encoding=tokenizer_name)
+                & Q(query_tokens__isnull=False)
+                & Q(answer_tokens__isnull=False)
+            )
+            .only("id", "query", "answer")
+            .order_by("id")
+        )
+
+        updated = 0
+        batch = []
+        for message in messages.iterator(chunk_size=batch_size):
+            tokens = SessionMessage.count_tokens(
+                model_collection=model_collection,
+                model=model_config.model_name,
+                query=message.query,
+                answer=message.answer,
+            )
+            for field, value in tokens.items():
+                setattr(message, field, value)
+            batch.append(message)
+
+            if len(batch) >= batch_size:
+                updated += self.update_messages(batch)
+                batch = []
+
+        if batch:
+            updated += self.update_messages(batch)
+
+        return updated
+
+    def update_messages(self, messages: list[SessionMessage]) -> int:
+        """
+        Saves the token counts of the given messages.
+        """
+
+        return SessionMessage.objects.bulk_update(
+            messages, ["query_tokens", "answer_tokens", "tokens_encoding"]
+        )
@@ -0,0 +1,24 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from django.core.management.base import BaseCommand
+
+from genflow.apps.session.usage import rebuild_usage_rollups
+
+
+class Command(BaseCommand):
+    help = "Recomputes the session, team and model usage rollups from the session messages."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--team",
+            type=int,
+            action="append",
+            dest="teams",
+            help="Only rebuild the rollups of the given team, can be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        created = rebuild_usage_rollups(team_ids=options["teams"])
+        self.stdout.write(self.style.SUCCESS(f"Created {created} usage rollup rows"))
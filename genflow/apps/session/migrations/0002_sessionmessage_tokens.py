@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("session", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="answer_tokens",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="query_tokens",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="tokens_encoding",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.1.6 on 2026-10-18 06:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("session", "0002_sessionmessage_tokens"),
+        ("team", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ModelDailyUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("messages", models.PositiveIntegerField(default=0)),
+                ("usage_messages", models.PositiveIntegerField(default=0)),
+                ("input_tokens", models.PositiveBigIntegerField(default=0)),
+                ("output_tokens", models.PositiveBigIntegerField(default=0)),
+                ("total_price", models.DecimalField(decimal_places=12, default=0, max_digits=30)),
+                ("input_price", models.DecimalField(decimal_places=12, default=0, max_digits=30)),
+                ("output_price", models.DecimalField(decimal_places=12, default=0, max_digits=30)),
+                ("provider_name", models.CharField(max_length=255)),
+                ("model_name", models.CharField(max_length=255)),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="model_daily_usage",
+                        to="team.team",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("team", "provider_name", "model_name", "day"),
+                        name="unique_model_usage_day",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="SessionUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("messages", models.PositiveIntegerField(default=0)),
+                ("usage_messages", models.PositiveIntegerField(default=0)),
+                ("input_tokens", models.PositiveBigIntegerField(default=0)),
+                ("output_tokens", models.PositiveBigIntegerField(default=0)),
+                ("total_price", models.DecimalField(decimal_places=12, default=0, max_digits=30)),
+                ("input_price", models.DecimalField(decimal_places=12, default=0, max_digits=30)),
+                ("output_price", models.DecimalField(decimal_places=12, default=0, max_digits=30)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="usage_rollups",
+                        to="session.session",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("session", "day"), name="unique_session_usage_day"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="TeamDailyUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("messages", models.PositiveIntegerField(default=0)),
+                ("usage_messages", models.PositiveIntegerField(default=0)),
+                ("input_tokens", models.PositiveBigIntegerField(default=0)),
+                ("output_tokens", models.PositiveBigIntegerField(default=0)),
+                ("total_price", models.DecimalField(decimal_places=12, default=0, max_digits=30)),
+                ("input_price", models.DecimalField(decimal_places=12, default=0, max_digits=30)),
+                ("output_price", models.DecimalField(decimal_places=12, default=0, max_digits=30)),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_usage",
+                        to="team.team",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("team", "day"), name="unique_team_usage_day")
+                ],
+            },
+        ),
+    ]
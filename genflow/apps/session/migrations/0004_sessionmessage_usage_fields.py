@@ -0,0 +1,68 @@
+# Generated by Django 5.1.6 on 2026-10-18 06:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("session", "0003_usage_rollups"),
+        ("team", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="currency",
+            field=models.CharField(blank=True, max_length=16, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="input_price_nanos",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="input_tokens",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="latency",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="output_price_nanos",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="output_tokens",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="total_price_nanos",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessionmessage",
+            name="total_tokens",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="sessionmessage",
+            index=models.Index(
+                fields=["team", "created_date"], name="session_ses_team_id_09f7ee_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sessionmessage",
+            index=models.Index(
+                fields=["session", "created_date"], name="session_ses_session_fa083b_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.1.6 on 2026-10-18 06:40
+
+import json
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+PRICE_SCALE = Decimal(10**9)
+
+
+def to_price_nanos(price) -> int:
+    return int((Decimal(str(price)) * PRICE_SCALE).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def backfill_usage_fields(apps, schema_editor):
+    SessionMessage = apps.get_model("session", "SessionMessage")
+
+    messages = (
+        SessionMessage.objects.filter(usage__isnull=False, total_tokens__isnull=True)
+        .only("id", "usage")
+        .order_by("id")
+    )
+    batch = []
+    for message in messages.iterator(chunk_size=BATCH_SIZE):
+        usage = message.usage
+        if isinstance(usage, str):
+            usage = json.loads(usage)
+
+        message.input_tokens = usage["input_tokens"]
+        message.output_tokens = usage["output_tokens"]
+        message.total_tokens = usage["total_tokens"]
+        message.input_price_nanos = to_price_nanos(usage["input_price"])
+        message.output_price_nanos = to_price_nanos(usage["output_price"])
+        message.total_price_nanos = to_price_nanos(usage["total_price"])
+        message.currency = usage["currency"]
+        message.latency = usage["latency"]
+        batch.append(message)
+
+        if len(batch) >= BATCH_SIZE:
+            update_messages(SessionMessage, batch)
+            batch = []
+
+    if batch:
+        update_messages(SessionMessage, batch)
+
+
+def update_messages(SessionMessage, messages):
+    SessionMessage.objects.bulk_update(
+        messages,
+        [
+            "input_tokens",
+            "output_tokens",
+            "total_tokens",
+            "input_price_nanos",
+            "output_price_nanos",
+            "total_price_nanos",
+            "currency",
+            "latency",
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("session", "0004_sessionmessage_usage_fields"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_usage_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 06:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assistant", "0001_initial"),
+        ("core", "0001_initial"),
+        ("prompt", "0001_initial"),
+        ("session", "0005_backfill_sessionmessage_usage_fields"),
+        ("team", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="sessionmessage",
+            name="session_ses_session_fa083b_idx",
+        ),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(
+                fields=["team", "created_date", "id"], name="session_ses_team_id_30032a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sessionmessage",
+            index=models.Index(
+                fields=["session", "created_date", "id"], name="session_ses_session_b57547_idx"
+            ),
+        ),
+    ]
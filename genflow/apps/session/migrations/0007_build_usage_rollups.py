@@ -0,0 +1,87 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:12
+
+from datetime import timezone
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+PRICE_SCALE = Decimal(10**9)
+PRICE_FIELDS = {
+    "total_price": "total_price_nanos",
+    "input_price": "input_price_nanos",
+    "output_price": "output_price_nanos",
+}
+
+
+def get_model_config_value(field):
+    return models.Case(
+        models.When(
+            session__session_type="prompt",
+            then=models.F(f"session__related_prompt__related_model__{field}"),
+        ),
+        models.When(
+            session__session_type="assistant",
+            then=models.F(f"session__related_assistant__related_model__{field}"),
+        ),
+        default=models.F(f"session__related_model__{field}"),
+    )
+
+
+def build_usage_rollups(apps, schema_editor):
+    SessionMessage = apps.get_model("session", "SessionMessage")
+    rollup_keys = {
+        apps.get_model("session", "SessionUsage"): ["session_id", "day"],
+        apps.get_model("session", "TeamDailyUsage"): ["team_id", "day"],
+        apps.get_model("session", "ModelDailyUsage"): [
+            "team_id",
+            "provider_name",
+            "model_name",
+            "day",
+        ],
+    }
+
+    messages = SessionMessage.objects.annotate(
+        day=TruncDate("created_date", tzinfo=timezone.utc),
+        provider_name=get_model_config_value("provider_name"),
+        model_name=get_model_config_value("model_name"),
+    )
+    aggregates = {
+        "messages": models.Count("id"),
+        "usage_messages": models.Count("total_tokens"),
+        "input_tokens": models.Sum("input_tokens", default=0),
+        "output_tokens": models.Sum("output_tokens", default=0),
+        **{
+            field: models.Sum(price_field, default=0) for field, price_field in PRICE_FIELDS.items()
+        },
+    }
+
+    for rollup_model, key in rollup_keys.items():
+        rollup_model.objects.all().delete()
+        source = messages
+        if "model_name" in key:
+            source = source.filter(provider_name__isnull=False, model_name__isnull=False)
+        rows = source.values(*key).annotate(**aggregates).order_by(*key)
+        for row in rows:
+            for field in PRICE_FIELDS:
+                row[field] = Decimal(row[field] or 0) / PRICE_SCALE
+        rollup_model.objects.bulk_create(rollup_model(**row) for row in rows)
+
+
+def delete_usage_rollups(apps, schema_editor):
+    for name in ("SessionUsage", "TeamDailyUsage", "ModelDailyUsage"):
+        apps.get_model("session", name).objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assistant", "0001_initial"),
+        ("core", "0001_initial"),
+        ("prompt", "0001_initial"),
+        ("session", "0006_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(build_usage_rollups, delete_usage_rollups),
+    ]
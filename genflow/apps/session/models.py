@@ -2,14 +2,17 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
+from decimal import ROUND_HALF_UP, Decimal
 from os import path as osp
-from typing import Any, Dict, List
+from typing import Any, Optional
 
 from django.conf import settings
 from django.db import models
 from llama_index.core import SimpleDirectoryReader
 
 from genflow.apps.ai.llm.entities import Usage
+from genflow.apps.ai.llm.llm_model_collection import LLMModelCollection
+from genflow.apps.ai.llm.messages import AssistantMessage, UserMessage
 from genflow.apps.assistant.models import Assistant
 from genflow.apps.common.entities import FileEntity
 from genflow.apps.common.models import TeamAssociatedModel, TimeAuditModel, UserOwnedModel
@@ -64,6 +67,23 @@ class Session(TimeAuditModel, UserOwnedModel, TeamAssociatedModel):
     related_prompt = models.ForeignKey(Prompt, null=True, on_delete=models.SET_NULL)
     related_assistant = models.ForeignKey(Assistant, null=True, on_delete=models.SET_NULL)
 
+    class Meta:
+        indexes = [
+            # keyset pagination of the sessions of a team
+            models.Index(fields=["team", "created_date", "id"]),
+        ]
+
+    def get_model_config(self) -> Optional[ProviderModelConfig]:
+        """
+        Returns the model configuration used by the session, depending on its type.
+        """
+
+        if self.session_type == SessionType.PROMPT.value:
+            return self.related_prompt.related_model
+        if self.session_type == SessionType.ASSISTANT.value:
+            return self.related_assistant.related_model
+        return self.related_model
+
     @property
     def dirname(self) -> str:
         """
@@ -90,23 +110,6 @@ class Session(TimeAuditModel, UserOwnedModel, TeamAssociatedModel):
                 content = " ".join([document.get_content() for document in documents])
         return content
 
-    def get_usage(self) -> List[Dict[str, Any]]:
-        """
-        Returns the usage data as a list of objects with the message creation date
-        """
-        data = []
-        messages: List[SessionMessage] = self.sessionmessage_set.all()
-        for message in messages:
-            if message.usage is not None:
-                item = {
-                    "created_date": message.created_date,
-                }
-                usage = message.get_usage()
-                for key, value in usage.model_dump().items():
-                    item[key] = value
-                data.append(item)
-        return data
-
 
 class SessionMessage(TimeAuditModel, UserOwnedModel, TeamAssociatedModel):
     """
@@ -122,12 +125,127 @@ class SessionMessage(TimeAuditModel, UserOwnedModel, TeamAssociatedModel):
           such as token counts. This field is optional.
         session (ForeignKey): A foreign key linking the message to a specific session.
             This field is required and enforces cascading deletion.
+        query_tokens (PositiveIntegerField): The number of tokens the query adds to a prompt
+            as chat history. This field is optional.
+        answer_tokens (PositiveIntegerField): The number of tokens the answer adds to a prompt
+            as chat history. This field is optional.
+        tokens_encoding (CharField): The name of the tokenizer that produced the token counts.
+            This field is optional.
+        input_tokens (PositiveIntegerField): The number of input tokens from the usage.
+            This field is optional.
+        output_tokens (PositiveIntegerField): The number of output tokens from the usage.
+            This field is optional.
+        total_tokens (PositiveIntegerField): The total number of tokens from the usage.
+            This field is optional.
+        input_price_nanos (BigIntegerField): The price of the input tokens from the usage,
+            in billionths of the currency. This field is optional.
+        output_price_nanos (BigIntegerField): The price of the output tokens from the usage,
+            in billionths of the currency. This field is optional.
+        total_price_nanos (BigIntegerField): The total price from the usage, in billionths
+            of the currency. This field is optional.
+        currency (CharField): The currency of the prices from the usage. This field is optional.
+        latency (FloatField): The latency in seconds from the usage. This field is optional.
     """
 
+    # prices are stored as integers of this fraction of the currency
+    PRICE_SCALE = Decimal(10**9)
+    USAGE_FIELDS = (
+        "input_tokens",
+        "output_tokens",
+        "total_tokens",
+        "input_price_nanos",
+        "output_price_nanos",
+        "total_price_nanos",
+        "currency",
+        "latency",
+    )
+
     query = models.TextField(null=False, blank=False)
     answer = models.TextField(null=True, blank=True)
     usage = models.JSONField(null=True, blank=True)
     session = models.ForeignKey(Session, null=False, on_delete=models.CASCADE)
+    query_tokens = models.PositiveIntegerField(null=True, blank=True)
+    answer_tokens = models.PositiveIntegerField(null=True, blank=True)
+    tokens_encoding = models.CharField(max_length=255, null=True, blank=True)
+    input_tokens = models.PositiveIntegerField(null=True, blank=True)
+    output_tokens = models.PositiveIntegerField(null=True, blank=True)
+    total_tokens = models.PositiveIntegerField(null=True, blank=True)
+    input_price_nanos = models.BigIntegerField(null=True, blank=True)
+    output_price_nanos = models.BigIntegerField(null=True, blank=True)
+    total_price_nanos = models.BigIntegerField(null=True, blank=True)
+    currency = models.CharField(max_length=16, null=True, blank=True)
+    latency = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["team", "created_date"]),
+            # keyset pagination of the messages of a session
+            models.Index(fields=["session", "created_date", "id"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the message, storing the usage in its typed fields if they are not set yet.
+        """
+
+        if self.usage is not None and self.total_tokens is None:
+            for field, value in self.get_usage_fields(self.get_usage()).items():
+                setattr(self, field, value)
+            if "update_fields" in kwargs and kwargs["update_fields"] is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], *self.USAGE_FIELDS}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def to_price_nanos(cls, price: Decimal) -> int:
+        """
+        Converts a price to billionths of the currency.
+        """
+
+        return int((Decimal(price) * cls.PRICE_SCALE).to_integral_value(rounding=ROUND_HALF_UP))
+
+    @classmethod
+    def from_price_nanos(cls, price_nanos: Optional[int]) -> Decimal:
+        """
+        Converts billionths of the currency to a price.
+        """
+
+        return Decimal(price_nanos or 0) / cls.PRICE_SCALE
+
+    @classmethod
+    def get_usage_fields(cls, usage: Usage) -> dict[str, Any]:
+        """
+        Returns the values of the typed usage fields for the given usage.
+        """
+
+        return {
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "total_tokens": usage.total_tokens,
+            "input_price_nanos": cls.to_price_nanos(usage.input_price),
+            "output_price_nanos": cls.to_price_nanos(usage.output_price),
+            "total_price_nanos": cls.to_price_nanos(usage.total_price),
+            "currency": usage.currency,
+            "latency": usage.latency,
+        }
+
+    @staticmethod
+    def count_tokens(
+        model_collection: LLMModelCollection, model: str, query: str, answer: Optional[str]
+    ) -> dict[str, Any]:
+        """
+        Counts the tokens of a query and its answer using the given model and returns
+        them as session message field values.
+        """
+
+        return {
+            "query_tokens": model_collection.get_message_tokens_count(
+                model, UserMessage(content=query)
+            ),
+            "answer_tokens": model_collection.get_message_tokens_count(
+                model, AssistantMessage(content=answer or "")
+            ),
+            "tokens_encoding": model_collection.get_tokenizer_name(model),
+        }
 
     def get_usage(self) -> Usage:
         """
@@ -138,3 +256,80 @@ class SessionMessage(TimeAuditModel, UserOwnedModel, TeamAssociatedModel):
         if self.usage is None:
             return {}
         return Usage.model_validate_json(json_data=self.usage)
+
+
+class UsageRollup(models.Model):
+    """
+    Abstract base model for the usage of session messages aggregated per day, updated in the
+    transaction that creates each message.
+
+    Attributes:
+        day (DateField): The day (UTC) the messages were created.
+        messages (PositiveIntegerField): The number of messages.
+        usage_messages (PositiveIntegerField): The number of messages with usage data.
+        input_tokens (PositiveBigIntegerField): The total number of input tokens.
+        output_tokens (PositiveBigIntegerField): The total number of output tokens.
+        total_price (DecimalField): The total price of the messages.
+        input_price (DecimalField): The total price of the input tokens.
+        output_price (DecimalField): The total price of the output tokens.
+    """
+
+    day = models.DateField()
+    messages = models.PositiveIntegerField(default=0)
+    usage_messages = models.PositiveIntegerField(default=0)
+    input_tokens = models.PositiveBigIntegerField(default=0)
+    output_tokens = models.PositiveBigIntegerField(default=0)
+    total_price = models.DecimalField(max_digits=30, decimal_places=12, default=0)
+    input_price = models.DecimalField(max_digits=30, decimal_places=12, default=0)
+    output_price = models.DecimalField(max_digits=30, decimal_places=12, default=0)
+
+    class Meta:
+        abstract = True
+
+
+class SessionUsage(UsageRollup):
+    """
+    Represents the usage of the messages of a session on a day.
+    """
+
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="usage_rollups")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["session", "day"], name="unique_session_usage_day")
+        ]
+
+
+class TeamDailyUsage(UsageRollup):
+    """
+    Represents the usage of the messages of a team on a day. It is kept when the sessions
+    are deleted.
+    """
+
+    team = models.ForeignKey("team.Team", on_delete=models.CASCADE, related_name="daily_usage")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["team", "day"], name="unique_team_usage_day")
+        ]
+
+
+class ModelDailyUsage(UsageRollup):
+    """
+    Represents the usage of the messages of a team generated by a model on a day. It is
+    kept when the sessions are deleted.
+    """
+
+    team = models.ForeignKey(
+        "team.Team", on_delete=models.CASCADE, related_name="model_daily_usage"
+    )
+    provider_name = models.CharField(max_length=255)
+    model_name = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "provider_name", "model_name", "day"],
+                name="unique_model_usage_day",
+            )
+        ]
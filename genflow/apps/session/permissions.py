@@ -5,8 +5,8 @@
 from django.conf import settings
 
 from genflow.apps.iam.permissions import GenFLowBasePermission, StrEnum
+from genflow.apps.restriction.counters import get_usage
 from genflow.apps.restriction.mixin import LimitMixin
-from genflow.apps.session.models import Session, SessionMessage
 from genflow.apps.team.models import TeamRole
 
 
@@ -15,6 +15,8 @@ class SessionPermission(GenFLowBasePermission, LimitMixin):
     Handles the permissions for session-related actions.
     """
 
+    basename = "session"
+
     class Scopes(StrEnum):
         """
         Defines the possible scopes of actions.
@@ -58,7 +60,7 @@ class SessionPermission(GenFLowBasePermission, LimitMixin):
         """
 
         permissions = []
-        if view.basename == "session":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 # special case for generate -> check access should be
                 # done in the session message permission with create scope
@@ -78,7 +80,7 @@ class SessionPermission(GenFLowBasePermission, LimitMixin):
         Get the number of session owned by the user.
         """
 
-        return Session.objects.filter(owner_id=self.user_id).count()
+        return get_usage("SESSION", "user", self.user_id)
 
     def get_team_usage(self) -> int:
         """
@@ -88,7 +90,7 @@ class SessionPermission(GenFLowBasePermission, LimitMixin):
         if self.team_id is None:
             return 0
 
-        return Session.objects.filter(team_id=self.team_id).count()
+        return get_usage("SESSION", "team", self.team_id)
 
     def check_access(self) -> bool:
         """
@@ -153,6 +155,8 @@ class SessionMessagePermission(GenFLowBasePermission, LimitMixin):
     Handles the permissions for session message-related actions.
     """
 
+    basename = "message"
+
     class Scopes(StrEnum):
         """
         Defines the possible scopes of actions.
@@ -182,7 +186,7 @@ class SessionMessagePermission(GenFLowBasePermission, LimitMixin):
         """
 
         permissions = []
-        if view.basename == "message":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -195,11 +199,9 @@ class SessionMessagePermission(GenFLowBasePermission, LimitMixin):
         """
 
         if hasattr(self, "session_id"):
-            return SessionMessage.objects.filter(
-                session_id=self.session_id, owner_id=self.user_id
-            ).count()
+            return get_usage("MESSAGE", "session", self.session_id)
 
-        return SessionMessage.objects.filter(owner_id=self.user_id).count()
+        return get_usage("MESSAGE", "user", self.user_id)
 
     def get_team_usage(self) -> int:
         """
@@ -210,11 +212,9 @@ class SessionMessagePermission(GenFLowBasePermission, LimitMixin):
             return 0
 
         if hasattr(self, "session_id"):
-            return SessionMessage.objects.filter(
-                session_id=self.session_id, owner_id=self.user_id
-            ).count()
+            return get_usage("MESSAGE", "session", self.session_id)
 
-        return SessionMessage.objects.filter(team_id=self.team_id).count()
+        return get_usage("MESSAGE", "team", self.team_id)
 
     def check_access(self) -> bool:
         """
@@ -250,3 +250,72 @@ class SessionMessagePermission(GenFLowBasePermission, LimitMixin):
         """
 
         return queryset
+
+
+class UsagePermission(GenFLowBasePermission):
+    """
+    Handles the permissions for usage analytics actions.
+    """
+
+    basename = "usage"
+
+    class Scopes(StrEnum):
+        """
+        Defines the possible scopes of actions.
+        """
+
+        VIEW = "view"
+
+    @staticmethod
+    def get_scopes(request, view, obj):
+        """
+        Returns the scope of the action being performed based on the view's action.
+        """
+
+        Scopes = __class__.Scopes
+        return [
+            {
+                "daily": Scopes.VIEW,
+                "models": Scopes.VIEW,
+            }.get(view.action, None)
+        ]
+
+    @classmethod
+    def create(cls, request, view, obj, iam_context):
+        """
+        Creates and returns a list of permissions based on the request, view, and object.
+        """
+
+        permissions = []
+        if view.basename == cls.basename:
+            for scope in cls.get_scopes(request, view, obj):
+                self = cls.create_base_perm(request, view, scope, iam_context, obj)
+                permissions.append(self)
+
+        return permissions
+
+    def check_access(self) -> bool:
+        """
+        Checks if the user has access based on their group name and team role.
+        """
+
+        # if no team -> no access
+        if self.team_id is None:
+            return False
+
+        # admin users have full control
+        if self.group_name == settings.IAM_ADMIN_ROLE:
+            return True
+
+        # team member can view the usage of the team
+        if self.scope == self.Scopes.VIEW:
+            return self.team_role is not None
+
+        return False
+
+    def filter(self, queryset):
+        """'
+        Filters the queryset based on the permissions
+        """
+
+        return queryset
@@ -2,8 +2,7 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
-import pandas as pd
-from django.db import transaction
+from django.db import models, transaction
 from rest_framework import serializers
 
 from genflow.apps.assistant.models import Assistant
@@ -16,10 +15,33 @@ from genflow.apps.core.serializers import (
 from genflow.apps.prompt.models import Prompt
 from genflow.apps.prompt.serializers import PromptReadSerializer
 from genflow.apps.session.generator.entities import GenerateRequest
-from genflow.apps.session.models import Session, SessionMessage, SessionType
+from genflow.apps.session.models import (
+    Session,
+    SessionMessage,
+    SessionType,
+    TeamDailyUsage,
+    UsageRollup,
+)
+from genflow.apps.session.usage import get_empty_usage, get_sessions_usage
 from genflow.apps.team.serializers import BasicUserSerializer
 
 
+class SessionListReadSerializer(serializers.ListSerializer):
+    """
+    Serializer for reading lists of Session data, aggregating the usage of all the sessions
+    with a single query.
+    """
+
+    def to_representation(self, data) -> list:
+        """
+        Converts the given sessions into their serialized representation.
+        """
+
+        sessions = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.sessions_usage = get_sessions_usage([session.id for session in sessions])
+        return super().to_representation(sessions)
+
+
 class SessionReadSerializer(serializers.ModelSerializer):
     """
     Serializer for reading Session data, to be used by get actions.
@@ -32,53 +54,14 @@ class SessionReadSerializer(serializers.ModelSerializer):
     usage = serializers.SerializerMethodField()
 
     def get_usage(self, instance: Session) -> dict:
-        usage = {
-            "total_messages": 0,
-            "total_input_tokens": 0,
-            "total_output_tokens": 0,
-            "total_price": 0,
-            "total_input_price": 0,
-            "total_output_price": 0,
-            "currency": "USD",
-            "per_day": [],
-        }
-        # Check if there are any messages in the session
-        count = instance.sessionmessage_set.count()
-        if count == 0:
-            return usage
-
-        # Convert the list of dictionaries to a DataFrame
-        df = pd.DataFrame(instance.get_usage())
-
-        # Calculate the total usage
-        usage["total_messages"] = count
-        usage["total_input_tokens"] = df["input_tokens"].sum()
-        usage["total_output_tokens"] = df["output_tokens"].sum()
-        usage["total_price"] = df["total_price"].sum()
-
-        # Calculate the total input/output price
-        usage["total_input_price"] = df.apply(
-            lambda row: row["input_tokens"] * row["input_unit_price"] * row["input_price_unit"],
-            axis=1,
-        ).sum()
-        usage["total_output_price"] = df.apply(
-            lambda row: row["output_tokens"] * row["output_unit_price"] * row["output_price_unit"],
-            axis=1,
-        ).sum()
-
-        # Calculate the per day usage
-        per_day = (
-            df.groupby(df["created_date"].dt.date)
-            .agg(total_messages=("input_tokens", "count"), total_price=("total_price", "sum"))
-            .reset_index()
-        )
-        per_day["created_date"] = pd.to_datetime(per_day["created_date"])
-        per_day["day"] = per_day["created_date"].dt.strftime("%Y-%m-%d")
-        per_day = per_day.drop(columns=["created_date"])
-        per_day = per_day.to_dict(orient="records")
-        usage["per_day"] = per_day
+        """
+        Returns the usage of the session, aggregated for all the sessions of a list at once.
+        """
 
-        return usage
+        sessions_usage = getattr(self.parent, "sessions_usage", None)
+        if sessions_usage is None:
+            sessions_usage = get_sessions_usage([instance.id])
+        return sessions_usage.get(instance.id, get_empty_usage())
 
     class Meta:
         """
@@ -86,6 +69,7 @@ class SessionReadSerializer(serializers.ModelSerializer):
         """
 
         model = Session
+        list_serializer_class = SessionListReadSerializer
         fields = (
             "id",
             "name",
@@ -333,3 +317,58 @@ class GenerateRequestSerializer(serializers.Serializer):
         generate_request.user_id = str(user.id)
         generate_request.callback = callback
         return generate_request
+
+
+# Precompute the fields of the usage rollups, and those summed over several days
+usage_rollup_fields = [field.name for field in UsageRollup._meta.get_fields()]
+usage_total_fields = [field for field in usage_rollup_fields if field != "day"]
+
+
+class UsageFilterSerializer(serializers.Serializer):
+    """
+    Serializer for the date range of usage analytics, both ends included.
+    """
+
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+
+    def validate(self, data: dict) -> dict:
+        """
+        Validates that the date range is not reversed.
+        """
+
+        start_date = data.get("start_date")
+        end_date = data.get("end_date")
+        if start_date and end_date and start_date > end_date:
+            raise serializers.ValidationError("start_date must not be after end_date")
+        return data
+
+
+class DailyUsageReadSerializer(serializers.ModelSerializer):
+    """
+    Serializer for reading the usage of a team per day.
+    """
+
+    class Meta:
+        """
+        Defines the model and fields to be serialized.
+        """
+
+        model = TeamDailyUsage
+        fields = usage_rollup_fields
+
+
+class ModelUsageReadSerializer(serializers.Serializer):
+    """
+    Serializer for reading the usage of a team per model over a date range.
+    """
+
+    provider_name = serializers.CharField()
+    model_name = serializers.CharField()
+    messages = serializers.IntegerField()
+    usage_messages = serializers.IntegerField()
+    input_tokens = serializers.IntegerField()
+    output_tokens = serializers.IntegerField()
+    total_price = serializers.DecimalField(max_digits=30, decimal_places=12)
+    input_price = serializers.DecimalField(max_digits=30, decimal_places=12)
+    output_price = serializers.DecimalField(max_digits=30, decimal_places=12)
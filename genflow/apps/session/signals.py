@@ -5,11 +5,12 @@
 import shutil
 from os import path as osp
 
-from django.db.models.signals import post_delete, post_migrate
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
 
 from genflow.apps.restriction.signals import add_global_limits
-from genflow.apps.session.models import Session
+from genflow.apps.session.models import Session, SessionMessage
+from genflow.apps.session.usage import add_message_usage
 
 
 # post_migrate is different from other signals
@@ -26,3 +27,9 @@ def add_session_global_limits(sender, **kwargs):
 def delete_dir_on_session_delete(sender, instance, **kwargs):
     if osp.exists(instance.dirname):
         shutil.rmtree(instance.dirname)
+
+
+@receiver(post_save, sender=SessionMessage)
+def add_usage_on_message_create(sender, instance, created, **kwargs):
+    if created:
+        add_message_usage(instance)
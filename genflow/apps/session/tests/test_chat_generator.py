@@ -2,15 +2,21 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
+from types import SimpleNamespace
+from unittest import mock
+
 from channels.testing import WebsocketCommunicator
 from django.conf import settings
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.test import TransactionTestCase, override_settings
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
 from rest_framework.authtoken.models import Token
 
+from genflow.apps.assistant.models import Assistant
+from genflow.apps.core.config.provider_service import AIProviderConfigurationService
 from genflow.apps.core.tests.utils import enable_provider
 from genflow.apps.prompt.tests.utils import PROVIDER_DATA
+from genflow.apps.session.generator.chat import ChatGenerator
 from genflow.apps.session.tests.utils import SESSION_DATA, create_dummy_session
 from genflow.apps.team.tests.utils import create_dummy_users
 from genflow.apps.websocket.tests.utils import application
@@ -58,3 +64,38 @@ class ChatGenerateTestCase(TransactionTestCase):
 
         # Close
         await communicator.disconnect()
+
+
+class CollectionsContextTestCase(SimpleTestCase):
+    def setUp(self):
+        # the collections context does not depend on the session of the generator
+        self.generator = ChatGenerator.__new__(ChatGenerator)
+        self.generator.queryset = None
+
+    def test_invalid_collection_config(self):
+        for collection_config in (
+            {"collections": "docs", "embedding_model": {"provider_name": "p", "model_name": "m"}},
+            {"collections": ["docs"], "embedding_model": "m"},
+            {"collections": ["docs"], "embedding_model": {"provider_name": "p"}},
+        ):
+            assistant = Assistant(team_id=1, collection_config=collection_config)
+            self.assertEqual(self.generator.get_collections_context(assistant, "query"), "")
+
+    def test_embedding_model_not_found(self):
+        assistant = Assistant(
+            team_id=1,
+            collection_config={
+                "collections": ["docs"],
+                "embedding_model": {"provider_name": "dummy", "model_name": "embedding1"},
+            },
+        )
+        model_collection_bundle = SimpleNamespace(
+            model_collection_instance=mock.Mock(**{"get_model_schema.return_value": None})
+        )
+        with mock.patch.object(
+            AIProviderConfigurationService,
+            "get_model_collection_bundle",
+            return_value=model_collection_bundle,
+        ):
+            with self.assertRaisesMessage(ValueError, "embedding1"):
+                self.generator.get_collections_context(assistant, "query")
@@ -0,0 +1,186 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from genflow.apps.ai.llm.messages import AssistantMessage, UserMessage
+from genflow.apps.core.config.llm_model_bundle import LLMModelBundle
+from genflow.apps.core.models import Provider
+from genflow.apps.core.tests.utils import enable_provider
+from genflow.apps.prompt.models import PromptType
+from genflow.apps.prompt.tests.utils import PROVIDER_DATA
+from genflow.apps.session.generator.chat import ChatGenerator
+from genflow.apps.session.models import SessionMessage
+from genflow.apps.session.tests.utils import (
+    SESSION_DATA,
+    create_dummy_session,
+    create_dummy_session_message,
+)
+from genflow.apps.session.transform.base import PromptTemplateEntity
+from genflow.apps.session.transform.plan import PromptPlan
+from genflow.apps.session.transform.simple import SimplePromptTransform
+from genflow.apps.team.tests.utils import create_dummy_users
+
+
+class PromptTransformTestCase(TestCase):
+    def setUp(self):
+        _, regular_users = create_dummy_users(create_teams=True)
+
+        # pylint: disable=unused-import
+        import genflow.apps.ai.tests.register_providers  # noqa
+
+        self.user = regular_users[0]["user"]
+        self.team = regular_users[0]["teams"][0]["team"]
+        enable_provider(team=self.team, owner=self.user, data=PROVIDER_DATA)
+        self.session = create_dummy_session(
+            team=self.team, owner=self.user, data=SESSION_DATA.copy()
+        )
+
+        # the dummy model counts one token per character
+        self.turns = [(f"query {i:02d}", f"answer {i:02d}") for i in range(60)]
+        for query, answer in self.turns:
+            create_dummy_session_message(
+                team=self.team,
+                owner=self.user,
+                session=self.session,
+                data={"query": query, "answer": answer},
+            )
+        self.turn_tokens = len(self.turns[0][0]) + len(self.turns[0][1])
+
+        generator = ChatGenerator(
+            queryset=Provider.objects.filter(team=self.team), db_session=self.session
+        )
+        self.generator = generator
+        self.prompt_entity = PromptTemplateEntity(
+            prompt_type=PromptType.SIMPLE, simple_prompt_template="pre prompt"
+        )
+        self.prompt_transform = SimplePromptTransform(
+            db_session=self.session, llm_model_bundle=generator.llm_model_bundle
+        )
+
+    def assertTurns(self, messages, turns):
+        expected = []
+        for query, answer in turns:
+            expected.append(UserMessage(content=query))
+            expected.append(AssistantMessage(content=answer))
+        self.assertEqual(messages, expected)
+
+    def test_get_message_history_keeps_newest_turns(self):
+        messages = self.prompt_transform._get_message_history(
+            max_token_limit=3 * self.turn_tokens + 1
+        )
+        self.assertTurns(messages, self.turns[-3:])
+
+    def test_get_message_history_all_turns(self):
+        messages = self.prompt_transform._get_message_history(max_token_limit=100000)
+        self.assertTurns(messages, self.turns)
+
+    def test_get_message_history_message_limit(self):
+        messages = self.prompt_transform._get_message_history(
+            max_token_limit=100000, message_limit=5
+        )
+        self.assertTurns(messages, self.turns[-5:])
+
+    def test_get_message_history_no_budget(self):
+        messages = self.prompt_transform._get_message_history(max_token_limit=self.turn_tokens - 1)
+        self.assertEqual(messages, [])
+
+    def test_backfill_message_tokens(self):
+        call_command("backfill_message_tokens", stdout=StringIO())
+
+        for message in SessionMessage.objects.filter(session=self.session):
+            self.assertEqual(message.query_tokens, len(message.query))
+            self.assertEqual(message.answer_tokens, len(message.answer))
+            self.assertEqual(message.tokens_encoding, "model2")
+
+    def test_get_message_history_stored_tokens(self):
+        call_command("backfill_message_tokens", stdout=StringIO())
+
+        messages = self.prompt_transform._get_message_history(
+            max_token_limit=3 * self.turn_tokens + 1
+        )
+        self.assertTurns(messages, self.turns[-3:])
+
+        # stored counts are used instead of tokenizing the turn again
+        newest = SessionMessage.objects.filter(session=self.session).order_by("-id").first()
+        newest.query_tokens = 10 * self.turn_tokens
+        newest.save()
+        messages = self.prompt_transform._get_message_history(
+            max_token_limit=3 * self.turn_tokens + 1
+        )
+        self.assertEqual(messages, [])
+
+    def test_get_message_history_partially_stored_tokens(self):
+        call_command("backfill_message_tokens", stdout=StringIO())
+        SessionMessage.objects.filter(session=self.session, query__lt="query 30").update(
+            query_tokens=None, answer_tokens=None, tokens_encoding=None
+        )
+
+        messages = self.prompt_transform._get_message_history(max_token_limit=100000)
+        self.assertTurns(messages, self.turns)
+
+        messages = self.prompt_transform._get_message_history(max_token_limit=40 * self.turn_tokens)
+        self.assertTurns(messages, self.turns[-40:])
+
+    def test_prompt_plan_matches_transform(self):
+        prompt_entity = self.prompt_entity
+        plan = self.generator.create_prompt_plan(
+            prompt_template_entity=prompt_entity, query="query", files="files", memory=True
+        )
+
+        messages, stop = plan.get_messages(context="context")
+        expected, expected_stop = self.prompt_transform.get_prompt(
+            prompt_template_entity=prompt_entity,
+            query="query",
+            context="context",
+            files="files",
+            memory=True,
+        )
+        self.assertEqual(messages, expected)
+        self.assertEqual(stop, expected_stop)
+        self.assertEqual(
+            plan.prompt_tokens, self.generator.llm_model_bundle.get_tokens_count(messages)
+        )
+
+    def test_prompt_plan_counts_segments_once(self):
+        plan = PromptPlan(
+            prompt_transform=self.prompt_transform,
+            prompt_template_entity=self.prompt_entity,
+            query="query",
+            memory=True,
+        )
+
+        with patch.object(
+            LLMModelBundle,
+            "get_message_tokens_count",
+            autospec=True,
+            side_effect=LLMModelBundle.get_message_tokens_count,
+        ) as get_message_tokens_count:
+            plan.get_prompt_tokens_without_memory()
+            plan.get_prompt_tokens_without_memory()
+            plan.get_messages()
+            self.assertEqual(get_message_tokens_count.call_count, 2)
+
+            # only the system message depends on the context
+            plan.get_messages(context="context")
+            self.assertEqual(get_message_tokens_count.call_count, 3)
+
+    def test_prompt_plan_context_tokens(self):
+        plan = PromptPlan(
+            prompt_transform=self.prompt_transform,
+            prompt_template_entity=self.prompt_entity,
+            query="query",
+        )
+
+        context = "context"
+        messages, _ = plan.get_messages(
+            context=context, context_tokens=self.generator.count_context_tokens(context)
+        )
+        self.assertEqual(
+            plan.prompt_tokens, self.generator.llm_model_bundle.get_tokens_count(messages)
+        )
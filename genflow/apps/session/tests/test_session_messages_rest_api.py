@@ -2,6 +2,7 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
+import base64
 from http.client import HTTPResponse
 from urllib.parse import urlencode
 
@@ -11,6 +12,7 @@ from rest_framework.test import APIClient, APITestCase
 from genflow.apps.core.tests.utils import enable_provider
 from genflow.apps.prompt.tests.utils import PROVIDER_DATA
 from genflow.apps.restriction.tests.utils import override_limit
+from genflow.apps.session.models import SessionMessage
 from genflow.apps.session.tests.utils import (
     SESSION_DATA,
     SESSION_MESSAGE_DATA,
@@ -54,8 +56,9 @@ class SessionMessageListTestCase(SessionMessageTestCase):
         super().setUpClass()
         cls.create_session_messages()
 
-    def list_session_messages(self, user, session_id=None, team_id=None) -> HTTPResponse:
-        query_params = {}
+    def list_session_messages(
+        self, user, session_id=None, team_id=None, **query_params
+    ) -> HTTPResponse:
         if team_id:
             query_params["team"] = team_id
         if session_id:
@@ -92,6 +95,81 @@ class SessionMessageListTestCase(SessionMessageTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["count"], 2)
 
+    def test_list_session_messages_user_cursor(self):
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        messages = self.regular_users[0]["teams"][0]["messages"]
+        response = self.list_session_messages(
+            user, session_id=self.session.id, team_id=team.id, cursor="", page_size=1
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(response.data["results"][0]["query"], messages[0].query)
+
+        with ForceLogin(user, self.client):
+            response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["query"], messages[1].query)
+        self.assertIsNone(response.data["next"])
+
+    def test_list_session_messages_user_cursor_same_created_date(self):
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        create_dummy_session_message(
+            team=team, owner=user, session=self.session, data=SESSION_MESSAGE_DATA[0].copy()
+        )
+        messages = SessionMessage.objects.filter(session=self.session).order_by("id")
+        # messages created in the same instant are told apart by their id
+        messages.update(created_date=messages[0].created_date)
+
+        response = self.list_session_messages(
+            user, session_id=self.session.id, team_id=team.id, cursor="", page_size=1
+        )
+        ids = [response.data["results"][0]["id"]]
+        with ForceLogin(user, self.client):
+            while response.data["next"]:
+                response = self.client.get(response.data["next"])
+                ids.append(response.data["results"][0]["id"])
+            self.assertEqual(ids, [message.id for message in messages])
+
+            response = self.client.get(response.data["previous"])
+            self.assertEqual(response.data["results"][0]["id"], ids[-2])
+
+    def test_list_session_messages_user_invalid_cursor(self):
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        for position in ('["x", "1"]', '["1"]', "x"):
+            cursor = base64.b64encode(urlencode({"p": position}).encode()).decode()
+            response = self.list_session_messages(
+                user, session_id=self.session.id, team_id=team.id, cursor=cursor
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_session_messages_user_estimated_count(self):
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        messages = self.regular_users[0]["teams"][0]["messages"]
+        response = self.list_session_messages(
+            user, session_id=self.session.id, team_id=team.id, count="estimated", page_size=1
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["count_estimated"])
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["query"], messages[0].query)
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.list_session_messages(
+            user,
+            session_id=self.session.id,
+            team_id=team.id,
+            count="estimated",
+            page_size=1,
+            page=2,
+        )
+        self.assertEqual(response.data["results"][0]["query"], messages[1].query)
+        self.assertIsNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
     def test_list_session_messages_user_member(self):
         team = self.regular_users[0]["teams"][0]["team"]
         user = self.regular_users[0]["user"]
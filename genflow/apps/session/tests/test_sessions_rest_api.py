@@ -3,6 +3,7 @@
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
 import os
+from decimal import Decimal
 from http.client import HTTPResponse
 from os import path as osp
 from pathlib import Path
@@ -12,6 +13,7 @@ from django.test import override_settings
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from genflow.apps.ai.llm.entities import Usage
 from genflow.apps.common.entities import FileEntity
 from genflow.apps.core.tests.utils import enable_provider
 from genflow.apps.prompt.tests.utils import PROVIDER_DATA
@@ -19,7 +21,9 @@ from genflow.apps.restriction.tests.utils import override_limit
 from genflow.apps.session.models import Session, SessionType
 from genflow.apps.session.tests.utils import (
     SESSION_DATA,
+    SESSION_MESSAGE_DATA,
     create_dummy_session,
+    create_dummy_session_message,
     create_related_prompt,
 )
 from genflow.apps.team.models import TeamRole
@@ -469,6 +473,47 @@ class SessionListTestCase(SessionTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["count"], 0)
 
+    def test_list_sessions_usage(self):
+        team = self.regular_users[0]["teams"][0]["team"]
+        user = self.regular_users[0]["user"]
+        usage = Usage(
+            input_tokens=10,
+            input_unit_price=Decimal("0.001"),
+            input_price_unit=Decimal("0.5"),
+            input_price=Decimal("0.005"),
+            output_tokens=20,
+            output_unit_price=Decimal("0.002"),
+            output_price_unit=Decimal("0.5"),
+            output_price=Decimal("0.02"),
+            total_tokens=30,
+            total_price=Decimal("0.025"),
+            currency="USD",
+            latency=1.0,
+        )
+        for data in SESSION_MESSAGE_DATA:
+            create_dummy_session_message(
+                team=team,
+                owner=user,
+                session=self.llm_session,
+                data={**data, "usage": usage.model_dump_json()},
+            )
+        create_dummy_session_message(
+            team=team, owner=user, session=self.llm_session, data=SESSION_MESSAGE_DATA[0]
+        )
+
+        response = self.list_sessions(user, team_id=team.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        llm_session_usage = response.data["results"][0]["usage"]
+        self.assertEqual(llm_session_usage["total_messages"], 3)
+        self.assertEqual(llm_session_usage["total_input_tokens"], 20)
+        self.assertEqual(llm_session_usage["total_output_tokens"], 40)
+        self.assertAlmostEqual(llm_session_usage["total_price"], Decimal("0.05"))
+        self.assertAlmostEqual(llm_session_usage["total_input_price"], Decimal("0.01"))
+        self.assertAlmostEqual(llm_session_usage["total_output_price"], Decimal("0.04"))
+        self.assertEqual(len(llm_session_usage["per_day"]), 1)
+        self.assertEqual(llm_session_usage["per_day"][0]["total_messages"], 2)
+        self.assertEqual(response.data["results"][1]["usage"]["total_messages"], 0)
+
 
 @override_settings(BASE_DIR=str(Path(__file__).parents[4]))
 class SessionListFilesTestCase(SessionTestCase):
@@ -0,0 +1,165 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from decimal import Decimal
+from http.client import HTTPResponse
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from genflow.apps.ai.llm.entities import Usage
+from genflow.apps.core.tests.utils import enable_provider
+from genflow.apps.prompt.tests.utils import PROVIDER_DATA
+from genflow.apps.session.models import (
+    ModelDailyUsage,
+    SessionMessage,
+    SessionUsage,
+    TeamDailyUsage,
+)
+from genflow.apps.session.tests.utils import (
+    SESSION_DATA,
+    SESSION_MESSAGE_DATA,
+    create_dummy_session,
+    create_dummy_session_message,
+)
+from genflow.apps.team.tests.utils import ForceLogin, create_dummy_users
+
+USAGE = Usage(
+    input_tokens=10,
+    input_unit_price=Decimal("0.001"),
+    input_price_unit=Decimal("0.5"),
+    input_price=Decimal("0.005"),
+    output_tokens=20,
+    output_unit_price=Decimal("0.002"),
+    output_price_unit=Decimal("0.5"),
+    output_price=Decimal("0.02"),
+    total_tokens=30,
+    total_price=Decimal("0.025"),
+    currency="USD",
+    latency=1.0,
+)
+
+
+class UsageTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        # pylint: disable=unused-import
+        import genflow.apps.ai.tests.register_providers  # noqa
+
+        super().setUpClass()
+        cls.client = APIClient()
+        cls.admin_user, cls.regular_users = create_dummy_users(create_teams=True)
+
+    def setUp(self):
+        self.team = self.regular_users[0]["teams"][0]["team"]
+        self.user = self.regular_users[0]["user"]
+        _ = enable_provider(team=self.team, owner=self.user, data=PROVIDER_DATA)
+        self.session = create_dummy_session(
+            team=self.team, owner=self.user, data=SESSION_DATA.copy()
+        )
+        for data in SESSION_MESSAGE_DATA:
+            create_dummy_session_message(
+                team=self.team,
+                owner=self.user,
+                session=self.session,
+                data={**data, "usage": USAGE.model_dump_json()},
+            )
+        create_dummy_session_message(
+            team=self.team, owner=self.user, session=self.session, data=SESSION_MESSAGE_DATA[0]
+        )
+
+    def get_usage(self, user, action, team_id=None, **params) -> HTTPResponse:
+        if team_id:
+            params["team"] = team_id
+        with ForceLogin(user, self.client):
+            response = self.client.get(f"/api/usage/{action}", params)
+        return response
+
+    def get_rollups(self) -> list:
+        return [
+            list(rollup_model.objects.order_by("id").values())
+            for rollup_model in (SessionUsage, TeamDailyUsage, ModelDailyUsage)
+        ]
+
+    def test_message_usage_fields(self):
+        message = SessionMessage.objects.filter(usage__isnull=False).first()
+        self.assertEqual(message.input_tokens, 10)
+        self.assertEqual(message.output_tokens, 20)
+        self.assertEqual(message.total_tokens, 30)
+        self.assertEqual(message.input_price_nanos, 5_000_000)
+        self.assertEqual(message.output_price_nanos, 20_000_000)
+        self.assertEqual(message.total_price_nanos, 25_000_000)
+        self.assertEqual(message.currency, "USD")
+        self.assertEqual(
+            SessionMessage.from_price_nanos(message.total_price_nanos), USAGE.total_price
+        )
+
+        message = SessionMessage.objects.filter(usage__isnull=True).first()
+        self.assertIsNone(message.total_tokens)
+
+    def test_add_message_usage(self):
+        rollup = TeamDailyUsage.objects.get(team=self.team)
+        self.assertEqual(rollup.messages, 3)
+        self.assertEqual(rollup.usage_messages, 2)
+        self.assertEqual(rollup.input_tokens, 20)
+        self.assertEqual(rollup.output_tokens, 40)
+        self.assertEqual(rollup.total_price, Decimal("0.05"))
+        self.assertEqual(rollup.input_price, Decimal("0.01"))
+        self.assertEqual(rollup.output_price, Decimal("0.04"))
+
+        rollup = ModelDailyUsage.objects.get(team=self.team)
+        self.assertEqual((rollup.provider_name, rollup.model_name), ("dummy", "model2"))
+        self.assertEqual(SessionUsage.objects.get(session=self.session).messages, 3)
+
+    def test_rebuild_usage_rollups(self):
+        rollups = self.get_rollups()
+
+        call_command("rebuild_usage_rollups", stdout=StringIO())
+
+        rebuilt_rollups = self.get_rollups()
+        for rows, rebuilt_rows in zip(rollups, rebuilt_rollups):
+            self.assertEqual(
+                [{**row, "id": None} for row in rows],
+                [{**row, "id": None} for row in rebuilt_rows],
+            )
+
+    def test_daily_usage_admin_no_team(self):
+        response = self.get_usage(self.admin_user, "daily")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_daily_usage_user(self):
+        response = self.get_usage(self.user, "daily", team_id=self.team.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["messages"], 3)
+
+        day = TeamDailyUsage.objects.get(team=self.team).day
+        response = self.get_usage(
+            self.user, "daily", team_id=self.team.id, end_date=day.replace(year=day.year - 1)
+        )
+        self.assertEqual(response.data["count"], 0)
+
+    def test_daily_usage_invalid_range(self):
+        response = self.get_usage(
+            self.user,
+            "daily",
+            team_id=self.team.id,
+            start_date="2025-02-01",
+            end_date="2025-01-01",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_daily_usage_user_another_team(self):
+        another_user = self.regular_users[1]["user"]
+        response = self.get_usage(another_user, "daily", team_id=self.team.id)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_models_usage_user(self):
+        response = self.get_usage(self.user, "models", team_id=self.team.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["model_name"], "model2")
+        self.assertEqual(response.data["results"][0]["input_tokens"], 20)
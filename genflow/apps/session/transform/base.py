@@ -4,6 +4,7 @@
 
 from typing import Optional
 
+from django.db.models import Case, F, Q, Sum, Value, When, Window
 from pydantic import BaseModel
 
 from genflow.apps.ai.base.entities.model import PropertyKey
@@ -29,6 +30,9 @@ class BasePromptTransform:
     a session object and a LLM model bundle to process and retrieve chat histories.
     """
 
+    HISTORY_MESSAGE_LIMIT = 500
+    HISTORY_BATCH_SIZE = 50
+
     def __init__(self, db_session: Session, llm_model_bundle: LLMModelBundle):
         """
         Initializes the BasePromptTransform with a session and model bundle.
@@ -53,10 +57,13 @@ class BasePromptTransform:
 
         return messages
 
-    def _calculate_remaining_token(self, messages: list[Message]) -> int:
+    def _calculate_remaining_token(
+        self, messages: list[Message], prompt_tokens: Optional[int] = None
+    ) -> int:
         """
         Calculates the remaining token capacity available for additional messages
-            based on the model's context size and current message tokens.
+            based on the model's context size and current message tokens. The tokens
+            of the messages are counted unless given as prompt_tokens.
         """
 
         rest_tokens = 2000
@@ -65,19 +72,12 @@ class BasePromptTransform:
             PropertyKey.CONTEXT_SIZE
         )
         if model_context_tokens:
-            curr_message_tokens = self.llm_model_bundle.get_tokens_count(messages)
+            if prompt_tokens is None:
+                prompt_tokens = self.llm_model_bundle.get_tokens_count(messages)
 
-            max_tokens = 0
-            for parameter_config in self.llm_model_bundle.model_schema.parameter_configs:
-                if parameter_config.name == "max_tokens" or (
-                    parameter_config.use_template and parameter_config.use_template == "max_tokens"
-                ):
-                    max_tokens = (
-                        self.llm_model_bundle.parameters.get(parameter_config.name)
-                        or self.llm_model_bundle.parameters.get(parameter_config.use_template)
-                    ) or 0
+            max_tokens = self.llm_model_bundle.get_max_tokens()
 
-            rest_tokens = model_context_tokens - max_tokens - curr_message_tokens
+            rest_tokens = model_context_tokens - max_tokens - prompt_tokens
             rest_tokens = max(rest_tokens, 0)
 
         return rest_tokens
@@ -86,34 +86,112 @@ class BasePromptTransform:
         self, max_token_limit: int = 2000, message_limit: Optional[int] = None
     ) -> list[Message]:
         """
-        Retrieves historical chat messages from the session database, prunes them
-            if they exceed the maximum token limit, and returns the processed messages.
+        Retrieves historical chat messages from the session database, starting from the
+            newest turn and stopping as soon as the next turn exceeds the maximum token limit.
         """
 
-        query_set = SessionMessage.objects.filter(session=self.db_session).order_by("-created_date")
+        messages, _ = self._select_message_history(max_token_limit, message_limit)
+
+        return messages
+
+    def _select_message_history(
+        self, max_token_limit: int = 2000, message_limit: Optional[int] = None
+    ) -> tuple[list[Message], int]:
+        """
+        Selects the chat history within the maximum token limit, returns its messages and
+            the tokens they add to a prompt. The window of turns with stored token counts
+            is selected in the database, remaining turns are tokenized once each and loaded
+            in batches.
+        """
 
         if message_limit and message_limit > 0:
-            message_limit = min(message_limit, 500)
+            message_limit = min(message_limit, self.HISTORY_MESSAGE_LIMIT)
         else:
-            message_limit = 500
+            message_limit = self.HISTORY_MESSAGE_LIMIT
+
+        # tokens counted once per request regardless of the number of messages
+        base_tokens = self.llm_model_bundle.get_tokens_count([])
+        tokenizer_name = self.llm_model_bundle.get_tokenizer_name()
+
+        query_set = SessionMessage.objects.filter(session=self.db_session)
+        order_by = [F("created_date").desc(), F("id").desc()]
+        has_tokens = Q(
+            tokens_encoding=tokenizer_name,
+            query_tokens__isnull=False,
+            answer_tokens__isnull=False,
+        )
 
-        history = query_set.all()[:message_limit]
+        # running totals from the newest turn, turns without stored counts add no tokens
+        # but mark all older turns as not counted
+        window = query_set.annotate(
+            history_tokens=Window(
+                Sum(
+                    Case(
+                        When(has_tokens, then=F("query_tokens") + F("answer_tokens")),
+                        default=Value(0),
+                    )
+                ),
+                order_by=order_by,
+            ),
+            uncounted_turns=Window(
+                Sum(Case(When(has_tokens, then=Value(0)), default=Value(1))),
+                order_by=order_by,
+            ),
+        )
+        window = window.filter(
+            history_tokens__lte=max_token_limit - base_tokens, uncounted_turns=0
+        ).order_by(*order_by)
+
+        turns: list[list[Message]] = []
+        curr_message_tokens = base_tokens
+        for query, answer, history_tokens in window.values_list(
+            "query", "answer", "history_tokens"
+        )[:message_limit]:
+            turns.append([UserMessage(content=query), AssistantMessage(content=answer or "")])
+            curr_message_tokens = base_tokens + history_tokens
+
+        # continue with turns that have no stored token counts
+        offset = len(turns)
+        query_set = query_set.order_by(*order_by)
+        while offset < message_limit:
+            limit = min(offset + self.HISTORY_BATCH_SIZE, message_limit)
+            rows = list(
+                query_set.values_list(
+                    "query", "answer", "query_tokens", "answer_tokens", "tokens_encoding"
+                )[offset:limit]
+            )
+
+            for query, answer, query_tokens, answer_tokens, tokens_encoding in rows:
+                turn = [UserMessage(content=query), AssistantMessage(content=answer or "")]
+                if (
+                    tokens_encoding == tokenizer_name
+                    and query_tokens is not None
+                    and answer_tokens is not None
+                ):
+                    turn_tokens = query_tokens + answer_tokens
+                else:
+                    turn_tokens = self.llm_model_bundle.get_tokens_count(turn) - base_tokens
+                if curr_message_tokens + turn_tokens > max_token_limit:
+                    return self._flatten_turns(turns), curr_message_tokens - base_tokens
 
-        messages = []
-        for db_session_message in history:
-            messages.append(UserMessage(content=db_session_message.query))
-            messages.append(AssistantMessage(content=db_session_message.answer))
+                curr_message_tokens += turn_tokens
+                turns.append(turn)
 
-        if not messages:
-            return []
+            if len(rows) < limit - offset:
+                break
+            offset = limit
 
-        # prune the chat message if it exceeds the max token limit
-        curr_message_tokens = self.llm_model_bundle.get_tokens_count(messages)
+        return self._flatten_turns(turns), curr_message_tokens - base_tokens
 
-        if curr_message_tokens > max_token_limit:
-            pruned_memory = []
-            while curr_message_tokens > max_token_limit and len(messages) > 1:
-                pruned_memory.append(messages.pop(0))
-                curr_message_tokens = self.llm_model_bundle.get_tokens_count(messages)
+    @staticmethod
+    def _flatten_turns(turns: list[list[Message]]) -> list[Message]:
+        """
+        Converts turns collected from the newest to the oldest into a chronological
+            list of messages.
+        """
+
+        messages = []
+        for turn in reversed(turns):
+            messages.extend(turn)
 
         return messages
@@ -0,0 +1,162 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from typing import List, Optional
+
+from genflow.apps.ai.llm.messages import Message, SystemMessage, UserMessage
+from genflow.apps.session.transform.base import PromptTemplateEntity
+from genflow.apps.session.transform.simple import SimplePromptTransform
+
+
+class PromptSegments:
+    """
+    Represents the system and user messages of a prompt for a given context,
+    together with the tokens they add to the prompt.
+    """
+
+    __slots__ = ("system_message", "system_tokens", "user_message", "user_tokens")
+
+    def __init__(
+        self,
+        system_message: Optional[SystemMessage],
+        system_tokens: int,
+        user_message: UserMessage,
+        user_tokens: int,
+    ) -> None:
+        self.system_message = system_message
+        self.system_tokens = system_tokens
+        self.user_message = user_message
+        self.user_tokens = user_tokens
+
+    @property
+    def tokens(self) -> int:
+        """
+        Returns the tokens of the system and user messages.
+        """
+
+        return self.system_tokens + self.user_tokens
+
+
+class PromptPlan:
+    """
+    Assembles the input messages of a request in a single pass. The system prompt, the
+    user message with its files and the chat history are built at most once per context,
+    together with their token counts, so that the prompt limit check and the max tokens
+    recalculation do not build and tokenize the prompt again.
+    """
+
+    # pylint: disable=too-many-positional-arguments
+    def __init__(
+        self,
+        prompt_transform: SimplePromptTransform,
+        prompt_template_entity: Optional[PromptTemplateEntity],
+        query: Optional[str] = None,
+        files: Optional[str] = None,
+        memory: bool = False,
+    ) -> None:
+        """
+        Initializes the plan of the given prompt template, query, files and memory.
+        """
+
+        self.prompt_transform = prompt_transform
+        self.llm_model_bundle = prompt_transform.llm_model_bundle
+        self.pre_prompt = (
+            prompt_template_entity.simple_prompt_template if prompt_template_entity else None
+        )
+        self.query = query
+        self.files = files
+        self.memory = memory
+
+        # tokens of the input messages, set once the messages are built
+        self.prompt_tokens: Optional[int] = None
+
+        self._base_tokens: Optional[int] = None
+        self._segments: dict[Optional[str], PromptSegments] = {}
+
+    @property
+    def base_tokens(self) -> int:
+        """
+        Returns the tokens counted once per prompt regardless of the number of messages.
+        """
+
+        if self._base_tokens is None:
+            self._base_tokens = self.llm_model_bundle.get_tokens_count([])
+
+        return self._base_tokens
+
+    def get_segments(
+        self, context: Optional[str] = None, context_tokens: Optional[int] = None
+    ) -> PromptSegments:
+        """
+        Returns the system and user messages for the given context, building and counting
+            them only once. If the tokens of the context are given, e.g. from a cache, the
+            context is not tokenized again but added to the tokens of the system prompt.
+        """
+
+        segments = self._segments.get(context)
+        if segments is not None:
+            return segments
+
+        prompt = self.prompt_transform.get_system_prompt(self.pre_prompt, context)
+
+        system_message = None
+        system_tokens = 0
+        if prompt and self.query:
+            system_message = SystemMessage(content=prompt)
+            if context and context_tokens is not None:
+                system_tokens = self.get_segments("").system_tokens + context_tokens
+            else:
+                system_tokens = self.llm_model_bundle.get_message_tokens_count(system_message)
+
+        if self.query and self._segments:
+            # with a query the user message does not depend on the context
+            built = next(iter(self._segments.values()))
+            user_message, user_tokens = built.user_message, built.user_tokens
+        else:
+            user_message = self.prompt_transform.get_last_user_message(
+                self.query if self.query else prompt, self.files
+            )
+            user_tokens = self.llm_model_bundle.get_message_tokens_count(user_message)
+
+        segments = PromptSegments(system_message, system_tokens, user_message, user_tokens)
+        self._segments[context] = segments
+
+        return segments
+
+    def get_prompt_tokens_without_memory(self, context: Optional[str] = None) -> int:
+        """
+        Returns the tokens of the prompt for the given context without the chat history.
+        """
+
+        return self.base_tokens + self.get_segments(context).tokens
+
+    def get_messages(
+        self, context: Optional[str] = None, context_tokens: Optional[int] = None
+    ) -> tuple[List[Message], Optional[List[str]]]:
+        """
+        Builds the input messages for the given context, including the chat history within
+            the remaining token budget if memory is enabled. Returns the input messages and
+            stop tokens, and stores the tokens of the input messages in prompt_tokens.
+        """
+
+        segments = self.get_segments(context, context_tokens)
+
+        messages: list[Message] = []
+        if segments.system_message is not None:
+            messages.append(segments.system_message)
+
+        history_tokens = 0
+        if self.memory:
+            remaining_tokens = self.prompt_transform._calculate_remaining_token(
+                messages, prompt_tokens=self.base_tokens + segments.system_tokens
+            )
+            histories, history_tokens = self.prompt_transform._select_message_history(
+                remaining_tokens
+            )
+            messages.extend(histories)
+
+        messages.append(segments.user_message)
+        self.prompt_tokens = self.base_tokens + segments.tokens + history_tokens
+
+        return messages, None
@@ -66,10 +66,8 @@ class SimplePromptTransform(BasePromptTransform):
         """
 
         messages = []
-        prompt = pre_prompt
+        prompt = self.get_system_prompt(pre_prompt, context)
 
-        if context is not None:
-            prompt = f"{prompt}\nCONTEXT:{context}\n"
         if prompt and query:
             messages.append(SystemMessage(content=prompt))
 
@@ -85,6 +83,17 @@ class SimplePromptTransform(BasePromptTransform):
 
         return messages, None
 
+    def get_system_prompt(self, pre_prompt: Optional[str], context: Optional[str]) -> Optional[str]:
+        """
+        Combines the pre-prompt and the context into the system prompt.
+        """
+
+        prompt = pre_prompt
+        if context is not None:
+            prompt = f"{prompt}\nCONTEXT:{context}\n"
+
+        return prompt
+
     def get_last_user_message(
         self,
         prompt: str,
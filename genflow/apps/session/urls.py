@@ -4,10 +4,11 @@
 
 from rest_framework import routers
 
-from genflow.apps.session.views import SessionMessageViewSet, SessionViewSet
+from genflow.apps.session.views import SessionMessageViewSet, SessionViewSet, UsageViewSet
 
 router = routers.DefaultRouter(trailing_slash=False)
 router.register("sessions", SessionViewSet)
 router.register("messages", SessionMessageViewSet, basename="message")
+router.register("usage", UsageViewSet, basename="usage")
 
 urlpatterns = router.urls
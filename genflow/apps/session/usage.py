@@ -0,0 +1,223 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+from datetime import timezone
+from typing import Any, Dict, Iterable, Optional, Type
+
+from django.db import models, transaction
+from django.db.models.functions import TruncDate
+
+from genflow.apps.session.models import (
+    ModelDailyUsage,
+    SessionMessage,
+    SessionType,
+    SessionUsage,
+    TeamDailyUsage,
+    UsageRollup,
+)
+
+# fields of the usage rollups holding prices, aggregated from the prices of the messages
+PRICE_FIELDS = {
+    "total_price": "total_price_nanos",
+    "input_price": "input_price_nanos",
+    "output_price": "output_price_nanos",
+}
+
+
+def get_usage_aggregates() -> Dict[str, models.Aggregate]:
+    """
+    Returns the aggregates of the usage of session messages, named after the fields of the
+        usage rollups. Prices are aggregated in billionths of the currency.
+    """
+
+    return {
+        "messages": models.Count("id"),
+        "usage_messages": models.Count("total_tokens"),
+        "input_tokens": models.Sum("input_tokens", default=0),
+        "output_tokens": models.Sum("output_tokens", default=0),
+        **{
+            field: models.Sum(price_field, default=0) for field, price_field in PRICE_FIELDS.items()
+        },
+    }
+
+
+def get_model_config_value(field: str) -> models.Expression:
+    """
+    Returns an expression of a field of the model configuration used by the session of a
+        message, depending on the session type as in `Session.get_model_config`.
+    """
+
+    return models.Case(
+        models.When(
+            session__session_type=SessionType.PROMPT.value,
+            then=models.F(f"session__related_prompt__related_model__{field}"),
+        ),
+        models.When(
+            session__session_type=SessionType.ASSISTANT.value,
+            then=models.F(f"session__related_assistant__related_model__{field}"),
+        ),
+        default=models.F(f"session__related_model__{field}"),
+    )
+
+
+def get_message_usage(message: SessionMessage) -> Dict[str, Any]:
+    """
+    Returns the usage of a session message, named after the fields of the usage rollups.
+    """
+
+    values = {"messages": 1}
+    if message.total_tokens is None:
+        return values
+
+    values.update(
+        {
+            "usage_messages": 1,
+            "input_tokens": message.input_tokens,
+            "output_tokens": message.output_tokens,
+            **{
+                field: SessionMessage.from_price_nanos(getattr(message, price_field))
+                for field, price_field in PRICE_FIELDS.items()
+            },
+        }
+    )
+    return values
+
+
+def increment_rollup(rollup_model: Type[UsageRollup], key: Dict[str, Any], values: dict):
+    """
+    Adds the given values to the rollup row of the given key, creating it if needed.
+    """
+
+    rollup, _ = rollup_model.objects.get_or_create(**key)
+    rollup_model.objects.filter(pk=rollup.pk).update(
+        **{name: models.F(name) + value for name, value in values.items()}
+    )
+
+
+@transaction.atomic
+def add_message_usage(message: SessionMessage) -> None:
+    """
+    Adds the usage of a new session message to the usage rollups, in the transaction that
+        creates the message.
+    """
+
+    values = get_message_usage(message)
+    day = message.created_date.astimezone(timezone.utc).date()
+
+    increment_rollup(SessionUsage, {"session_id": message.session_id, "day": day}, values)
+    increment_rollup(TeamDailyUsage, {"team_id": message.team_id, "day": day}, values)
+
+    model_config = message.session.get_model_config()
+    if model_config is not None:
+        increment_rollup(
+            ModelDailyUsage,
+            {
+                "team_id": message.team_id,
+                "provider_name": model_config.provider_name,
+                "model_name": model_config.model_name,
+                "day": day,
+            },
+            values,
+        )
+
+
+@transaction.atomic
+def rebuild_usage_rollups(team_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recomputes the usage rollups of the given teams, or of all the teams, from the session
+        messages. Returns the number of rollup rows created. The usage of deleted sessions
+        is not kept by the team and model rollups once they are rebuilt.
+    """
+
+    messages = SessionMessage.objects.all()
+    rollups = {
+        SessionUsage: SessionUsage.objects.all(),
+        TeamDailyUsage: TeamDailyUsage.objects.all(),
+        ModelDailyUsage: ModelDailyUsage.objects.all(),
+    }
+    if team_ids is not None:
+        team_ids = list(team_ids)
+        messages = messages.filter(team_id__in=team_ids)
+        rollups[SessionUsage] = rollups[SessionUsage].filter(session__team_id__in=team_ids)
+        rollups[TeamDailyUsage] = rollups[TeamDailyUsage].filter(team_id__in=team_ids)
+        rollups[ModelDailyUsage] = rollups[ModelDailyUsage].filter(team_id__in=team_ids)
+
+    for queryset in rollups.values():
+        queryset.delete()
+
+    messages = messages.annotate(
+        day=TruncDate("created_date", tzinfo=timezone.utc),
+        provider_name=get_model_config_value("provider_name"),
+        model_name=get_model_config_value("model_name"),
+    )
+    keys = {
+        SessionUsage: ["session_id", "day"],
+        TeamDailyUsage: ["team_id", "day"],
+        ModelDailyUsage: ["team_id", "provider_name", "model_name", "day"],
+    }
+
+    created = 0
+    for rollup_model, key in keys.items():
+        source = messages
+        if rollup_model is ModelDailyUsage:
+            # messages of sessions without a model configuration are left out
+            source = source.filter(provider_name__isnull=False, model_name__isnull=False)
+        rows = source.values(*key).annotate(**get_usage_aggregates()).order_by(*key)
+        for row in rows:
+            for field in PRICE_FIELDS:
+                row[field] = SessionMessage.from_price_nanos(row[field])
+        created += len(rollup_model.objects.bulk_create(rollup_model(**row) for row in rows))
+
+    return created
+
+
+def get_empty_usage() -> Dict[str, Any]:
+    """
+    Returns the usage of a session without messages.
+    """
+
+    return {
+        "total_messages": 0,
+        "total_input_tokens": 0,
+        "total_output_tokens": 0,
+        "total_price": 0,
+        "total_input_price": 0,
+        "total_output_price": 0,
+        "currency": "USD",
+        "per_day": [],
+    }
+
+
+def get_sessions_usage(session_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Returns the usage of the given sessions, read from their daily usage rollups with a
+        single query.
+    """
+
+    rollups = SessionUsage.objects.filter(session_id__in=list(session_ids)).order_by(
+        "session_id", "day"
+    )
+
+    sessions_usage: Dict[int, Dict[str, Any]] = {}
+    for rollup in rollups:
+        usage = sessions_usage.setdefault(rollup.session_id, get_empty_usage())
+        usage["total_messages"] += rollup.messages
+        # days of messages without usage are left out of the totals
+        if rollup.usage_messages == 0:
+            continue
+
+        usage["total_input_tokens"] += rollup.input_tokens
+        usage["total_output_tokens"] += rollup.output_tokens
+        usage["total_price"] += rollup.total_price
+        usage["total_input_price"] += rollup.input_price
+        usage["total_output_price"] += rollup.output_price
+        usage["per_day"].append(
+            {
+                "total_messages": rollup.usage_messages,
+                "total_price": rollup.total_price,
+                "day": rollup.day.strftime("%Y-%m-%d"),
+            }
+        )
+
+    return sessions_usage
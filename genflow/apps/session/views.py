@@ -6,6 +6,7 @@ import shutil
 from os import path as osp
 from typing import Generator, Union, cast
 
+from django.db.models import QuerySet, Sum
 from django.http import StreamingHttpResponse
 from drf_spectacular.utils import (
     OpenApiParameter,
@@ -24,16 +25,21 @@ from genflow.apps.core.mixin import FileManagementMixin
 from genflow.apps.core.models import Provider
 from genflow.apps.core.serializers import FileEntitySerializer
 from genflow.apps.prompt.models import Prompt
+from genflow.apps.restriction.mixin import AtomicLimitViewMixin
 from genflow.apps.session import permissions as perms
 from genflow.apps.session.generator.chat import ChatGenerator
 from genflow.apps.session.generator.entities import ChatResponse, ChatResponseType, GenerateRequest
-from genflow.apps.session.models import Session, SessionMessage
+from genflow.apps.session.models import ModelDailyUsage, Session, SessionMessage, TeamDailyUsage
 from genflow.apps.session.serializers import (
+    DailyUsageReadSerializer,
     GenerateRequestSerializer,
+    ModelUsageReadSerializer,
     SessionMessageReadSerializer,
     SessionMessageWriteSerializer,
     SessionReadSerializer,
     SessionWriteSerializer,
+    UsageFilterSerializer,
+    usage_total_fields,
 )
 from genflow.apps.team.middleware import HttpRequestWithIamContext
 
@@ -125,14 +131,23 @@ from genflow.apps.team.middleware import HttpRequestWithIamContext
         },
     ),
 )
-class SessionViewSet(viewsets.ModelViewSet, FileManagementMixin):
+class SessionViewSet(AtomicLimitViewMixin, viewsets.ModelViewSet, FileManagementMixin):
     """
     Provides CRUD operations and additional functionality
     for managing Session objects.
     """
 
-    queryset = Session.objects.all().order_by("created_date")
+    queryset = Session.objects.select_related(
+        "owner",
+        "related_model",
+        "related_prompt__related_model",
+        "related_prompt__group",
+        "related_assistant__related_model",
+        "related_assistant__group",
+    ).order_by("created_date")
     iam_team_field = "team"
+    cursor_ordering = ("created_date", "id")
+    limited_actions = ("create", "upload_file")
 
     def get_serializer_class(self):
         """
@@ -256,6 +271,9 @@ class SessionViewSet(viewsets.ModelViewSet, FileManagementMixin):
         message_serializer.save(
             owner=self.request.user,
             team=self.request.iam_context.team,
+            **self.message_generator.count_message_tokens(
+                generate_request.query, result.message.content
+            ),
         )
         return message_serializer
 
@@ -348,6 +366,7 @@ class SessionMessageViewSet(
     queryset = SessionMessage.objects.all().order_by("created_date")
     filterset_fields = ["session"]
     iam_team_field = "team"
+    cursor_ordering = ("created_date", "id")
 
     def get_serializer_class(self):
         """
@@ -379,3 +398,78 @@ class SessionMessageViewSet(
                 status=status.HTTP_400_BAD_REQUEST, data="session ID is required to list messages"
             )
         return super().list(request, *args, **kwargs)
+
+
+@extend_schema(tags=["usage"])
+@extend_schema_view(
+    daily=extend_schema(
+        summary="Get daily usage",
+        description="Get the usage of the team per day, read from the daily usage rollups.",
+        parameters=[UsageFilterSerializer],
+        responses={
+            200: DailyUsageReadSerializer(many=True),
+        },
+    ),
+    models=extend_schema(
+        summary="Get usage per model",
+        description="Get the usage of the team per model over a date range, "
+        "read from the daily usage rollups.",
+        parameters=[UsageFilterSerializer],
+        responses={
+            200: ModelUsageReadSerializer(many=True),
+        },
+    ),
+)
+class UsageViewSet(viewsets.ViewSet):
+    """
+    Provides usage analytics of a team. Only the usage rollups are read, so that the cost of
+    a query depends on the number of days, not on the number of messages.
+    """
+
+    serializer_class = None
+    iam_team_field = None
+
+    # To get nice documentation about UsageViewSet actions it is necessary
+    # to implement the method. By default, ViewSet doesn't provide it.
+    def get_serializer(self, *args, **kwargs):
+        pass
+
+    def filter_rollups(self, request, queryset: QuerySet) -> QuerySet:
+        """
+        Filters the rollups of the team of the request by the requested date range.
+        """
+
+        serializer = UsageFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        queryset = queryset.filter(team=request.iam_context.team)
+        if "start_date" in serializer.validated_data:
+            queryset = queryset.filter(day__gte=serializer.validated_data["start_date"])
+        if "end_date" in serializer.validated_data:
+            queryset = queryset.filter(day__lte=serializer.validated_data["end_date"])
+        return queryset
+
+    @action(detail=False, methods=["GET"])
+    def daily(self, request) -> Response:
+        """
+        Retrieves the usage of the team per day.
+        """
+
+        rollups = self.filter_rollups(request, TeamDailyUsage.objects.all()).order_by("day")
+        serializer = DailyUsageReadSerializer(rollups, many=True)
+        return Response({"results": serializer.data, "count": len(serializer.data)})
+
+    @action(detail=False, methods=["GET"])
+    def models(self, request) -> Response:
+        """
+        Retrieves the usage of the team per model.
+        """
+
+        rollups = (
+            self.filter_rollups(request, ModelDailyUsage.objects.all())
+            .values("provider_name", "model_name")
+            .annotate(**{field: Sum(field) for field in usage_total_fields})
+            .order_by("provider_name", "model_name")
+        )
+        serializer = ModelUsageReadSerializer(rollups, many=True)
+        return Response({"results": serializer.data, "count": len(serializer.data)})
@@ -11,7 +11,7 @@ class TeamConfig(AppConfig):
     def ready(self):
         from django.conf import settings
 
-        from genflow.apps.restriction.registry import register_limit
+        from genflow.apps.restriction.registry import register_counter, register_limit
 
         # Register limits for the team app
         register_limit("team", "TEAM", "Max teams", default=settings.GF_LIMITS.get("TEAM", None))
@@ -22,6 +22,14 @@ class TeamConfig(AppConfig):
             default=settings.GF_LIMITS.get("MAX_INVITATION_PER_TEAM", None),
         )
 
+        # Register the usage counted for the limits
+        register_counter("TEAM", "team.Team", {"user": "owner_id"})
+        register_counter(
+            "MAX_INVITATION_PER_TEAM",
+            "team.Invitation",
+            {"user": "owner_id", "team": "membership__team_id"},
+        )
+
         from genflow.apps.team.signals import register_signals
 
         register_signals(self)
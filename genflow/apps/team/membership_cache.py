@@ -0,0 +1,80 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+from django.conf import settings
+
+
+class MembershipEntry(NamedTuple):
+    """
+    Represents the role of a user in a team, None if the user is not an active member.
+    """
+
+    expires_at: float
+    role: Optional[str]
+
+
+class MembershipCache:
+    """
+    Caches the roles of users in teams for a short time, so that permission checks do not
+    query the active membership on every request. Entries are invalidated by the membership
+    signals of the worker that changes them, other workers serve them until they expire.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        config = settings.GF_MEMBERSHIP_CACHE
+        self.ttl = ttl if ttl is not None else config["TTL"]
+        self.max_entries = max_entries if max_entries is not None else config["MAX_ENTRIES"]
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[int, int], MembershipEntry] = OrderedDict()
+
+    def get_role(
+        self, team_id: int, user_id: int, loader: Callable[[], Optional[str]]
+    ) -> Optional[str]:
+        """
+        Returns the role of the user in the team, loading it with the loader if it is not
+            cached.
+        """
+
+        key = (team_id, user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry.role
+
+        role = loader()
+        if self.ttl <= 0:
+            return role
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = MembershipEntry(expires_at=time.monotonic() + self.ttl, role=role)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return role
+
+    def invalidate(self, team_id: int, user_id: int) -> None:
+        """
+        Removes the role of the user in the team, e.g. when the membership is changed.
+        """
+
+        with self._lock:
+            self._entries.pop((team_id, user_id), None)
+
+    def clear(self) -> None:
+        """
+        Removes all roles.
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+
+membership_cache = MembershipCache()
@@ -6,8 +6,9 @@ from django.conf import settings
 from django.db.models import Q
 
 from genflow.apps.iam.permissions import GenFLowBasePermission, StrEnum
+from genflow.apps.restriction.counters import get_usage
 from genflow.apps.restriction.mixin import LimitMixin
-from genflow.apps.team.models import Invitation, Team, TeamRole
+from genflow.apps.team.models import TeamRole
 
 
 class TeamPermission(GenFLowBasePermission, LimitMixin):
@@ -15,6 +16,8 @@ class TeamPermission(GenFLowBasePermission, LimitMixin):
     Handles the permissions for team-related actions.
     """
 
+    basename = "team"
+
     class Scopes(StrEnum):
         """
         Defines various permission scopes.
@@ -50,7 +53,7 @@ class TeamPermission(GenFLowBasePermission, LimitMixin):
         """
 
         permissions = []
-        if view.basename == "team":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -62,17 +65,15 @@ class TeamPermission(GenFLowBasePermission, LimitMixin):
         Get the number of teams owned by the user.
         """
 
-        return Team.objects.filter(owner_id=self.user_id).count()
+        return get_usage("TEAM", "user", self.user_id)
 
     def get_team_usage(self) -> int:
         """
         Get the number of teams owned by the team.
         """
 
-        if self.team_id is None:
-            return 0
-
-        return Team.objects.filter(team_id=self.team_id).count()
+        # teams are not owned by teams
+        return 0
 
     def check_access(self) -> bool:
         """
@@ -132,6 +133,8 @@ class MembershipPermission(GenFLowBasePermission):
     Handles the permissions for membership-related actions.
     """
 
+    basename = "membership"
+
     class Scopes(StrEnum):
         """
         Defines various permission scopes.
@@ -165,7 +168,7 @@ class MembershipPermission(GenFLowBasePermission):
         """
 
         permissions = []
-        if view.basename == "membership":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -225,6 +228,8 @@ class InvitationPermission(GenFLowBasePermission, LimitMixin):
     Handles the permissions for invitation-related actions.
     """
 
+    basename = "invitation"
+
     class Scopes(StrEnum):
         """
         Defines various permission scopes.
@@ -258,7 +263,7 @@ class InvitationPermission(GenFLowBasePermission, LimitMixin):
         """
 
         permissions = []
-        if view.basename == "invitation":
+        if view.basename == cls.basename:
             for scope in cls.get_scopes(request, view, obj):
                 self = cls.create_base_perm(request, view, scope, iam_context, obj)
                 permissions.append(self)
@@ -270,7 +275,7 @@ class InvitationPermission(GenFLowBasePermission, LimitMixin):
         Get the number of teams owned by the user.
         """
 
-        return Invitation.objects.filter(owner_id=self.user_id).count()
+        return get_usage("MAX_INVITATION_PER_TEAM", "user", self.user_id)
 
     def get_team_usage(self) -> int:
         """
@@ -280,7 +285,7 @@ class InvitationPermission(GenFLowBasePermission, LimitMixin):
         if self.team_id is None:
             return 0
 
-        return Invitation.objects.filter(membership__team_id=self.team_id).count()
+        return get_usage("MAX_INVITATION_PER_TEAM", "team", self.team_id)
 
     def check_access(self) -> bool:
         """
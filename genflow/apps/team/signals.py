@@ -7,11 +7,14 @@ from os import path as osp
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
 
+from genflow.apps.common.security.keyring import keyring
 from genflow.apps.restriction.signals import add_global_limits
-from genflow.apps.team.models import Team
+from genflow.apps.team.membership_cache import membership_cache
+from genflow.apps.team.models import Membership, Team
 
 
 # post_migrate is different from other signals
@@ -29,6 +32,15 @@ def delete_key_on_team_delete(sender, instance, **kwargs):
     key_dir = osp.join(settings.BASE_DIR, "keys", "teams", str(instance.id))
     if osp.exists(key_dir):
         shutil.rmtree(key_dir)
+    keyring.invalidate(str(instance.id))
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def invalidate_membership_cache(sender, instance, **kwargs):
+    # invalidate again on commit, a role cached by another request meanwhile is stale
+    membership_cache.invalidate(instance.team_id, instance.user_id)
+    transaction.on_commit(lambda: membership_cache.invalidate(instance.team_id, instance.user_id))
 
 
 def create_default_team(sender, instance, created, **kwargs):
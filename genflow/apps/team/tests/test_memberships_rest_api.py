@@ -2,9 +2,13 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
+from unittest import mock
+
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from genflow.apps.iam import permissions
+from genflow.apps.team.membership_cache import membership_cache
 from genflow.apps.team.models import Membership, TeamRole
 from genflow.apps.team.serializers import MembershipReadSerializer
 from genflow.apps.team.tests.utils import ForceLogin, create_dummy_users
@@ -71,6 +75,17 @@ class MembershipListAPITestCase(MembershipAPITestCase):
                 # we have one membership per team, for team owner
                 self.assertEqual(response.data["count"], 1)
 
+    def test_list_memberships_by_team_user_iam_context_once(self):
+        user = self.regular_users[0]
+        team = user["teams"][0]["team"]
+        with mock.patch.object(
+            permissions, "build_iam_context", wraps=permissions.build_iam_context
+        ) as build_iam_context:
+            response = self.list_memberships(user["user"], team_id=team.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # has_permission and get_queryset share the IAM context of the request
+        build_iam_context.assert_called_once()
+
 
 class MembershipRetrieveAPITestCase(MembershipAPITestCase):
     def retrieve_membership(self, user, membership_id):
@@ -221,3 +236,46 @@ class MembershipDeleteAPITestCase(MembershipAPITestCase):
                     self.assertTrue(
                         Membership.objects.filter(id=team_membership["membership"].id).exists()
                     )
+
+
+class MembershipCacheAPITestCase(MembershipAPITestCase):
+    def setUp(self):
+        membership_cache.clear()
+        patcher = mock.patch.object(membership_cache, "ttl", 60)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(membership_cache.clear)
+
+    def list_memberships(self, user, team_id: int):
+        with ForceLogin(user, self.client):
+            response = self.client.get(f"/api/memberships?team={team_id}")
+        return response
+
+    def test_membership_role_cached(self):
+        user = self.regular_users[0]
+        team_membership = next(item for item in user["teams"] if item["membership"].is_active)
+        team = team_membership["team"]
+        response = self.list_memberships(user["user"], team.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        loader = mock.Mock()
+        role = membership_cache.get_role(team.id, user["user"].id, loader)
+        self.assertEqual(role, team_membership["membership"].role)
+        loader.assert_not_called()
+
+    def test_membership_role_invalidated_on_save(self):
+        user = self.regular_users[0]
+        team_membership = next(item for item in user["teams"] if item["membership"].is_active)
+        team = team_membership["team"]
+        self.list_memberships(user["user"], team.id)
+
+        team_membership["membership"].role = TeamRole.MEMBER.value
+        team_membership["membership"].save()
+        loader = mock.Mock(return_value=TeamRole.MEMBER.value)
+        role = membership_cache.get_role(team.id, user["user"].id, loader)
+        self.assertEqual(role, TeamRole.MEMBER.value)
+        loader.assert_called_once()
+
+        with ForceLogin(user["user"], self.client):
+            response = self.client.delete(f"/api/memberships/{team_membership['membership'].id}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -17,6 +17,7 @@ from rest_framework.response import Response
 import genflow.apps.team.models as models
 import genflow.apps.team.permissions as perms
 import genflow.apps.team.serializers as serializers
+from genflow.apps.restriction.mixin import AtomicLimitViewMixin
 from genflow.apps.team.middleware import HttpRequestWithIamContext
 
 
@@ -62,7 +63,7 @@ from genflow.apps.team.middleware import HttpRequestWithIamContext
         },
     ),
 )
-class TeamViewSet(viewsets.ModelViewSet):
+class TeamViewSet(AtomicLimitViewMixin, viewsets.ModelViewSet):
     """
     TeamViewSet is a viewset for handling CRUD operations on the Team model.
     """
@@ -228,6 +229,7 @@ class MembershipViewSet(
     ),
 )
 class InvitationViewSet(
+    AtomicLimitViewMixin,
     viewsets.GenericViewSet,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
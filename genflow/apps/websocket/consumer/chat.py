@@ -2,12 +2,14 @@
 #
 # Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
 
-import asyncio
+from typing import Optional
 
 from channels.db import database_sync_to_async
+from django.db import transaction
 
 from genflow.apps.ai.llm.entities import Result
 from genflow.apps.core.models import Provider
+from genflow.apps.restriction.counters import get_usage
 from genflow.apps.restriction.models import Limit
 from genflow.apps.session.generator.chat import ChatGenerator
 from genflow.apps.session.generator.entities import ChatResponse, ChatResponseType, GenerateRequest
@@ -16,6 +18,7 @@ from genflow.apps.session.serializers import GenerateRequestSerializer, SessionM
 from genflow.apps.websocket.auth_middleware import WebSocketRequest
 from genflow.apps.websocket.consumer import exception
 from genflow.apps.websocket.consumer.base import BaseConsumer
+from genflow.apps.websocket.consumer.stream import ChunkStream
 
 
 class ChatGenerateConsumer(BaseConsumer):
@@ -71,18 +74,20 @@ class ChatGenerateConsumer(BaseConsumer):
 
         try:
             global_limit = Limit.objects.get(key="MESSAGE", user=None, team=None)
-            return bool(global_limit.value <= db_session.sessionmessage_set.count())
+            return bool(
+                global_limit.value <= get_usage("MESSAGE", "session", db_session.id, lock=False)
+            )
         except Limit.DoesNotExist:
             # If no limit is set globally, return False (not limited)
             return False
 
-    def send_chunk(self, chunk: str = None):
+    async def send_chunk(self, chunk: str = None):
         """
         Sends a chunk of data as a JSON response to the WebSocket client.
         """
 
-        response = ChatResponse(type=ChatResponseType.CHUNK, data=chunk)
-        asyncio.run(self.send_json(response.model_dump(mode="json")))
+        # same payload as ChatResponse, built directly since it is sent for every frame
+        await self.send_json({"type": ChatResponseType.CHUNK.value, "data": chunk})
 
     async def receive_json(self, json_data, **kwargs):
         """
@@ -111,20 +116,59 @@ class ChatGenerateConsumer(BaseConsumer):
             response = ChatResponse(type=ChatResponseType.ERROR, data=str(e))
             await self.send_json(response.model_dump(mode="json"))
 
-    @database_sync_to_async
-    def handle_request(self, serializer: GenerateRequestSerializer) -> SessionMessage:
+    async def handle_request(self, serializer: GenerateRequestSerializer) -> SessionMessage:
         """
         Processes the validated request data, generates a response using the ChatGenerator,
             updates the session model parameters, and creates a SessionMessage instance.
+            The model response is awaited on the event loop, only the database work runs
+            in worker threads. Chunks are coalesced into frames by a ChunkStream.
+        """
+
+        generate_request, related_model_data = await self.validate_request(serializer)
+
+        result: Result = None
+        stream = ChunkStream(send=self.send_chunk)
+        try:
+            async for item in self.generator.agenerate(generate_request=generate_request):
+                if isinstance(item, Result):
+                    result = item
+                else:
+                    await stream.put(item)
+        finally:
+            # send the buffered chunks before the message
+            await stream.close()
+
+        return await self.save_message(generate_request, related_model_data, result)
+
+    @database_sync_to_async
+    def validate_request(
+        self, serializer: GenerateRequestSerializer
+    ) -> tuple[GenerateRequest, Optional[dict]]:
+        """
+        Validates the request data, returns the generate request and the updated model
+            configuration of the session, if any.
         """
+
         serializer.is_valid(raise_exception=True)
 
         related_model_data = serializer.validated_data.pop("related_model", None)
 
         generate_request = GenerateRequest(**serializer.validated_data)
         generate_request.user_id = str(self.scope["user"].id)
-        generate_request.callback = self.send_chunk
-        result: Result = self.generator.generate(generate_request=generate_request)
+
+        return generate_request, related_model_data
+
+    @database_sync_to_async
+    @transaction.atomic
+    def save_message(
+        self,
+        generate_request: GenerateRequest,
+        related_model_data: Optional[dict],
+        result: Result,
+    ) -> SessionMessage:
+        """
+        Updates the session model parameters and creates the SessionMessage of the result.
+        """
 
         # update model parameters
         db_session = self.generator.db_session
@@ -140,6 +184,7 @@ class ChatGenerateConsumer(BaseConsumer):
             session=db_session,
             owner=self.scope["user"],
             team=request.iam_context.team,
+            **self.generator.count_message_tokens(generate_request.query, result.message.content),
         )
 
         return session_message
@@ -0,0 +1,126 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from django.conf import settings
+
+from genflow.apps.common.log import ServerLogManager
+
+slogger = ServerLogManager(__name__)
+
+# marks the end of the stream in the queue
+_CLOSE = object()
+
+
+class ChunkStream:
+    """
+    Bridges generated text chunks to the websocket of a consumer. Chunks are coalesced into
+    frames that are sent once `flush_size` characters are buffered or `flush_interval` seconds
+    passed since the first buffered chunk. The queue is bounded, producers wait while the
+    client reads slowly, which in turn stops reading the model stream.
+    """
+
+    # pylint: disable=too-many-positional-arguments
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable],
+        flush_interval: Optional[float] = None,
+        flush_size: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        """
+        Starts sending the frames of the stream with the given coroutine function, the other
+            arguments default to the GF_CHAT_STREAM settings. Must be created on the event loop
+            of the consumer.
+        """
+
+        config = settings.GF_CHAT_STREAM
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else config["FLUSH_INTERVAL"]
+        )
+        self.flush_size = flush_size if flush_size is not None else config["FLUSH_SIZE"]
+        max_pending = max_pending if max_pending is not None else config["MAX_PENDING_CHUNKS"]
+
+        self.chunks = 0
+        self.frames = 0
+        self._send = send
+        self._error: Optional[Exception] = None
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._task = self._loop.create_task(self._run())
+
+    async def put(self, chunk: str) -> None:
+        """
+        Adds a chunk to the stream, waiting while the queue is full.
+            Raises the error of the sender if sending a frame failed.
+        """
+
+        if self._error is not None:
+            raise self._error
+
+        if chunk:
+            self.chunks += 1
+            await self._queue.put(chunk)
+
+    async def close(self) -> None:
+        """
+        Sends the buffered chunks and stops the stream.
+        """
+
+        if not self._task.done():
+            await self._queue.put(_CLOSE)
+            await self._task
+
+    async def _run(self) -> None:
+        """
+        Sends the frames of the stream. After a failed send the queue is still drained,
+            so that producers are not blocked.
+        """
+
+        try:
+            await self._send_frames()
+        except Exception as e:
+            slogger.glob.warning(f"Failed to send chat stream: {str(e)}")
+            # raised again in the producers, without the frames of this running task
+            self._error = e.with_traceback(None)
+            while await self._queue.get() is not _CLOSE:
+                pass
+
+    async def _send_frames(self) -> None:
+        """
+        Coalesces the queued chunks into frames and sends them until the stream is closed.
+        """
+
+        closed = False
+        while not closed:
+            chunk = await self._queue.get()
+            if chunk is _CLOSE:
+                return
+
+            buffer = [chunk]
+            size = len(chunk)
+            deadline = self._loop.time() + self.flush_interval
+            while size < self.flush_size:
+                if self._queue.empty():
+                    timeout = deadline - self._loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        chunk = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    chunk = self._queue.get_nowait()
+
+                if chunk is _CLOSE:
+                    closed = True
+                    break
+
+                buffer.append(chunk)
+                size += len(chunk)
+
+            self.frames += 1
+            await self._send("".join(buffer))
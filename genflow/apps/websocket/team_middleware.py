@@ -6,7 +6,7 @@ from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 from django.utils.functional import SimpleLazyObject
 
-from genflow.apps.iam.permissions import get_membership
+from genflow.apps.iam.permissions import get_membership_role
 from genflow.apps.team.middleware import IAMContext as BaseIAMContext
 from genflow.apps.team.middleware import get_team
 from genflow.apps.websocket.auth_middleware import IAMContext, WebSocketRequest
@@ -18,11 +18,11 @@ def build_iam_context(request: WebSocketRequest) -> IAMContext:
     """
 
     initial_context: BaseIAMContext = get_team(request)
-    membership = get_membership(request, initial_context.team)
+    team_role = get_membership_role(request, initial_context.team)
     iam_context = IAMContext(
         team=initial_context.team,
         privilege=initial_context.privilege,
-        team_role=getattr(membership, "role", None),
+        team_role=team_role,
     )
     return iam_context
 
@@ -0,0 +1,83 @@
+# Copyright (C) 2025 Reveal AI
+#
+# Licensed under the Apache License, Version 2.0 with Additional Commercial Terms.
+
+import asyncio
+from unittest import TestCase
+
+from genflow.apps.websocket.consumer.stream import ChunkStream
+
+
+class ChunkStreamTest(TestCase):
+    def setUp(self):
+        self.frames = []
+
+    async def send(self, frame):
+        self.frames.append(frame)
+
+    def test_coalesce_by_size(self):
+        async def run():
+            stream = ChunkStream(send=self.send, flush_interval=10, flush_size=10)
+            for i in range(100):
+                await stream.put(str(i % 10))
+            await stream.close()
+            return stream
+
+        stream = asyncio.run(run())
+        self.assertEqual("".join(self.frames), "0123456789" * 10)
+        self.assertEqual(len(self.frames), 10)
+        self.assertEqual((stream.chunks, stream.frames), (100, 10))
+
+    def test_flush_by_interval(self):
+        async def run():
+            stream = ChunkStream(send=self.send, flush_interval=0.01, flush_size=1000)
+            await stream.put("hello")
+            await asyncio.sleep(0.05)
+            await stream.put(" world")
+            await stream.close()
+
+        asyncio.run(run())
+        self.assertEqual(self.frames, ["hello", " world"])
+
+    def test_backpressure(self):
+        async def run():
+            sending = asyncio.Event()
+            release = asyncio.Event()
+
+            async def send(frame):
+                sending.set()
+                await release.wait()
+                self.frames.append(frame)
+
+            stream = ChunkStream(send=send, flush_interval=0, flush_size=1, max_pending=2)
+            await stream.put("a")
+            await sending.wait()
+
+            # the sender is blocked on "a", the queue takes two more chunks
+            await stream.put("b")
+            await stream.put("c")
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(stream.put("d"), 0.05)
+
+            release.set()
+            await stream.put("e")
+            await stream.close()
+
+        asyncio.run(run())
+        self.assertEqual("".join(self.frames), "abce")
+
+    def test_send_error(self):
+        async def run():
+            async def send(frame):
+                raise ConnectionError("closed")
+
+            stream = ChunkStream(send=send, flush_interval=0, flush_size=1, max_pending=1)
+            await stream.put("a")
+            await asyncio.sleep(0)
+            with self.assertRaises(ConnectionError):
+                for _ in range(10):
+                    await stream.put("b")
+            await stream.close()
+
+        with self.assertLogs("genflow.apps.websocket.consumer.stream", level="WARNING"):
+            asyncio.run(run())
@@ -17,10 +17,19 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "genflow.settings.development")
 # Initialize Django ASGI application early to ensure the app registry is ready
 django_asgi_app = get_asgi_application()
 
+from django.conf import settings
+
+from genflow.apps.ai import ai_provider_factory
 from genflow.apps.websocket.auth_middleware import TokenAuthMiddlewareStack
 from genflow.apps.websocket.team_middleware import IAMContextMiddleware
 from genflow.apps.websocket.urls import websocket_urlpatterns
 
+# Preload per-process model resources (e.g. tokenizers) before serving requests
+ai_provider_factory.warm_up()
+
+# Swap in changes of the model config without restarting the workers
+ai_provider_factory.watch_config(settings.GF_MODEL_CONFIG["RELOAD_INTERVAL"])
+
 application = ProtocolTypeRouter(
     {
         "http": get_asgi_application(),
@@ -335,6 +335,15 @@ os.makedirs(PROMPTS_MEDIA_ROOT, exist_ok=True)
 ASSISTANT_MEDIA_ROOT = os.path.join(MEDIA_ROOT, "assistants")
 os.makedirs(ASSISTANT_MEDIA_ROOT, exist_ok=True)
 
+CACHE_ROOT = os.path.join(DATA_ROOT, "cache")
+os.makedirs(CACHE_ROOT, exist_ok=True)
+
+# compiled by the compile_model_config command
+MODEL_CONFIG_SNAPSHOT = os.path.join(CACHE_ROOT, "model_config.json")
+
+COLLECTIONS_ROOT = os.path.join(DATA_ROOT, "collections")
+os.makedirs(COLLECTIONS_ROOT, exist_ok=True)
+
 LOGS_ROOT = os.path.join(BASE_DIR, "logs")
 os.makedirs(LOGS_ROOT, exist_ok=True)
 
@@ -452,3 +461,54 @@ GF_LIMITS = {
         "image/jpg",
     ],
 }
+
+GF_CHAT_STREAM = {
+    "FLUSH_INTERVAL": 0.02,  # 20ms, longest time a chunk waits before it is sent
+    "FLUSH_SIZE": 64,  # characters, sent right away once buffered
+    "MAX_PENDING_CHUNKS": 256,  # chunks buffered before the generation waits for the client
+}
+
+GF_EMBEDDINGS = {
+    "BATCH_SIZE": 512,  # max texts per request, lowered by the max_chunks of a model
+    "BATCH_TOKENS": 100000,  # max tokens per request
+    "CONCURRENCY": 4,  # requests sent at the same time when embedding many texts
+    "CACHE_ENTRIES": 8192,  # embeddings kept in memory per worker
+}
+
+GF_KEYRING = {
+    "MAX_ENTRIES": 256,  # parsed private keys of teams kept in memory per worker
+}
+
+GF_CREDENTIALS_CACHE = {
+    "TTL": 300,  # seconds decrypted provider credentials are kept in memory
+    "MAX_ENTRIES": 256,  # providers whose decrypted credentials are kept in memory
+}
+
+GF_MEMBERSHIP_CACHE = {
+    "TTL": 30,  # seconds roles of users in teams are kept in memory, 0 disables
+    "MAX_ENTRIES": 4096,  # memberships whose roles are kept in memory
+}
+
+GF_MODEL_CONFIG = {
+    "RELOAD_INTERVAL": 10,  # seconds between checks for changed model YAML files, 0 disables
+}
+
+GF_FILES_CONTEXT_CACHE = {
+    "MAX_ENTRIES": 32,  # assistants whose files context is kept in memory
+}
+
+GF_FILES_RETRIEVAL = {
+    "ENABLED": False,  # default of assistants not setting `files_retrieval` in collection_config
+    "CHUNK_SIZE": 200,  # words per chunk
+    "CHUNK_OVERLAP": 20,  # words shared by consecutive chunks
+    "TOP_K": 8,  # best matching chunks considered for the context
+    "TOKEN_BUDGET": 2000,  # max tokens of the chunks injected into the prompt
+    "MAX_ENTRIES": 32,  # assistants whose files index is kept in memory
+}
+
+GF_VECTOR_COLLECTIONS = {
+    "PARTITION_MIN_VECTORS": 50000,  # collections with fewer vectors are searched exhaustively
+    "PARTITION_PROBES": 8,  # closest lists scored by a search in a partitioned collection
+    "TOP_K": 8,  # chunks searched as the context of a message
+    "TOKEN_BUDGET": 2000,  # max tokens of the chunks used as context
+}
@@ -40,9 +40,21 @@ os.makedirs(PROMPTS_MEDIA_ROOT, exist_ok=True)
 ASSISTANT_MEDIA_ROOT = os.path.join(MEDIA_ROOT, "assistants")
 os.makedirs(ASSISTANT_MEDIA_ROOT, exist_ok=True)
 
+CACHE_ROOT = os.path.join(DATA_ROOT, "cache")
+os.makedirs(CACHE_ROOT, exist_ok=True)
+
+# compiled by the compile_model_config command
+MODEL_CONFIG_SNAPSHOT = os.path.join(CACHE_ROOT, "model_config.json")
+
+COLLECTIONS_ROOT = os.path.join(DATA_ROOT, "collections")
+os.makedirs(COLLECTIONS_ROOT, exist_ok=True)
+
 LOGS_ROOT = os.path.join(BASE_DIR, "logs")
 os.makedirs(LOGS_ROOT, exist_ok=True)
 
+# test cases roll back memberships without signals, and then reuse their ids
+GF_MEMBERSHIP_CACHE["TTL"] = 0
+
 # Suppress all logs by default
 for logger in LOGGING["loggers"].values():
     if isinstance(logger, dict) and "level" in logger:
@@ -0,0 +1 @@
+SECRET_KEY = "2ix7-33y=u%we7a-78kemew20$%8)q0l1+$j&4fjc#sd&ws%81"